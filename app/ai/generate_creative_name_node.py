@@ -1,13 +1,36 @@
-from langchain_openai import ChatOpenAI
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.ai.llm_provider import get_llm
 from langchain.prompts import ChatPromptTemplate
+from app.utils import tracing
+from app.utils.config_loader import FANOUT_MAX_CONCURRENCY, FANOUT_TIMEOUT_SECONDS
+from app.utils.json_parser import safe_json_parse, parse_json_stream
+from app.ai.prompt_compiler import compact_template, fit_to_budget
 
-def generate_creative_name_step(state: dict):
-    llm = ChatOpenAI(model="o4-mini-2025-04-16", temperature=1)
-    context = state.get("context", "")
-    base_placements = state.get("base_placements", [])
-    rules = state.get("creative_rules", {})
+# Expected LLM output shape (see json_parser.validate_schema)
+_SCHEMA = {"required": {"creative_names": (dict, list)}}
+
+_PLACEMENT_PROMPT = ChatPromptTemplate.from_template(compact_template("""
+    You are a creative naming assistant.
+    Generate 2–3 creative name suggestions for the placement below, following these rules:
+    - Use uppercase naming convention.
+    - Include campaign or product context if relevant.
+    - Avoid spaces, use underscores.
+    - Keep names short, descriptive, and consistent.
+
+    Context: {context}
+    Placement: {placement}
+
+    Return JSON in this format:
+    {{
+        "creative_names": [
+            {{"name": "...", "reasoning": "..."}}
+        ]
+    }}
+    """))
 
-    prompt = ChatPromptTemplate.from_template("""
+_PROMPT = ChatPromptTemplate.from_template(compact_template("""
     You are a creative naming assistant.
     For each placement below, generate 2–3 creative name suggestions following these rules:
     - Use uppercase naming convention.
@@ -26,8 +49,87 @@ def generate_creative_name_step(state: dict):
             ]
         }}
     }}
-    """)
+    """))
 
-    msg = prompt.format_messages(context=context, base_placements=base_placements)
+
+def _generate_for_placement(placement: str, context: str, timeout: float):
+    """One LLM call for one base placement; returns its list of suggestions."""
+    llm = get_llm(timeout=timeout, max_retries=1)
+    inputs = fit_to_budget("generate_creative_name", _PLACEMENT_PROMPT,
+                           {"context": context, "placement": placement}, trim=("context",))
+    msg = _PLACEMENT_PROMPT.format_messages(**inputs)
     response = llm.invoke(msg)
-    return {"creative_names": eval(response.content)}  # assumes JSON-safe output
+    data = safe_json_parse(response.content, schema=_SCHEMA)
+    suggestions = data.get("creative_names", [])
+    if isinstance(suggestions, dict):
+        # Model keyed the list by placement anyway
+        suggestions = suggestions.get(placement) or next(iter(suggestions.values()), [])
+    return suggestions
+
+
+def stream_creative_names(state: dict, max_concurrency: int = FANOUT_MAX_CONCURRENCY,
+                          timeout: float = FANOUT_TIMEOUT_SECONDS):
+    """
+    Fan-out mode: one LLM call per base placement, at most `max_concurrency`
+    in flight. Yields (placement, suggestions, error) as each call finishes,
+    so one slow or malformed reply doesn't hold back or lose the others.
+    A placement still running `timeout` seconds after it started (retries,
+    backoff and rate-limit waits included) is reported as timed out.
+    """
+    context = state.get("context", "")
+    base_placements = list(dict.fromkeys(state.get("base_placements", [])))
+    if not base_placements:
+        return
+
+    # bind: each call's llm.call span nests under the caller's span, not a new trace
+    generate = tracing.bind(_generate_for_placement)
+    started = {}     # placement -> monotonic start; queued placements aren't on the clock yet
+
+    def run(placement):
+        started[placement] = time.monotonic()
+        return generate(placement, context, timeout)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(base_placements))))
+    try:
+        futures = {pool.submit(run, placement): placement for placement in base_placements}
+        pending = set(futures)
+        while pending:
+            deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+            wait_for = min(timeout, max(0.0, min(deadlines) - time.monotonic())) if deadlines else timeout
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                placement = futures[future]
+                try:
+                    yield placement, future.result(), None
+                except Exception as e:
+                    yield placement, [], str(e)
+
+            now = time.monotonic()
+            for future in [f for f in pending if now - started.get(futures[f], now) >= timeout]:
+                pending.discard(future)
+                yield futures[future], [], f"Timed out after {timeout:g}s."
+    finally:
+        # Overrunning calls finish (or hit their HTTP timeout) in the background
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def generate_creative_name_step(state: dict):
+    if state.get("fan_out"):
+        creative_names, errors = {}, {}
+        for placement, suggestions, error in stream_creative_names(state):
+            creative_names[placement] = suggestions
+            if error:
+                errors[placement] = error
+        return {"creative_names": creative_names, "errors": errors}
+
+    llm = get_llm()
+    context = state.get("context", "")
+    base_placements = state.get("base_placements", [])
+
+    inputs = fit_to_budget("generate_creative_name", _PROMPT,
+                           {"context": context, "base_placements": base_placements}, trim=("context",))
+    msg = _PROMPT.format_messages(**inputs)
+
+    # Parse while the reply streams in; stops reading once the object closes
+    data = parse_json_stream((chunk.content for chunk in llm.stream(msg)), schema=_SCHEMA)
+    return {"creative_names": data["creative_names"]}
@@ -1,22 +1,38 @@
 # app/ai/generate_name_node.py
-from langchain_openai import ChatOpenAI
+from app.ai.llm_provider import get_llm
 from langchain.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 from app.utils.json_parser import safe_json_parse
+from app.utils.response_cache import get_response_cache
+from app.ai.prompt_compiler import compact_template, fit_to_budget, rules_digest_for
+from app.utils import metrics
+from app.utils.config_loader import NAME_CANDIDATE_LIMIT, LLM_RANK_SUGGESTIONS
+from app.utils.name_candidates import campaign_shortlist
 
 load_dotenv()
 
+# Expected LLM output shape (see json_parser.validate_schema)
+_SCHEMA = {"optional": {"suggestions": list, "generated_name": str, "reasoning": str}}
+_RANK_SCHEMA = {"optional": {"ranking": list}}
 
-def generate_name_step(state: dict):
-    """
-    LangGraph node — generates 3–5 AI-based campaign name suggestions
-    using provided rules and campaign details.
-    Enforces uppercase normalization if 'force_uppercase' is enabled in rules.
-    """
+_RANK_PROMPT = ChatPromptTemplate.from_template(compact_template("""
+    You are a campaign naming ranker.
+
+    Every candidate below already follows the naming rules. Rank them from
+    best to worst fit for the campaign details and give a one-line reason
+    for each. Use the candidate names exactly as written; do not invent new ones.
+
+    **Details:**
+    {details}
+
+    **Candidates:**
+    {candidates}
 
-    llm = ChatOpenAI(model="o4-mini-2025-04-16", temperature=1)
+    Return ONLY valid JSON — no explanation text, no Markdown.
+    {{"ranking": [{{"name": "...", "reasoning": "..."}}]}}
+    """))
 
-    prompt = ChatPromptTemplate.from_template("""
+_PROMPT = ChatPromptTemplate.from_template(compact_template("""
     You are an expert campaign naming assistant.
 
     Based on the campaign details and naming rules below, generate 3 to 5
@@ -25,7 +41,7 @@ def generate_name_step(state: dict):
     (e.g., FESTIVAL, LAUNCH, PROMO, OFFER, COLLECTION).
 
     IMPORTANT:
-    - All names must be in UPPERCASE if rules specify 'force_uppercase': true.
+    - All names must be in UPPERCASE if the rules' Style says so.
     - Use underscores (_) as separators.
     - No spaces or special characters allowed.
 
@@ -50,20 +66,85 @@ def generate_name_step(state: dict):
         }}
       ]
     }}
-    """)
+    """))
+
+
+def _rank_candidates(llm, candidates, details_str, bypass):
+    """Order the local shortlist by the LLM's ranking; names it didn't rank keep their place at the end."""
+    inputs = fit_to_budget("rank_names", _RANK_PROMPT, {
+        "details": details_str,
+        "candidates": "\n".join(c["name"] for c in candidates)
+    }, trim=("details",))
+
+    def _call_llm():
+        response = (_RANK_PROMPT | llm).invoke(inputs)
+        return safe_json_parse(response.content, schema=_RANK_SCHEMA)
+
+    data = get_response_cache().get_or_compute(
+        "rank_names", getattr(llm, "model_name", ""), inputs, _call_llm, bypass=bypass
+    )
+    by_name = {c["name"]: c for c in candidates}
+    ranked = []
+    for entry in data.get("ranking", []):
+        name = str(entry.get("name", "")).strip().upper() if isinstance(entry, dict) else ""
+        candidate = by_name.pop(name, None)
+        if candidate:     # names outside the shortlist are ignored; they weren't validated
+            ranked.append({"name": name, "reasoning": entry.get("reasoning") or candidate["reasoning"]})
+    return ranked + list(by_name.values())
+
+
+def generate_name_step(state: dict):
+    """
+    LangGraph node — campaign name suggestions for the provided rules and details.
+
+    - Candidates are built locally (name_candidates.campaign_shortlist),
+      validated against the rules and filtered against existing names, so they
+      are valid by construction. A caller that already built the shortlist
+      (the campaign planner's preview) passes it as details["candidates"].
+    - If LLM_RANK_SUGGESTIONS is on, the LLM only ranks that shortlist; if it is
+      unavailable, the local order stands.
+    - Only when no local candidate can be built (missing details) does the LLM
+      generate 3–5 names from scratch.
+    Enforces uppercase normalization if 'force_uppercase' is enabled in rules.
+    """
+
+    llm = get_llm()
 
     try:
         # Convert campaign details into a readable key:value string
-        details_str = "\n".join([f"{k}: {v}" for k, v in state["details"].items()])
-
-        # Run the LLM with prompt
-        response = (prompt | llm).invoke({
-            "rules": state["rules"],
+        details_str = "\n".join([
+            f"{k}: {v}" for k, v in state["details"].items() if k not in ("bypass_cache", "candidates")
+        ])
+        bypass = bool(state.get("bypass_cache"))
+
+        candidates = state["details"].get("candidates")
+        if candidates is None:
+            candidates = campaign_shortlist(state["details"], state["rules"])
+        if candidates:
+            if LLM_RANK_SUGGESTIONS and len(candidates) > 1:
+                try:
+                    candidates = _rank_candidates(llm, candidates, details_str, bypass)
+                except Exception:
+                    # Ranking is optional (LLM unavailable, bad reply); the local order is already usable
+                    metrics.increment("generate_name.rank_failed")
+            return {"generated_suggestions": candidates[:NAME_CANDIDATE_LIMIT], "error": None}
+
+        # Compact rules digest (cached per rules version) instead of the whole rules dict
+        inputs = fit_to_budget("generate_name", _PROMPT, {
+            "rules": rules_digest_for(state["rules"], "campaign_planner"),
             "details": details_str
-        })
+        }, trim=("details",))
+
+        def _call_llm():
+            # Run the LLM with prompt and parse JSON output safely
+            response = (_PROMPT | llm).invoke(inputs)
+            return safe_json_parse(response.content, schema=_SCHEMA)
 
-        # Parse JSON output safely
-        data = safe_json_parse(response.content)
+        # Identical rules + details reuse the cached response unless bypassed ("Try Again")
+        data = get_response_cache().get_or_compute(
+            "generate_name_step", getattr(llm, "model_name", ""), inputs, _call_llm,
+            bypass=bypass
+        )
         suggestions = data.get("suggestions", [])
 
         # Backward-compatible fallback (if model outputs a single name)
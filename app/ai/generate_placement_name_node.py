@@ -1,19 +1,13 @@
 # app/ai/generate_placement_name_node.py
-from langchain_openai import ChatOpenAI
+from app.ai.llm_provider import get_llm
 from langchain.prompts import ChatPromptTemplate
 from app.utils.json_parser import safe_json_parse
-import json
+from app.ai.prompt_compiler import compact_template, fit_to_budget, rules_digest_for
 
-def generate_placement_name_step(state: dict):
-    """
-    Generate placement/media buy naming suggestions using AI rules.
-    """
+# Expected LLM output shape (see json_parser.validate_schema)
+_SCHEMA = {"required": {"placement_names": list}}
 
-    rules = state.get("placement_rules", {})
-    user_context = state.get("context", "")
-
-    llm = ChatOpenAI(model="o4-mini-2025-04-16", temperature=1)
-    prompt = ChatPromptTemplate.from_template("""
+_PROMPT = ChatPromptTemplate.from_template(compact_template("""
     You are an expert in media naming conventions.
     Generate 3 placement/media buy name suggestions following these rules:
     {rules}
@@ -29,11 +23,28 @@ def generate_placement_name_step(state: dict):
         {{"name": "...", "reasoning": "..."}}
       ]
     }}
-    """)
+    """))
+
+def generate_placement_name_step(state: dict):
+    """
+    Generate placement/media buy naming suggestions using AI rules.
+    """
+
+    rules = state.get("placement_rules", {})
+    user_context = state.get("context", "")
+
+    llm = get_llm()
+
+    try:
+        # Compact rules digest (cached per rules version) instead of the indented rules JSON
+        inputs = fit_to_budget("generate_placement_name", _PROMPT, {
+            "rules": rules_digest_for(rules, "placement_planner"),
+            "user_context": user_context
+        }, trim=("user_context",))
 
-    response = llm.invoke(prompt.format(
-        rules=json.dumps(rules, indent=2),
-        user_context=user_context
-    ))
+        response = llm.invoke(_PROMPT.format(**inputs))
 
-    return safe_json_parse(response.content)
+        return safe_json_parse(response.content, schema=_SCHEMA)
+    except Exception as e:
+        # Throttling / open circuit / bad reply: report it like the other nodes instead of raising
+        return {"error": str(e)}
@@ -40,6 +40,10 @@ class ValidationState(TypedDict, total=False):
     validation_status: Optional[str]     # e.g. "valid", "invalid", "pending"
     source: Optional[str]                # e.g. "manual" or "ai"
 
+    # --- Execution Options ---
+    llm_fallback: Optional[bool]         # Ask the LLM to review free-form tokens after local validation
+    bypass_cache: Optional[bool]         # Skip cached LLM responses (e.g. "Try Again")
+
     # --- Debug / Error Tracking ---
     reasoning: Optional[str]             # General reasoning or explanation string
     error: Optional[str]                 # Captures node-level or graph-level error messages
@@ -0,0 +1,288 @@
+# app/ai/llm_guard.py
+"""
+Process-wide protection around every LLM call (all nodes, all sessions).
+
+- `RateLimiter`: client-side token buckets for requests and tokens per
+  minute (LLM_RPM / LLM_TPM). Callers wait for capacity, but never longer
+  than LLM_LIMIT_MAX_WAIT_SECONDS: past that the call fails fast instead
+  of queueing behind a backlog.
+- Retries: throttling, timeouts, connection and 5xx errors are retried up
+  to LLM_MAX_RETRIES times with full-jitter exponential backoff (honouring
+  Retry-After), but only while the shared `RetryBudget` allows it, so a
+  degraded provider doesn't get a retry storm on top of the normal load.
+- `CircuitBreaker`: after LLM_BREAKER_FAILURES consecutive failed calls the
+  circuit opens for LLM_BREAKER_COOLDOWN_SECONDS and calls raise
+  `LLMUnavailable` immediately; nodes catch it and fall back to the local
+  validators. One trial call is let through when the cooldown ends.
+
+`GuardedChatModel` applies all of this to a backend chat model; get_llm()
+wraps every model it hands out.
+"""
+import random
+import threading
+import time
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from app.utils import metrics
+from app.utils.config_loader import (
+    LLM_RPM, LLM_TPM, LLM_MAX_RETRIES, LLM_RETRY_BUDGET_RATIO,
+    LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN_SECONDS, LLM_LIMIT_MAX_WAIT_SECONDS,
+)
+
+_RETRYABLE_ERRORS = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "TimeoutException", "ReadTimeout", "ConnectTimeout", "ConnectError", "TimeoutError",
+}
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 8.0
+_EXPECTED_OUTPUT_TOKENS = 400      # charged up front per call; corrected from usage afterwards
+
+
+class LLMUnavailable(RuntimeError):
+    """The LLM can't be used right now (circuit open or rate limit wait too long)."""
+
+
+# -------- Rate limiting --------
+class _Bucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)       # a single oversized request still gets through
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute token buckets (0 disables either)."""
+
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM, max_wait: float = LLM_LIMIT_MAX_WAIT_SECONDS):
+        self._requests = _Bucket(rpm) if rpm > 0 else None
+        self._tokens = _Bucket(tpm) if tpm > 0 else None
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        """Block until one request and `tokens` tokens are available, or raise LLMUnavailable."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self._requests.wait_time(1, now) if self._requests else 0.0,
+                    self._tokens.wait_time(tokens, now) if self._tokens else 0.0,
+                )
+                if wait <= 0:
+                    if self._requests:
+                        self._requests.level -= 1
+                    if self._tokens:
+                        self._tokens.level -= min(tokens, self._tokens.capacity)
+                    break
+            if waited + wait > self.max_wait:
+                metrics.increment("llm.rate_limited")
+                raise LLMUnavailable(f"Client-side rate limit: would wait {waited + wait:.1f}s for capacity.")
+            time.sleep(wait)
+            waited += wait
+        if waited:
+            metrics.record_timing("llm.rate_limit_wait", waited)
+
+    def adjust(self, tokens: int):
+        """Correct the token bucket once actual usage is known (positive = charge more)."""
+        if self._tokens and tokens:
+            with self._lock:
+                self._tokens.level = min(self._tokens.capacity, self._tokens.level - tokens)
+
+
+# -------- Retry budget --------
+class RetryBudget:
+    """
+    Retries may add at most `ratio` extra calls per call made (plus a small
+    reserve), process-wide: each call deposits `ratio`, each retry withdraws 1.
+    """
+
+    def __init__(self, ratio: float = LLM_RETRY_BUDGET_RATIO, reserve: float = 10.0):
+        self.ratio = ratio
+        self.reserve = reserve           # starting and maximum balance
+        self._balance = reserve
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+        metrics.increment("llm.retry_budget_exhausted")
+        return False
+
+
+# -------- Circuit breaker --------
+class CircuitBreaker:
+    """closed → open after `failures` consecutive failures → half-open after `cooldown` → closed on success."""
+
+    def __init__(self, failures: int = LLM_BREAKER_FAILURES, cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._consecutive = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self._opened_at >= self.cooldown else "open"
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial:
+                metrics.increment("llm.breaker_rejected")
+                raise LLMUnavailable("LLM circuit open after repeated failures; using local validation only.")
+            self._trial = True           # half-open: this call is the trial
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self._trial or (self.failures and self._consecutive >= self.failures):
+                if self._opened_at is None or self._trial:
+                    metrics.increment("llm.breaker_opened")
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+limiter = RateLimiter()
+retry_budget = RetryBudget()
+breaker = CircuitBreaker()
+
+
+def status() -> dict:
+    """Breaker state and remaining retry budget (for dashboards and the startup report)."""
+    return {"breaker": breaker.state, "retry_budget": round(retry_budget.balance, 2)}
+
+
+# -------- Call policy --------
+def _is_retryable(error: Exception) -> bool:
+    if type(error).__name__ in _RETRYABLE_ERRORS:
+        return True
+    return getattr(error, "status_code", None) in _RETRYABLE_STATUS
+
+
+def _retry_after(error: Exception):
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return min(_BACKOFF_CAP, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int, error: Exception):
+    delay = _retry_after(error)
+    if delay is None:
+        delay = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** attempt)))
+    time.sleep(delay)
+
+
+def _estimate_tokens(messages) -> int:
+    from app.ai.prompt_compiler import count_tokens
+
+    text = "\n".join(str(getattr(m, "content", m)) for m in messages)
+    return count_tokens(text) + _EXPECTED_OUTPUT_TOKENS
+
+
+def _usage_tokens(result) -> int:
+    usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    return int(usage.get("total_tokens") or 0)
+
+
+def guarded_call(call, messages, max_retries: int = LLM_MAX_RETRIES):
+    """Run call() under the breaker, limiter and retry policy; returns its result."""
+    estimate = _estimate_tokens(messages)
+    retry_budget.deposit()
+    attempt = 0
+    while True:
+        breaker.before_call()
+        limiter.acquire(estimate)
+        try:
+            result = call()
+        except Exception as e:
+            retryable = _is_retryable(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()     # the provider answered; the request itself was bad
+            if not retryable or attempt >= max_retries or not retry_budget.withdraw():
+                metrics.increment("llm.failures")
+                raise
+            attempt += 1
+            metrics.increment("llm.retries")
+            _backoff(attempt, e)
+            continue
+        breaker.record_success()
+        used = _usage_tokens(result)
+        if used:
+            limiter.adjust(used - estimate)
+        return result
+
+
+class GuardedChatModel(BaseChatModel):
+    """A backend chat model behind the shared limiter, retry policy and circuit breaker."""
+
+    inner: Any
+    model_name: str = ""
+    max_retries: int = LLM_MAX_RETRIES
+
+    @property
+    def _llm_type(self) -> str:
+        return f"guarded-{getattr(self.inner, '_llm_type', 'chat')}"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return guarded_call(
+            lambda: self.inner._generate(messages, stop=stop, **kwargs), messages, self.max_retries
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        """Retried only until the first chunk arrives; after that errors propagate."""
+        if type(self.inner)._stream == BaseChatModel._stream:
+            result = self._generate(messages, stop=stop, **kwargs)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=result.generations[0].message.content))
+            return
+
+        def first_chunk():
+            stream = self.inner._stream(messages, stop=stop, **kwargs)
+            return stream, next(stream, None)
+
+        stream, chunk = guarded_call(first_chunk, messages, self.max_retries)
+        while chunk is not None:
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            chunk = next(stream, None)
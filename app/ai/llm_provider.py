@@ -0,0 +1,187 @@
+# app/ai/llm_provider.py
+import threading
+import time
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.utils import tracing
+from app.utils.config_loader import (
+    LLM_MODEL, LLM_BACKEND, LLM_MAX_CONNECTIONS, LLM_MAX_RETRIES, LLM_TIMEOUT_SECONDS
+)
+
+load_dotenv()
+
+_lock = threading.Lock()
+_clients = {}          # (backend, model, params) -> chat model instance
+_http = {}             # "sync" / "async" -> shared httpx client
+_backend = LLM_BACKEND
+_backends = {}         # name -> factory(model, **params)
+
+
+# -------- Shared HTTP transport --------
+def _http_clients():
+    """
+    One keep-alive connection pool per process, shared by every ChatOpenAI
+    instance so TCP/TLS sessions are reused across nodes and reruns.
+    """
+    if not _http:
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            keepalive_expiry=120,
+        )
+        timeout = httpx.Timeout(120.0, connect=10.0)
+        _http["sync"] = httpx.Client(limits=limits, timeout=timeout)
+        _http["async"] = httpx.AsyncClient(limits=limits, timeout=timeout)
+    return _http["sync"], _http["async"]
+
+
+# -------- Tracing --------
+class LLMTracingHandler(BaseCallbackHandler):
+    """
+    Opens an "llm.call" span per model call (child of the node span that made it)
+    and records model name and prompt/completion token counts when it ends.
+    """
+
+    def __init__(self):
+        self._spans = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = (
+            params.get("model_name") or params.get("model")
+            or (kwargs.get("metadata") or {}).get("ls_model_name")
+        )
+        self._spans[run_id] = tracing.start_span("llm.call", **{"gen_ai.request.model": model})
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if not usage and response.generations and response.generations[0]:
+            message = getattr(response.generations[0][0], "message", None)
+            meta = getattr(message, "usage_metadata", None) or {}
+            usage = {"prompt_tokens": meta.get("input_tokens"), "completion_tokens": meta.get("output_tokens")}
+        span.set_attribute("gen_ai.usage.input_tokens", usage.get("prompt_tokens"))
+        span.set_attribute("gen_ai.usage.output_tokens", usage.get("completion_tokens"))
+        tracing.end_span(span)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            tracing.end_span(span, f"{type(error).__name__}: {error}")
+
+
+_tracing_handler = LLMTracingHandler()
+
+
+# -------- Backends --------
+def _openai_factory(model, **params):
+    from langchain_openai import ChatOpenAI
+
+    http_client, http_async_client = _http_clients()
+    params.setdefault("timeout", LLM_TIMEOUT_SECONDS)
+    return ChatOpenAI(
+        model=model,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        **params
+    )
+
+
+def _fake_factory(model, **params):
+    return FakeChatModel(model_name=model)
+
+
+def register_backend(name: str, factory):
+    """Register a backend: factory(model, **params) -> LangChain chat model."""
+    with _lock:
+        _backends[name] = factory
+        for key in [k for k in _clients if k[0] == name]:
+            del _clients[key]
+
+
+def set_backend(name: str):
+    """Switch the active backend (e.g. "fake" for offline tests and benchmarks)."""
+    global _backend
+    if name not in _backends:
+        raise ValueError(f"Unknown LLM backend: {name}")
+    with _lock:
+        _backend = name
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def get_llm(model: str = LLM_MODEL, temperature: float = 1, **params):
+    """
+    Return the shared chat model for (backend, model, parameters).
+    Instances are created once per process and reused by every node.
+    Every model is wrapped in llm_guard.GuardedChatModel (shared rate limiter,
+    retry budget, circuit breaker); `max_retries` is applied there, so the
+    backend client itself never retries.
+    """
+    key = (_backend, model, temperature, tuple(sorted(params.items())))
+    llm = _clients.get(key)
+    if llm is None:
+        with _lock:
+            llm = _clients.get(key)
+            if llm is None:
+                from app.ai.llm_guard import GuardedChatModel
+
+                backend_params = dict(params)
+                retries = backend_params.pop("max_retries", LLM_MAX_RETRIES)
+                inner = _backends[_backend](model, temperature=temperature, max_retries=0, **backend_params)
+                llm = GuardedChatModel(
+                    inner=inner, model_name=model, max_retries=retries, callbacks=[_tracing_handler]
+                )
+                _clients[key] = llm
+    return llm
+
+
+# -------- Offline fake --------
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for ChatOpenAI.
+    - `responder(messages) -> str` builds the reply (defaults to "{}").
+    - `latency` seconds are slept before replying, to simulate the network.
+    """
+
+    model_name: str = "fake"
+    latency: float = 0.0
+    responder: Optional[Callable] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        content = self.responder(messages) if self.responder else "{}"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def use_fake_llm(responder=None, latency: float = 0.0):
+    """
+    Route every node to a FakeChatModel (offline tests, benchmarks).
+    `responder(messages) -> str` supplies the reply text.
+    """
+    register_backend(
+        "fake",
+        lambda model, **params: FakeChatModel(model_name=model, responder=responder, latency=latency)
+    )
+    set_backend("fake")
+
+
+_backends["openai"] = _openai_factory
+_backends["fake"] = _fake_factory
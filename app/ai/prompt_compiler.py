@@ -0,0 +1,131 @@
+# app/ai/prompt_compiler.py
+"""
+Compact prompts for the LLM nodes.
+
+- `rules_digest_for(rules, planner)`: the planner's grammar as a few lines
+  (format order, allowed values, month/year, optional tokens, style) instead
+  of the whole rules JSON with notes, examples and field descriptions.
+  Stable for a given rules version and cached by it.
+- `compact_template(text)`: strip the indentation the templates carry in source.
+- `fit_to_budget(node, prompt, inputs, trim)`: count the rendered prompt's
+  tokens, trim the named free-text inputs if it exceeds PROMPT_TOKEN_BUDGET,
+  and record the count per node (metrics "prompt.tokens.<node>" and the
+  current span's "gen_ai.prompt.tokens").
+"""
+import textwrap
+import threading
+
+from app.utils import metrics, tracing
+from app.utils.config_loader import LLM_MODEL, PROMPT_TOKEN_BUDGET
+from app.utils.rule_engine import compile_rules, planner_block
+
+_digests = {}                # rules version -> digest text
+_digest_lock = threading.Lock()
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+
+class PromptBudgetExceeded(ValueError):
+    """The fixed part of a prompt alone is over the token budget."""
+
+
+# -------- Rules digest --------
+def rules_digest_for(rules: dict, planner: str) -> str:
+    """Prompt-ready digest of one planner's rules (accepts the block or the whole file)."""
+    engine = compile_rules(planner_block(rules or {}, planner))
+    digest = _digests.get(engine.version)
+    if digest is None:
+        with _digest_lock:
+            digest = _digests.setdefault(engine.version, engine.describe())
+    return digest
+
+
+def compact_template(text: str) -> str:
+    """Dedent a template and drop trailing whitespace (every space is billed)."""
+    return "\n".join(line.rstrip() for line in textwrap.dedent(text).strip().splitlines())
+
+
+# -------- Token counting --------
+def _get_encoder():
+    """tiktoken encoding for LLM_MODEL, or None (not installed / BPE file not available offline)."""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        with _encoder_lock:
+            if not _encoder_loaded:
+                try:
+                    import tiktoken
+                    try:
+                        _encoder = tiktoken.encoding_for_model(LLM_MODEL)
+                    except KeyError:
+                        _encoder = tiktoken.get_encoding("o200k_base")
+                except Exception:
+                    _encoder = None
+                _encoder_loaded = True
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """Exact with tiktoken; otherwise ~4 characters per token (close for English and names)."""
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _trim_lines(text: str, max_tokens: int) -> str:
+    """Keep whole leading lines of `text` within max_tokens, noting how many were dropped."""
+    lines = str(text).splitlines()
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    if len(kept) == len(lines):
+        return text
+    if not kept and lines:
+        # One long line: cut it by characters instead
+        return lines[0][: max(0, max_tokens - 8) * 4] + " …(truncated)"
+    return "\n".join(kept + [f"…({len(lines) - len(kept)} more lines omitted)"])
+
+
+# -------- Budget --------
+def _render(prompt, inputs: dict) -> str:
+    return prompt.format(**inputs) if hasattr(prompt, "format") else str(prompt).format(**inputs)
+
+
+def fit_to_budget(node: str, prompt, inputs: dict, trim=(), budget: int = None) -> dict:
+    """
+    Return `inputs`, with the `trim` fields shortened (in order) if the rendered
+    prompt is over `budget` tokens (PROMPT_TOKEN_BUDGET by default; 0 = unlimited).
+    Raises PromptBudgetExceeded if the prompt can't fit even with those fields emptied.
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    tokens = count_tokens(_render(prompt, inputs))
+
+    if budget and tokens > budget:
+        inputs = dict(inputs)
+        for key in trim:
+            field_tokens = count_tokens(str(inputs.get(key) or ""))
+            excess = tokens - budget
+            if field_tokens == 0:
+                continue
+            inputs[key] = _trim_lines(inputs[key], max(0, field_tokens - excess - 16))
+            tokens = count_tokens(_render(prompt, inputs))
+            if tokens <= budget:
+                break
+        metrics.increment(f"prompt.trimmed.{node}")
+        tracing.set_attributes(**{"gen_ai.prompt.trimmed": True})
+        if tokens > budget:
+            metrics.increment(f"prompt.over_budget.{node}")
+            raise PromptBudgetExceeded(
+                f"{node}: prompt is {tokens} tokens, over the {budget}-token budget (PROMPT_TOKEN_BUDGET)."
+            )
+
+    metrics.increment(f"prompt.tokens.{node}", tokens)
+    metrics.increment(f"prompt.calls.{node}")
+    tracing.set_attributes(**{"gen_ai.prompt.tokens": tokens, "gen_ai.prompt.budget": budget or None})
+    return inputs
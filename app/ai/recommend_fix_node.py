@@ -1,11 +1,39 @@
 # app/ai/recommend_fix_node.py
-from langchain_openai import ChatOpenAI
+from app.ai.llm_provider import get_llm
 from langchain.prompts import ChatPromptTemplate
 from app.utils.json_parser import safe_json_parse
+from app.ai.prompt_compiler import compact_template, fit_to_budget, rules_digest_for
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Expected LLM output shape (see json_parser.validate_schema)
+_SCHEMA = {"optional": {"fixes": list, "suggested_name": str, "explanation": str}}
+
+_PROMPT = ChatPromptTemplate.from_template(compact_template("""
+    You are a campaign naming corrector.
+    For each invalid campaign name below, suggest one corrected version that follows all naming rules.
+    If the rules' Style says UPPERCASE, ensure all names are in uppercase.
+
+    **Rules:**
+    {rules}
+
+    **Invalid Names and Issues:**
+    {invalid_list}
+
+    Respond ONLY in valid JSON — no markdown, no explanation text.
+    Example format:
+    {{
+      "fixes": [
+        {{
+          "original": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS",
+          "suggested_name": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS_OCT_2025",
+          "explanation": "Added missing month and year as per rules."
+        }}
+      ]
+    }}
+    """))
+
 
 def recommend_fix_step(state: dict):
     """
@@ -45,30 +73,7 @@ def recommend_fix_step(state: dict):
         and state["rules"].get("validation", {}).get("force_uppercase", True)
     )
 
-    llm = ChatOpenAI(model="o4-mini-2025-04-16", temperature=1)
-    prompt = ChatPromptTemplate.from_template("""
-    You are a campaign naming corrector.
-    For each invalid campaign name below, suggest one corrected version that follows all naming rules.
-    If 'force_uppercase' is true, ensure all names are in uppercase.
-
-    **Rules:**
-    {rules}
-
-    **Invalid Names and Issues:**
-    {invalid_list}
-
-    Respond ONLY in valid JSON — no markdown, no explanation text.
-    Example format:
-    {{
-      "fixes": [
-        {{
-          "original": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS",
-          "suggested_name": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS_OCT_2025",
-          "explanation": "Added missing month and year as per rules."
-        }}
-      ]
-    }}
-    """)
+    llm = get_llm()
 
     # Build formatted invalid details string for LLM input
     invalid_list = "\n".join([
@@ -76,14 +81,16 @@ def recommend_fix_step(state: dict):
     ])
 
     try:
-        # --- Run the LLM ---
-        response = (prompt | llm).invoke({
-            "rules": state["rules"],
+        inputs = fit_to_budget("recommend_fix", _PROMPT, {
+            "rules": rules_digest_for(state["rules"], "campaign_planner"),
             "invalid_list": invalid_list
-        })
+        }, trim=("invalid_list",))
+
+        # --- Run the LLM ---
+        response = (_PROMPT | llm).invoke(inputs)
 
         # --- Parse JSON safely ---
-        data = safe_json_parse(response.content)
+        data = safe_json_parse(response.content, schema=_SCHEMA)
 
         # Normalize fixes
         fixes = data.get("fixes", [])
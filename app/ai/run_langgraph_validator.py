@@ -1,47 +1,87 @@
 # app/ai/run_langgraph_validator.py
+import threading
+
 from langgraph.graph import StateGraph, END
 from app.ai.graph_state import ValidationState
 from app.ai.generate_name_node import generate_name_step
 from app.ai.validate_name_node import validate_name_step
 from app.ai.recommend_fix_node import recommend_fix_step
+from app.utils import metrics, tracing
 
+# The only two topologies the pipeline needs
+GENERATE_ENTRY = "generate_step"   # generate_step → validate_step → recommend_fix_step → END
+VALIDATE_ENTRY = "validate_step"   # validate_step → recommend_fix_step → END
 
-def run_langgraph_validator(details, rules):
-    """
-    LangGraph pipeline for campaign name governance.
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
 
-    Supports both phases:
 
-    Phase 1 (AI mode):
-        generate_step → validate_step → recommend_fix_step → END
+def _traced_node(name: str, step):
+    """Run a node inside a "langgraph.node.<name>" span; node-level errors mark the span."""
+    def node(state):
+        with tracing.span(f"langgraph.node.{name}", **{"langgraph.node": name}) as s:
+            update = step(state)
+            if isinstance(update, dict) and update.get("error"):
+                s.error = str(update["error"])
+            return update
 
-    Phase 2 (Manual or selected name):
-        validate_step → recommend_fix_step → END
-    """
+    node.__name__ = name
+    return node
 
-    # Initialize the graph
-    graph = StateGraph(ValidationState)
 
-    # Add nodes
-    graph.add_node("generate_step", generate_name_step)
-    graph.add_node("validate_step", validate_name_step)
-    graph.add_node("recommend_fix_step", recommend_fix_step)
+def _build_executor(entry_point: str):
+    """Build and compile the graph for one entry point."""
+    with metrics.timed(f"langgraph.compile.{entry_point}"):
+        graph = StateGraph(ValidationState)
 
-    # --- Flow Control ---
-    if "generated_name" in details:
-        # ✅ Manual or user-selected campaign name
-        graph.set_entry_point("validate_step")
-        graph.add_edge("validate_step", "recommend_fix_step")
-        graph.add_edge("recommend_fix_step", END)
-    else:
-        # ✅ Full AI generation → validation → fix chain
-        graph.set_entry_point("generate_step")
-        graph.add_edge("generate_step", "validate_step")
+        # Add nodes
+        graph.add_node("generate_step", _traced_node("generate_step", generate_name_step))
+        graph.add_node("validate_step", _traced_node("validate_step", validate_name_step))
+        graph.add_node("recommend_fix_step", _traced_node("recommend_fix_step", recommend_fix_step))
+
+        # --- Flow Control ---
+        graph.set_entry_point(entry_point)
+        if entry_point == GENERATE_ENTRY:
+            graph.add_edge("generate_step", "validate_step")
         graph.add_edge("validate_step", "recommend_fix_step")
         graph.add_edge("recommend_fix_step", END)
 
-    # Compile graph executor
-    executor = graph.compile()
+        return graph.compile()
+
+
+def get_executor(entry_point: str = GENERATE_ENTRY):
+    """
+    Return the compiled executor for `entry_point` (GENERATE_ENTRY or VALIDATE_ENTRY).
+    Each topology is compiled once per process and shared; compiled graphs are
+    safe to invoke concurrently.
+    """
+    if entry_point not in (GENERATE_ENTRY, VALIDATE_ENTRY):
+        raise ValueError(f"Unknown entry point: {entry_point}")
+
+    executor = _EXECUTORS.get(entry_point)
+    if executor is None:
+        with _EXECUTORS_LOCK:
+            executor = _EXECUTORS.get(entry_point)
+            if executor is None:
+                metrics.increment("langgraph.compile.miss")
+                executor = _build_executor(entry_point)
+                _EXECUTORS[entry_point] = executor
+    return executor
+
+
+def warm_executors():
+    """
+    Precompile both topologies so the first click doesn't pay for it.
+    Blocking; app/main.py runs it on its warm-up thread (with the import).
+    """
+    for entry in (GENERATE_ENTRY, VALIDATE_ENTRY):
+        get_executor(entry)
+
+
+def _prepare(details, rules):
+    """Pick the topology and build the initial state for a run."""
+    # ✅ Manual or user-selected campaign name skips generation
+    entry_point = VALIDATE_ENTRY if "generated_name" in details else GENERATE_ENTRY
 
     # ✅ Flatten details so all keys (like generated_name) are accessible directly in state
     initial_state = {
@@ -49,7 +89,66 @@ def run_langgraph_validator(details, rules):
         "rules": rules,
         **details             # flatten all keys (advertiser, product, generated_name, etc.)
     }
+    return entry_point, initial_state
+
+
+def run_langgraph_validator(details, rules):
+    """
+    LangGraph pipeline for campaign name governance.
+
+    Supports both phases:
+
+    Phase 1 (AI mode):
+        generate_step → validate_step → recommend_fix_step → END
+
+    Phase 2 (Manual or selected name):
+        validate_step → recommend_fix_step → END
+    """
+    entry_point, initial_state = _prepare(details, rules)
+    executor = get_executor(entry_point)
 
     # Run the graph and return final state
-    result_state = executor.invoke(initial_state)
+    with metrics.timed(f"langgraph.invoke.{entry_point}"), \
+            tracing.span("langgraph.invoke", **{"langgraph.entry_point": entry_point}):
+        result_state = executor.invoke(initial_state)
     return result_state
+
+
+def stream_langgraph_validator(details, rules):
+    """
+    Same pipeline as run_langgraph_validator, but yields (node_name, update)
+    as soon as each node finishes, so callers can show generated suggestions
+    before validation and fix recommendations are done.
+    """
+    entry_point, initial_state = _prepare(details, rules)
+    executor = get_executor(entry_point)
+
+    chunks = tracing.trace_iter(
+        "langgraph.stream", executor.stream(initial_state, stream_mode="updates"),
+        **{"langgraph.entry_point": entry_point}
+    )
+    with metrics.timed(f"langgraph.stream.{entry_point}"):
+        for chunk in chunks:
+            for node_name, update in chunk.items():
+                yield node_name, update or {}
+
+
+async def arun_langgraph_validator(details, rules):
+    """Async variant of run_langgraph_validator (uses executor.ainvoke)."""
+    entry_point, initial_state = _prepare(details, rules)
+    executor = get_executor(entry_point)
+
+    with metrics.timed(f"langgraph.ainvoke.{entry_point}"), \
+            tracing.span("langgraph.invoke", **{"langgraph.entry_point": entry_point}):
+        return await executor.ainvoke(initial_state)
+
+
+async def astream_langgraph_validator(details, rules):
+    """Async variant of stream_langgraph_validator (uses executor.astream)."""
+    entry_point, initial_state = _prepare(details, rules)
+    executor = get_executor(entry_point)
+
+    with metrics.timed(f"langgraph.astream.{entry_point}"):
+        async for chunk in executor.astream(initial_state, stream_mode="updates"):
+            for node_name, update in chunk.items():
+                yield node_name, update or {}
@@ -1,9 +1,14 @@
+from app.utils.charset_validator import CREATIVE_CHARSET, charset_validator, describe_invalid
+
+
 def validate_creative_name_step(state: dict):
     names = state.get("creative_names", [])
     rules = state.get("creative_rules", {}).get("validation", {})
+    charset = charset_validator(rules.get("allowed_characters") or CREATIVE_CHARSET)
     results = []
 
-    for name in names:
+    # One batched character pass for the whole list
+    for name, invalid in zip(names, charset.scan_many(names)):
         issues = []
         if " " in name:
             issues.append("Contains spaces.")
@@ -11,8 +16,10 @@ def validate_creative_name_step(state: dict):
             issues.append("Must be uppercase.")
         if "__" in name:
             issues.append("Multiple underscores found.")
-        if not all(c.isalnum() or c in "_-*/|\\ " for c in name):
-            issues.append("Invalid characters (only A-Z, 0-9, _, -, /, | allowed).")
+        if invalid:
+            issues.append(
+                f"Invalid characters (only A-Z, 0-9, _, -, /, | allowed): {describe_invalid(invalid)}"
+            )
 
         results.append({
             "name": name,
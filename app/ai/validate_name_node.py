@@ -1,11 +1,134 @@
 # app/ai/validate_name_node.py
-from langchain_openai import ChatOpenAI
+from app.ai.llm_provider import get_llm
 from langchain.prompts import ChatPromptTemplate
 from app.utils.json_parser import safe_json_parse
+from app.utils.response_cache import get_response_cache
+from app.ai.prompt_compiler import compact_template, count_tokens, fit_to_budget
+from app.utils.rule_engine import compile_rules, planner_block
+from app.utils.micro_batcher import MicroBatcher
+from app.ai.llm_guard import LLMUnavailable
+from app.utils.config_loader import LLM_BATCH_MAX_SIZE, LLM_BATCH_WINDOW_MS, PROMPT_TOKEN_BUDGET
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Expected LLM output shape (see json_parser.validate_schema)
+_SCHEMA = {"required": {"validations": list}}
+
+_REVIEW_PROMPT = ChatPromptTemplate.from_template(compact_template("""
+    You are a strict campaign naming reviewer.
+    The names below already pass all structural checks (order, separators,
+    uppercase, objective, month, year). Judge ONLY the free-form tokens listed
+    for each name: are they meaningful, free of typos and consistent with the notes?
+
+    **Notes:**
+    {notes}
+
+    **Names and free-form tokens:**
+    {tokens}
+
+    Respond ONLY in valid JSON (no markdown, no text).
+    Example format:
+    {{
+      "validations": [
+        {{"name": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS_OCT_2025", "is_valid": true, "issues": []}}
+      ]
+    }}
+    """))
+
+
+def _budget_chunks(notes, lines):
+    """Split review lines into runs whose prompt fits PROMPT_TOKEN_BUDGET (one LLM call each)."""
+    if not PROMPT_TOKEN_BUDGET:
+        return [lines]
+    base = count_tokens(_REVIEW_PROMPT.format(notes=notes, tokens=""))
+    chunks, current, used = [], [], base
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if current and used + cost > PROMPT_TOKEN_BUDGET:
+            chunks.append(current)
+            current, used = [], base
+        current.append(line)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _review_batch(key, token_blocks):
+    """
+    MicroBatcher callback: one LLM call for the free-form tokens of several
+    callers that share the same notes and model; the `validations` array is
+    split back per caller by name.
+
+    A batch whose prompt would exceed the token budget is split into several
+    calls instead of being trimmed, so every name is reviewed. A caller whose
+    names were in a failed call (e.g. one line over the budget) gets that error.
+    """
+    notes, _ = key
+    lines = list(dict.fromkeys(line for block in token_blocks for line in block.splitlines()))
+
+    by_name, failed = {}, {}
+    for chunk in _budget_chunks(notes, lines):
+        try:
+            # Notes are what the reviewer judges against, so nothing is trimmed
+            inputs = fit_to_budget("validate_name", _REVIEW_PROMPT, {
+                "notes": notes,
+                "tokens": "\n".join(chunk)
+            })
+            response = (_REVIEW_PROMPT | get_llm()).invoke(inputs)
+            data = safe_json_parse(response.content, schema=_SCHEMA)
+        except Exception as e:
+            failed.update((line.split(":", 1)[0].upper(), e) for line in chunk)
+            continue
+        by_name.update(
+            (str(v.get("name", "")).upper(), v)
+            for v in data.get("validations", []) if isinstance(v, dict)
+        )
+
+    results = []
+    for block in token_blocks:
+        names = [line.split(":", 1)[0].upper() for line in block.splitlines()]
+        error = next((failed[n] for n in names if n in failed), None)
+        results.append(error or {"validations": [by_name[n] for n in names if n in by_name]})
+    return results
+
+
+# ✅ Shared across sessions: concurrent reviews within the window go out as one LLM call
+_review_batcher = MicroBatcher(
+    "validate_name", _review_batch,
+    max_batch_size=LLM_BATCH_MAX_SIZE, max_wait=LLM_BATCH_WINDOW_MS / 1000,
+)
+
+
+def _review_free_tokens(rules, local_results, bypass_cache=False):
+    """
+    Optional LLM fallback: ask the model to judge only the free-form tokens
+    (Product, Campaign, extensions) of names the grammar already accepted.
+    Cache misses go through the shared micro-batcher.
+    Returns {name: [issues]} for names the model flags.
+    """
+    model = getattr(get_llm(), "model_name", "")
+    notes = "\n".join(rules.get("notes", []))
+    tokens_block = "\n".join(
+        f"{r['name']}: " + ", ".join(f"{k}={v}" for k, v in r["free_tokens"].items())
+        for r in local_results
+    )
+    inputs = {"notes": notes, "tokens": tokens_block}
+
+    def _call_llm():
+        return _review_batcher.submit((notes, model), tokens_block)
+
+    data = get_response_cache().get_or_compute(
+        "validate_name_step", model, inputs, _call_llm, bypass=bypass_cache
+    )
+
+    flagged = {}
+    for v in data.get("validations", []):
+        if not v.get("is_valid", True) and v.get("name"):
+            flagged[v["name"].upper()] = v.get("issues") or ["Free-form token rejected by reviewer."]
+    return flagged
+
 
 def validate_name_step(state: dict):
     """
@@ -15,6 +138,11 @@ def validate_name_step(state: dict):
     - Single name (manual mode)
     - Multiple names (AI-generated suggestions)
 
+    Validation runs locally through the compiled rule engine
+    (format_order, allowed_objectives, month/year, uppercase, underscores).
+    If 'llm_fallback' is set in state, names that pass the grammar are sent to
+    the LLM for a review of their free-form tokens only.
+
     Enforces uppercase normalization if 'force_uppercase' is True in rules.
 
     Returns consistent structured result:
@@ -25,38 +153,6 @@ def validate_name_step(state: dict):
     }
     """
 
-    llm = ChatOpenAI(model="o4-mini-2025-04-16", temperature=1)  # deterministic validation output
-    prompt = ChatPromptTemplate.from_template("""
-    You are a strict campaign naming validator.
-    For each campaign name, check if it follows the rules below.
-    Ensure names use underscores (_) and are in uppercase if required.
-
-    **Rules:**
-    {rules}
-
-    **Campaign Names to Validate:**
-    {names}
-
-    Respond ONLY in valid JSON (no markdown, no text).
-    Example format:
-    {{
-      "validations": [
-        {{
-          "name": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS_OCT_2025",
-          "is_valid": true,
-          "issues": [],
-          "reasoning": "Follows all required naming rules."
-        }},
-        {{
-          "name": "PM_1001_SAREE_AWAR_DIWALIFESTIVALS",
-          "is_valid": false,
-          "issues": ["Missing month and year"],
-          "reasoning": "The name lacks required time components."
-        }}
-      ]
-    }}
-    """)
-
     try:
         # ✅ Extract campaign names
         suggestions = state.get("generated_suggestions", [])
@@ -69,41 +165,39 @@ def validate_name_step(state: dict):
         else:
             return {"error": "No campaign names provided for validation."}
 
+        rules = planner_block(state.get("rules") or {}, "campaign_planner")
+
         # ✅ Apply uppercase normalization if rule enabled
         force_uppercase = (
-            isinstance(state.get("rules"), dict)
-            and state["rules"].get("validation", {}).get("force_uppercase", True)
+            isinstance(rules, dict)
+            and rules.get("validation", {}).get("force_uppercase", True)
         )
         if force_uppercase:
             names_list = [n.upper() for n in names_list]
 
-        names_block = "\n".join(names_list)
-
-        # ✅ Run validation LLM
-        response = (prompt | llm).invoke({
-            "rules": state["rules"],
-            "names": names_block
-        })
-
-        # ✅ Parse LLM JSON output safely
-        data = safe_json_parse(response.content)
-
-        # ✅ Extract results in consistent structure
-        results = data.get("validations", [])
-        if not results and isinstance(data, dict):
-            # Fallback for single name
-            single = {
-                "name": names_list[0] if names_list else "UNKNOWN",
-                "is_valid": data.get("is_valid", False),
-                "issues": data.get("issues", []),
-                "reasoning": data.get("reasoning", "")
-            }
-            results = [single]
-
-        # ✅ Enforce uppercase in result payload
-        for r in results:
-            if "name" in r:
-                r["name"] = r["name"].upper()
+        # ✅ Deterministic grammar check
+        engine = compile_rules(rules)
+        local_results = [engine.check(n) for n in names_list]
+
+        # ✅ Optional LLM review of free-form tokens (only for grammar-valid names)
+        use_fallback = state.get("llm_fallback") or state.get("details", {}).get("llm_fallback")
+        reviewable = [r for r in local_results if r["is_valid"] and r["free_tokens"]]
+        if use_fallback and reviewable:
+            try:
+                flagged = _review_free_tokens(rules, reviewable, bypass_cache=bool(state.get("bypass_cache")))
+            except LLMUnavailable:
+                flagged = {}     # ✅ LLM throttled / circuit open: the local verdicts stand
+            for r in reviewable:
+                issues = flagged.get(r["name"].upper())
+                if issues:
+                    r["is_valid"] = False
+                    r["issues"] = list(issues)
+                    r["reasoning"] = "; ".join(issues)
+
+        results = []
+        for r in local_results:
+            r.pop("free_tokens", None)
+            results.append(r)
 
         return {"validation_result": results}
 
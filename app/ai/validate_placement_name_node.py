@@ -1,34 +1,43 @@
+from app.utils.charset_validator import PLACEMENT_CHARSET, charset_validator, describe_invalid
+
+
 def validate_placement_name_step(state: dict):
     """
     Validate placement/media buy names using format and rule checks.
-    Allows additional characters: -, *, space, /, \, |
+    Allows additional characters: -, *, space, /, \\, |
+    (override with "allowed_characters" in the rules' validation block).
+
+    All names are checked in one batched pass; each name reports its
+    invalid characters once, with their positions.
     """
 
     names = state.get("placement_names", [])
     rules = state.get("placement_rules", {}).get("validation", {})
 
-    results = []
+    # Allowed characters (A–Z, 0–9, underscore, dash, star, space, slash, backslash, pipe)
+    charset = charset_validator(rules.get("allowed_characters") or PLACEMENT_CHARSET)
+    no_spaces = rules.get("no_spaces_allowed")
+    force_uppercase = rules.get("force_uppercase")
+    use_underscores = rules.get("use_underscores")
 
-    # Define allowed characters (A–Z, 0–9, underscore, dash, star, space, slash, backslash, pipe)
-    allowed_chars = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_ -*\\/|")
+    results = []
 
-    for name in names:
+    for name, invalid in zip(names, charset.scan_many(names)):
         issues = []
 
         # Basic structural validations
-        if rules.get("no_spaces_allowed") and " " in name:
+        if no_spaces and " " in name:
             issues.append("Contains spaces (not allowed by rules).")
-        if rules.get("force_uppercase") and not name.isupper():
+        if force_uppercase and not name.isupper():
             issues.append("Must be in uppercase.")
-        if rules.get("use_underscores") and "_" not in name:
+        if use_underscores and "_" not in name:
             issues.append("Missing underscore delimiters.")
         if "__" in name:
             issues.append("Multiple consecutive underscores found.")
 
         # Character validation
-        for ch in name:
-            if ch not in allowed_chars:
-                issues.append(f"Invalid character found: '{ch}'")
+        if invalid:
+            issues.append(f"Invalid characters found: {describe_invalid(invalid)}")
 
         # Final validation flag
         is_valid = len(issues) == 0
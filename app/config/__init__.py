@@ -1,7 +1,16 @@
-from app.utils.config_loader import load_rules
+from app.utils.rules_registry import get_rules_snapshot
 
-_all_rules = load_rules("campaign_rules.json")
+# Module attributes resolve through the rules registry, so edits to
+# campaign_rules.json are picked up without restarting the app.
+_PLANNER_ATTRS = {
+    "campaign_rules": "campaign_planner",
+    "placement_rules": "placement_planner",
+    "creative_rules": "creative_planner",
+}
 
-campaign_rules = _all_rules["campaign_planner"]
-placement_rules = _all_rules["placement_planner"]
-creative_rules = _all_rules.get("creative_planner", {})
+
+def __getattr__(name):
+    planner = _PLANNER_ATTRS.get(name)
+    if planner is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return get_rules_snapshot().as_dict(planner)
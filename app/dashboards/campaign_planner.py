@@ -1,11 +1,13 @@
 import streamlit as st
 import json
-from app.utils.db_manager import init_db, insert_name, fetch_all_names
+from app.dashboards.duplicate_review import render_pending_save, save_unless_near_duplicate
+from app.utils.db_manager import init_db, insert_name, fetch_recent
+from app.utils.config_loader import NAME_CANDIDATE_LIMIT
+from app.utils.name_candidates import campaign_shortlist
 from app.utils.name_generator import generate_campaign_name
-from app.utils.fuzzy_matcher import find_similar_names
+from app.utils.name_index import get_name_index
 from app.utils.name_validator import validate_campaign_inputs
-from app.ai.run_langgraph_validator import run_langgraph_validator
-from app.utils.config_loader import load_rules
+from app.utils.rules_registry import get_rules_snapshot
 
 
 def render():
@@ -62,8 +64,7 @@ def render():
             st.session_state.generated_name = name
             st.success(f"🧩 **Generated Name:** `{name}`")
 
-            existing_names = fetch_all_names("campaign")
-            matches = find_similar_names(name, existing_names)
+            matches = get_name_index().find_duplicates("campaign", name)
             if matches:
                 st.warning(f"⚠️ Similar names found:\n\n{matches}")
             else:
@@ -81,8 +82,11 @@ def render():
                     "source": "manual",
                     "validation_status": "pending"
                 }
-                insert_name(record)
-                st.success("✅ Saved successfully — no duplicates found!")
+                # ✅ Near-duplicates are held for review instead of being saved straight away
+                if save_unless_near_duplicate(record, key="manual_campaign"):
+                    st.success("✅ Saved successfully — no duplicates found!")
+
+        render_pending_save("manual_campaign")
 
         # --- VALIDATION FOR MANUAL NAME ---
         if st.session_state.get("generated_name"):
@@ -91,7 +95,8 @@ def render():
 
             if st.button("🔍 Validate This Campaign Name"):
                 with st.spinner("Validating campaign name..."):
-                    rules = load_rules("campaign_rules.json")
+                    from app.ai.run_langgraph_validator import run_langgraph_validator
+                    rules = get_rules_snapshot().as_dict("campaign_planner")
                     details = {
                         "advertiser": advertiser,
                         "plan_number": plan_number,
@@ -120,10 +125,10 @@ def render():
 
         st.markdown("""
         Provide campaign context or fill key fields below (auto-UPPERCASE).  
-        The AI will generate standardized campaign names following your naming rules.
+        Names are built locally from your naming rules (valid by construction); the AI ranks them.
         """)
 
-        rules = load_rules("campaign_rules.json")
+        rules = get_rules_snapshot().as_dict("campaign_planner")
 
         # --- STRUCTURED CONTEXT INPUTS ---
         with st.expander("🧩 KEY CAMPAIGN DETAILS (AUTO-UPPERCASE)", expanded=True):
@@ -156,12 +161,18 @@ def render():
             f"{context_text}"
         )
 
-        if st.button("✨ Generate AI Campaign Names"):
+        col_generate, col_retry = st.columns(2)
+        generate_clicked = col_generate.button("✨ Generate AI Campaign Names")
+        retry_clicked = col_retry.button("🔁 Try Again (fresh suggestions)")
+
+        if generate_clicked or retry_clicked:
             if not combined_context.strip():
                 st.warning("Please fill at least one field or provide context before generating.")
                 st.stop()
 
+            preview = st.empty()
             with st.spinner("AI is generating name options..."):
+                from app.ai.run_langgraph_validator import stream_langgraph_validator
                 details = {
                     "advertiser": adv_input,
                     "plan_number": plan_input,
@@ -171,19 +182,37 @@ def render():
                     "month": month,
                     "year": year,
                     "free_form": [],
-                    "context": combined_context
+                    "context": combined_context,
+                    "bypass_cache": retry_clicked
                 }
-                result_state = run_langgraph_validator(details, rules)
-
-                if result_state.get("error"):
-                    st.error(f"Error: {result_state['error']}")
-                else:
-                    suggestions = result_state.get("generated_suggestions", [])
-                    if not suggestions:
-                        st.warning("No AI suggestions generated.")
-                    else:
+                # ✅ Local candidates show immediately; the node ranks this same shortlist
+                details["candidates"] = campaign_shortlist(details, rules)
+                if details["candidates"]:
+                    preview.markdown("\n".join(
+                        f"- `{s['name']}`" for s in details["candidates"][:NAME_CANDIDATE_LIMIT]
+                    ))
+
+                # ✅ Stream node results: suggestions render as soon as generate_step
+                # finishes; validation and fixes fill in afterwards
+                st.session_state.validation_result = None
+                st.session_state.fix_suggestion = None
+                for node_name, update in stream_langgraph_validator(details, rules):
+                    if update.get("error"):
+                        st.error(f"Error: {update['error']}")
+                        break
+
+                    if node_name == "generate_step":
+                        suggestions = update.get("generated_suggestions", [])
+                        if not suggestions:
+                            st.warning("No AI suggestions generated.")
+                            break
                         st.session_state.ai_suggestions = suggestions
+                        preview.markdown("\n".join(f"- `{s['name']}`" for s in suggestions))
                         st.success(f"✅ {len(suggestions)} name suggestions generated!")
+                    elif node_name == "validate_step":
+                        st.session_state.validation_result = update.get("validation_result")
+                    elif node_name == "recommend_fix_step":
+                        st.session_state.fix_suggestion = update.get("fix_suggestion")
 
         # --- DISPLAY AI SUGGESTIONS ---
         if st.session_state.ai_suggestions:
@@ -201,7 +230,8 @@ def render():
 
             if st.button("🔍 Validate Selected Name"):
                 with st.spinner("Validating selected campaign name..."):
-                    rules = load_rules("campaign_rules.json")
+                    from app.ai.run_langgraph_validator import run_langgraph_validator
+                    rules = get_rules_snapshot().as_dict("campaign_planner")
                     details = {
                         "advertiser": adv_input,
                         "plan_number": plan_input,
@@ -280,9 +310,10 @@ def render():
     )
 
     if not current_campaign:
-        existing_names = fetch_all_names("campaign")
-        if existing_names:
-            current_campaign = existing_names[-1]
+        # Newest campaigns first, straight from the created_at index (no full listing)
+        recent = [r["name"] for r in fetch_recent("campaign", limit=10)]
+        if recent:
+            current_campaign = st.selectbox("🕒 Or continue a recent campaign:", recent, index=0, key="recent_campaign")
 
     if current_campaign:
         st.markdown(f"✅ **Selected Campaign:** `{current_campaign}`")
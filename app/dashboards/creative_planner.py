@@ -1,9 +1,53 @@
 import streamlit as st
 import json
-from app.utils.db_manager import init_db, insert_name
-from app.ai.generate_creative_name_node import generate_creative_name_step
+from app.utils.db_manager import init_db, insert_name, insert_names
 from app.ai.validate_creative_name_node import validate_creative_name_step
-from app.config import creative_rules
+from app.utils.rules_registry import get_rules_snapshot
+from app.dashboards.hierarchy_view import render_campaign_tree
+
+
+def _report_bulk_save(outcomes):
+    """Summarize insert_names() outcomes in the UI."""
+    saved = [o["name"] for o in outcomes if o["status"] == "saved"]
+    duplicates = [o["name"] for o in outcomes if o["status"] == "duplicate"]
+    errors = [o for o in outcomes if o["status"] == "error"]
+
+    if saved:
+        st.success(f"✅ {len(saved)} creative(s) saved successfully!")
+    if duplicates:
+        st.warning(f"⚠️ Already in database, skipped: {', '.join(duplicates)}")
+    for o in errors:
+        st.error(f"❌ Could not save `{o['name']}`: {o['error']}")
+
+
+def _generate_mix(context, placements, campaign, rules):
+    """One LLM call per placement, shown as each finishes; returns (names, failed placements)."""
+    from app.ai.generate_creative_name_node import stream_creative_names
+
+    creative_placements = st.session_state.creative_placements
+    state = {
+        "context": context,
+        "creative_rules": rules,
+        "base_placements": placements,
+        "campaign": campaign
+    }
+    names, failed = [], []
+    progress = st.progress(0.0, text="Generating creative mix combinations...")
+    for done, (placement, suggestions, error) in enumerate(stream_creative_names(state), start=1):
+        progress.progress(done / len(placements), text=f"{done}/{len(placements)} placements done")
+        with st.container(border=True):
+            st.markdown(f"**🎯 `{placement}`**")
+            if error:
+                failed.append(placement)
+                st.error(f"⚠️ Generation failed for this placement: {error}")
+                continue
+            for suggestion in suggestions:
+                name = suggestion["name"].upper() if isinstance(suggestion, dict) else str(suggestion).upper()
+                names.append(name)
+                creative_placements[name] = placement
+                st.markdown(f"- `{name}`")
+    progress.empty()
+    return names, failed
 
 
 def render():
@@ -32,11 +76,17 @@ def render():
         st.warning("⚠️ No placements selected. Please go back to the Placement Planner.")
         st.stop()
 
+    render_campaign_tree(active_campaign, key="creative")
+
     # --- Initialize session state ---
     if "current_session_creatives" not in st.session_state:
         st.session_state.current_session_creatives = []
+    # creative name -> placement it was generated for (stored as the record's parent)
+    if "creative_placements" not in st.session_state:
+        st.session_state.creative_placements = {}
+    creative_placements = st.session_state.creative_placements
 
-    rules = creative_rules or {}
+    rules = get_rules_snapshot().as_dict("creative_planner")
     mode = st.radio("Choose Mode", ["Manual Entry", "AI Assisted", "Creative Mix Generator"], horizontal=True)
 
     # -------------------------------------------------
@@ -99,9 +149,11 @@ def render():
                     "source": "manual",
                     "validation_status": "pending",
                     "campaign": active_campaign,
+                    "placement": selected_base,
                     "media_type": creative_type,
                 })
 
+                creative_placements[name] = selected_base
                 st.session_state.current_session_creatives.append(name)
                 st.success(f"💾 Saved `{name}` for this session.")
 
@@ -126,6 +178,7 @@ def render():
                 st.stop()
 
             with st.spinner("Generating creative name suggestions..."):
+                from app.ai.generate_creative_name_node import generate_creative_name_step
                 state = {
                     "context": creative_context,
                     "creative_rules": rules,
@@ -146,6 +199,7 @@ def render():
                     for suggestion in names:
                         name = suggestion["name"].upper() if isinstance(suggestion, dict) else str(suggestion).upper()
                         all_generated.append(name)
+                        creative_placements[name] = placement
             elif isinstance(creative_output, list):
                 for suggestion in creative_output:
                     name = suggestion["name"].upper() if isinstance(suggestion, dict) else str(suggestion).upper()
@@ -190,35 +244,33 @@ def render():
                 st.warning("Please provide at least some campaign or creative context.")
                 st.stop()
 
-            with st.spinner("Generating creative mix combinations..."):
-                state = {
-                    "context": mix_context,
-                    "creative_rules": rules,
-                    "base_placements": selected_placements,
-                    "campaign": active_campaign
-                }
-                ai_output = generate_creative_name_step(state)
+            all_mix_creatives, failed = _generate_mix(mix_context, selected_placements, active_campaign, rules)
+            st.session_state.failed_mix_placements = failed
 
-            if not ai_output or "creative_names" not in ai_output:
+            if not all_mix_creatives:
                 st.error("⚠️ AI generation failed. Please try again.")
                 st.stop()
 
-            creative_output = ai_output["creative_names"]
-            all_mix_creatives = []
-
-            if isinstance(creative_output, dict):
-                for placement, names in creative_output.items():
-                    for suggestion in names:
-                        name = suggestion["name"].upper() if isinstance(suggestion, dict) else str(suggestion).upper()
-                        all_mix_creatives.append(name)
-            elif isinstance(creative_output, list):
-                for suggestion in creative_output:
-                    name = suggestion["name"].upper() if isinstance(suggestion, dict) else str(suggestion).upper()
-                    all_mix_creatives.append(name)
-
             st.session_state.generated_mix_creatives = all_mix_creatives
             st.success(f"✅ Generated {len(all_mix_creatives)} creative options across placements!")
 
+        # --- Re-run only the placements whose call failed ---
+        failed = st.session_state.get("failed_mix_placements", [])
+        if failed:
+            notice = st.empty()
+            notice.warning(f"Some placements failed: {', '.join(failed)}")
+            if st.button(f"🔁 Retry {len(failed)} failed placement(s)"):
+                retried, failed = _generate_mix(mix_context, failed, active_campaign, rules)
+                st.session_state.failed_mix_placements = failed
+                existing = st.session_state.get("generated_mix_creatives", [])
+                st.session_state.generated_mix_creatives = existing + [n for n in retried if n not in existing]
+                if retried:
+                    st.success(f"✅ Added {len(retried)} creative option(s) from the retried placements.")
+                if failed:
+                    notice.warning(f"Some placements failed again: {', '.join(failed)}")
+                else:
+                    notice.empty()
+
         # --- Display mix results if exist ---
         if "generated_mix_creatives" in st.session_state and st.session_state.generated_mix_creatives:
             mix_creatives = st.session_state.generated_mix_creatives
@@ -231,22 +283,28 @@ def render():
             if selected:
                 st.success(f"{len(selected)} creative(s) selected to save.")
                 if st.button("💾 Save Selected Creatives"):
-                    for name in selected:
-                        insert_name({
+                    outcomes = insert_names([
+                        {
                             "planner_type": "creative",
                             "name": name,
                             "campaign": active_campaign,
+                            "placement": creative_placements.get(name),
                             "source": "ai_mix",
                             "validation_status": "pending"
-                        })
-                        if name not in st.session_state.current_session_creatives:
-                            st.session_state.current_session_creatives.append(name)
-                    st.success("✅ Selected creatives saved successfully!")
+                        }
+                        for name in selected
+                    ])
+                    # Only names that were actually written join the session
+                    for outcome in outcomes:
+                        if outcome["status"] == "saved" and outcome["name"] not in st.session_state.current_session_creatives:
+                            st.session_state.current_session_creatives.append(outcome["name"])
+                    _report_bulk_save(outcomes)
             else:
                 st.info("Select at least one creative to save.")
 
             if st.button("🔁 Try Again with New Mix"):
                 del st.session_state.generated_mix_creatives
+                st.session_state.pop("failed_mix_placements", None)
                 st.experimental_rerun()
 
     # -----------------------------
@@ -267,14 +325,17 @@ def render():
         if selected_final:
             st.success(f"{len(selected_final)} creative(s) selected for saving.")
             if st.button("💾 Save Selected to Database"):
-                for name in selected_final:
-                    insert_name({
+                outcomes = insert_names([
+                    {
                         "planner_type": "creative",
                         "name": name,
                         "campaign": active_campaign,
+                        "placement": creative_placements.get(name),
                         "source": "finalized",
                         "validation_status": "pending"
-                    })
-                st.success("✅ All selected creatives saved successfully!")
+                    }
+                    for name in selected_final
+                ])
+                _report_bulk_save(outcomes)
         else:
             st.info("Select at least one creative to save.")
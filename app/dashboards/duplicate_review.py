@@ -0,0 +1,43 @@
+import streamlit as st
+from app.utils.db_manager import insert_name
+from app.utils.name_index import get_name_index
+
+
+def _pending_key(key: str) -> str:
+    return f"{key}_pending_save"
+
+
+def save_unless_near_duplicate(record: dict, key: str) -> bool:
+    """
+    Save `record` if no near-duplicate exists; returns True when saved.
+    Otherwise the record is held in session state until the user confirms
+    or discards it in `render_pending_save`.
+    """
+    near = get_name_index().find_near_duplicates(record["planner_type"], record["name"])
+    if near:
+        st.session_state[_pending_key(key)] = {"record": record, "near": near}
+        return False
+    st.session_state.pop(_pending_key(key), None)
+    insert_name(record)
+    return True
+
+
+def render_pending_save(key: str, on_saved=None):
+    """Near-duplicate review for a held record: save anyway (calls on_saved(name)) or discard."""
+    pending = st.session_state.get(_pending_key(key))
+    if not pending:
+        return
+    name = pending["record"]["name"]
+    st.warning(f"🔎 `{name}` is very similar to existing names. Review before saving:\n\n" + "\n".join(
+        f"- `{n}` ({score:.0f}%)" for n, score in pending["near"]
+    ))
+    col_save, col_discard = st.columns(2)
+    if col_save.button("💾 Save anyway", key=f"{key}_save_anyway"):
+        insert_name(pending["record"])
+        st.session_state.pop(_pending_key(key), None)
+        if on_saved:
+            on_saved(name)
+        st.success(f"💾 Saved `{name}`.")
+    elif col_discard.button("✖️ Discard", key=f"{key}_discard"):
+        st.session_state.pop(_pending_key(key), None)
+        st.info(f"Discarded `{name}`.")
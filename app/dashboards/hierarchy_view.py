@@ -0,0 +1,27 @@
+import streamlit as st
+from app.utils.campaign_tree import get_campaign_tree
+
+
+def render_campaign_tree(campaign: str, key: str) -> dict:
+    """Saved campaign → placement → creative hierarchy in an expander; returns the tree."""
+    tree = get_campaign_tree(campaign)
+    placements = tree["placements"]
+    unlinked = tree["unlinked_creatives"]
+
+    with st.expander(f"🌳 Saved hierarchy: {len(placements)} placement(s), "
+                     f"{sum(len(c) for c in placements.values()) + len(unlinked)} creative(s)"):
+        if st.button("🔄 Refresh", key=f"{key}_refresh_tree"):
+            tree = get_campaign_tree(campaign, force=True)
+            placements, unlinked = tree["placements"], tree["unlinked_creatives"]
+
+        if not placements and not unlinked:
+            st.info("Nothing saved for this campaign yet.")
+        lines = [f"- 📢 `{campaign}`"]
+        for placement, creatives in placements.items():
+            lines.append(f"    - 🎯 `{placement}`")
+            lines.extend(f"        - 🎨 `{c}`" for c in creatives)
+        if unlinked:
+            lines.append("    - ❔ Creatives without a saved placement")
+            lines.extend(f"        - 🎨 `{c}`" for c in unlinked)
+        st.markdown("\n".join(lines))
+    return tree
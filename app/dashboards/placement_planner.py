@@ -1,10 +1,11 @@
 import streamlit as st
 import json
-from app.utils.db_manager import init_db, insert_name, fetch_all_names
-from app.utils.fuzzy_matcher import find_similar_names
-from app.ai.generate_placement_name_node import generate_placement_name_step
+from app.utils.db_manager import init_db, insert_names
+from app.utils.name_index import get_name_index
 from app.ai.validate_placement_name_node import validate_placement_name_step
-from app.config import placement_rules
+from app.utils.rules_registry import get_rules_snapshot
+from app.dashboards.hierarchy_view import render_campaign_tree
+from app.dashboards.duplicate_review import render_pending_save, save_unless_near_duplicate
 
 
 def render():
@@ -24,13 +25,19 @@ def render():
     mode = st.radio("Choose Mode", ["Manual Entry", "AI Assisted"], horizontal=True)
 
     # Load rules
-    rules = placement_rules
+    rules = get_rules_snapshot().as_dict("placement_planner")
     validation_rules = rules.get("validation", {})
 
     # --- Initialize session state for this session's placements ---
     if "current_session_placements" not in st.session_state:
         st.session_state.current_session_placements = []
 
+    # --- Placements already saved for this campaign (campaign index, cached) ---
+    tree = render_campaign_tree(active_campaign, key="placement")
+    saved_placements = [p for p in tree["placements"] if p not in st.session_state.current_session_placements]
+    if saved_placements and st.button(f"📥 Load {len(saved_placements)} saved placement(s) into this session"):
+        st.session_state.current_session_placements.extend(saved_placements)
+
     # -----------------------------
     # MANUAL ENTRY MODE
     # -----------------------------
@@ -89,13 +96,12 @@ def render():
                 st.success(f"✅ Valid Placement Name: **{name}**")
 
                 # ---- Duplicate Check ----
-                existing_names = fetch_all_names("placement")
-                matches = find_similar_names(name, existing_names)
+                matches = get_name_index().find_duplicates("placement", name)
 
                 if matches:
                     st.warning(f"⚠️ Similar names found: {matches}")
                 else:
-                    insert_name({
+                    record = {
                         "planner_type": "placement",
                         "plan_number": plan_number,
                         "campaign": active_campaign,  # <-- NEW: link to campaign
@@ -108,9 +114,13 @@ def render():
                         "targeting": targeting,
                         "size_format": size_format,
                         "free_form": json.dumps(free_forms)
-                    })
-                    st.session_state.current_session_placements.append(name)
-                    st.success(f"💾 Saved `{name}` for this session.")
+                    }
+                    # ✅ Near-duplicates are held for review instead of being saved straight away
+                    if save_unless_near_duplicate(record, key="manual_placement"):
+                        st.session_state.current_session_placements.append(name)
+                        st.success(f"💾 Saved `{name}` for this session.")
+
+        render_pending_save("manual_placement", on_saved=st.session_state.current_session_placements.append)
 
     # -----------------------------
     # AI MODE
@@ -164,6 +174,7 @@ def render():
                 st.stop()
 
             with st.spinner("Generating placement name suggestions..."):
+                from app.ai.generate_placement_name_node import generate_placement_name_step
                 state = {
                     "context": combined_context,
                     "placement_rules": rules
@@ -171,13 +182,15 @@ def render():
                 ai_output = generate_placement_name_step(state)
 
             if not ai_output or "placement_names" not in ai_output:
-                st.error("⚠️ AI generation failed. Please try again.")
+                error = (ai_output or {}).get("error")
+                st.error(f"⚠️ AI generation failed{f': {error}' if error else ''}. "
+                         "Manual Entry (with local validation) still works.")
                 st.stop()
 
             names = ai_output["placement_names"]
             st.success("✅ AI GENERATED SUGGESTIONS:")
 
-            session_names = []
+            records = []
             for i, suggestion in enumerate(names, start=1):
                 name = suggestion["name"].upper()
                 reasoning = suggestion.get("reasoning", "").upper()
@@ -196,7 +209,7 @@ def render():
                     for issue in validation["issues"]:
                         st.markdown(f"- {issue}")
                 else:
-                    insert_name({
+                    records.append({
                         "planner_type": "placement",
                         "plan_number": user_inputs.get("plan_number", ""),
                         "campaign": active_campaign,  # <-- NEW: linked campaign
@@ -210,8 +223,17 @@ def render():
                         "size_format": "",
                         "free_form": "[]"
                     })
-                    session_names.append(name)
-                    st.success(f"💾 SAVED `{name}` TO DATABASE.")
+
+            # ---- Save all valid suggestions in one bulk write ----
+            session_names = []
+            for outcome in insert_names(records) if records else []:
+                if outcome["status"] == "saved":
+                    session_names.append(outcome["name"])
+                    st.success(f"💾 SAVED `{outcome['name']}` TO DATABASE.")
+                elif outcome["status"] == "duplicate":
+                    st.warning(f"⚠️ `{outcome['name']}` ALREADY EXISTS — NOT SAVED.")
+                else:
+                    st.error(f"❌ COULD NOT SAVE `{outcome['name']}`: {outcome['error']}")
 
             if session_names:
                 st.session_state.current_session_placements.extend(session_names)
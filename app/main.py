@@ -1,13 +1,35 @@
 # app/main.py
-import os, sys
+import os, sys, threading
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 import streamlit as st
-from app.dashboards import campaign_planner, placement_planner, creative_planner
+from app.utils import tracing
+from app.utils.startup_report import timed_import, import_report
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Naming Governance App", layout="wide", page_icon="🧩")
 
+
+# --- PRECOMPILE LANGGRAPH PIPELINES (background, once per process) ---
+def _warm_pipelines():
+    timed_import("app.ai.run_langgraph_validator").warm_executors()
+
+
+@st.cache_resource(show_spinner=False)
+def _start_pipeline_warmup():
+    thread = threading.Thread(target=_warm_pipelines, name="langgraph-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# Span attributes worth showing in the sidebar timing panel
+_TIMING_DETAIL_KEYS = (
+    "gen_ai.request.model", "gen_ai.usage.input_tokens", "gen_ai.usage.output_tokens",
+    "gen_ai.prompt.tokens", "gen_ai.prompt.trimmed",
+    "db.page_count", "db.item_count", "aws.dynamodb.consumed_capacity",
+)
+
+
 # --- PERSISTENT PAGE STATE ---
 if "page" not in st.session_state:
     st.session_state.page = "Campaign Planner"
@@ -24,17 +46,57 @@ nav_choice = st.sidebar.radio(
 # Keep sidebar selection in sync
 st.session_state.page = nav_choice
 
-# --- ROUTING MAP ---
+# --- ROUTING MAP (modules import on first visit) ---
 pages = {
-    "Campaign Planner": campaign_planner,
-    "Placement Planner": placement_planner,
-    "Creative Planner": creative_planner,
+    "Campaign Planner": "app.dashboards.campaign_planner",
+    "Placement Planner": "app.dashboards.placement_planner",
+    "Creative Planner": "app.dashboards.creative_planner",
 }
 
 # --- LOAD SELECTED PAGE ---
-page = pages[st.session_state.page]
-page.render()
+if st.session_state.page == "Campaign Planner":
+    _start_pipeline_warmup()
+page = timed_import(pages[st.session_state.page])
+
+# Each rerun is one trace; graph nodes, LLM calls and DB operations nest under it
+trace_ids = st.session_state.setdefault("trace_ids", [])
+with tracing.span("streamlit.rerun", **{"app.page": st.session_state.page}) as rerun_span:
+    try:
+        page.render()
+    finally:
+        trace_ids.append(rerun_span.trace_id)
+        del trace_ids[:-20]
 
 # --- FOOTER ---
 st.sidebar.markdown("---")
+with st.sidebar.expander("⏱️ Startup report"):
+    report = import_report()
+    if report:
+        st.table([{"module": m, "first import (ms)": ms} for m, ms in report])
+    else:
+        st.caption("No modules imported yet.")
+with st.sidebar.expander("🔎 Request timings"):
+    shown = 0
+    for trace_id in reversed(trace_ids):
+        spans = tracing.get_trace(trace_id)
+        if len(spans) < 2:
+            continue   # reruns that did no graph/LLM/DB work
+        rows = tracing.breakdown(spans)
+        st.caption(f"{rows[0]['span']} · {spans[0].attributes.get('app.page', '')} · {rows[0]['ms']} ms")
+        st.table([
+            {
+                "span": r["span"],
+                "ms": r["ms"],
+                "detail": ", ".join(
+                    f"{k.split('.')[-1]}={v}" for k, v in r["attributes"].items()
+                    if k in _TIMING_DETAIL_KEYS
+                ) + (f" ⚠️ {r['error']}" if r["error"] else ""),
+            }
+            for r in rows[1:]
+        ])
+        shown += 1
+        if shown == 3:
+            break
+    if not shown:
+        st.caption("No traced requests yet.")
 st.sidebar.info("💡 Each planner generates standardized names, validates them, and links automatically.")
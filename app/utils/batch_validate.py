@@ -0,0 +1,270 @@
+# app/utils/batch_validate.py
+"""
+Headless batch validation of planner names.
+
+    python -m app.utils.batch_validate plan.csv -o results.jsonl
+    python -m app.utils.batch_validate names.jsonl --planner placement --workers 4
+
+Rows are read lazily from CSV (header row) or JSONL, each with a `name` and
+a `planner_type` (campaign / placement / creative; `--planner` supplies a
+default). A JSONL line that doesn't parse is reported as an invalid row
+with its line number and the parse error; the run carries on. Chunks of rows are validated in worker processes by the same
+steps the dashboards use, checked for duplicates against storage and
+within the file, and written out in input order as they complete.
+At most `workers * 2` chunks are in flight, so memory stays flat no matter
+how large the file is. A throughput summary goes to stderr.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from app.utils.db_manager import PLANNER_TYPES
+
+DEFAULT_CHUNK_SIZE = 2000
+_NAME_KEYS = ("name", "placement_name", "creative_name", "campaign_name")
+_TYPE_KEYS = ("planner_type", "type", "planner")
+
+
+# -------- Input --------
+def _first(row: dict, keys):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _jsonl_records(stream):
+    """Yield (line_no, row, error) per non-blank line; row is None when the line doesn't parse."""
+    for i, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield i, None, f"Malformed JSON at column {e.colno}: {e.msg.removesuffix(' at')}."
+            continue
+        if not isinstance(row, dict):
+            yield i, None, "Malformed row: expected a JSON object."
+            continue
+        yield i, row, None
+
+
+def read_rows(stream, fmt: str, default_planner: str = None):
+    """
+    Yield (line_no, planner_type, name, error) from a CSV or JSONL text stream.
+    `error` is None, or why the line couldn't be read (name is then None).
+    """
+    if fmt == "csv":
+        records = ((i, row, None) for i, row in enumerate(csv.DictReader(stream), start=2))
+    else:
+        records = _jsonl_records(stream)
+    for line_no, row, error in records:
+        if error:
+            yield line_no, (default_planner or "").lower(), None, error
+            continue
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        planner = (_first(row, _TYPE_KEYS) or default_planner or "").lower()
+        yield line_no, planner, _first(row, _NAME_KEYS), None
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# -------- Worker --------
+def _validate(planner: str, names: list, rules: dict) -> list:
+    if planner == "placement":
+        from app.ai.validate_placement_name_node import validate_placement_name_step
+        return validate_placement_name_step(
+            {"placement_names": names, "placement_rules": rules}
+        )["validation_result"]
+    if planner == "creative":
+        from app.ai.validate_creative_name_node import validate_creative_name_step
+        return validate_creative_name_step(
+            {"creative_names": names, "creative_rules": rules}
+        )["validation_result"]
+
+    from app.ai.validate_name_node import validate_name_step
+    out = validate_name_step({"generated_suggestions": [{"name": n} for n in names], "rules": rules})
+    if "error" in out:
+        raise RuntimeError(out["error"])
+    return out["validation_result"]
+
+
+def _warm_worker():
+    """Load the validators and rules up front (inherited for free by forked workers)."""
+    from app.ai import validate_name_node, validate_placement_name_node, validate_creative_name_node  # noqa: F401
+    from app.utils.rules_registry import get_rules_snapshot
+    get_rules_snapshot()
+
+
+def validate_chunk(rows: list) -> list:
+    """
+    Validate one chunk of (line_no, planner_type, name[, error]) rows (runs in
+    a worker). Returns one result dict per row, in the same order.
+    """
+    from app.utils.rules_registry import get_rules_snapshot
+
+    snapshot = get_rules_snapshot()
+    results = [None] * len(rows)
+    groups = {}
+    for pos, row in enumerate(rows):
+        line_no, planner, name = row[:3]
+        if len(row) > 3 and row[3]:
+            issue = row[3]
+        elif not name:
+            issue = "Row has no name."
+        elif planner not in PLANNER_TYPES:
+            issue = f"Unknown planner type '{planner}'."
+        else:
+            groups.setdefault(planner, []).append(pos)
+            continue
+        results[pos] = {"line": line_no, "planner_type": planner, "name": name,
+                        "is_valid": False, "issues": [issue]}
+
+    for planner, positions in groups.items():
+        rules = snapshot.as_dict(f"{planner}_planner")
+        names = [rows[p][2] for p in positions]
+        try:
+            checked = _validate(planner, names, rules)
+        except Exception as e:
+            checked = [{"is_valid": False, "issues": [f"Validator failed: {e}"]}] * len(names)
+        for pos, result in zip(positions, checked):
+            line_no, _, name = rows[pos][:3]
+            results[pos] = {"line": line_no, "planner_type": planner, "name": name,
+                            "is_valid": bool(result.get("is_valid")),
+                            "issues": list(result.get("issues") or [])}
+    return results
+
+
+# -------- Driver --------
+def _result_stream(rows, workers: int, chunk_size: int):
+    """Yield result chunks in input order, keeping at most workers * 2 chunks in flight."""
+    chunks = _chunks(rows, chunk_size)
+    if workers <= 0:
+        for chunk in chunks:
+            yield validate_chunk(chunk)
+        return
+
+    _warm_worker()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(validate_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def run_batch(rows, out, fmt: str = "jsonl", workers: int = 2,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, check_duplicates: bool = True) -> dict:
+    """
+    Validate an iterable of (line_no, planner_type, name[, error]) rows (as from
+    `read_rows`) and write one result per row to `out`. Returns the summary counters.
+    """
+    index = None
+    if check_duplicates:
+        from app.utils.db_manager import init_db
+        from app.utils.name_index import get_name_index, normalize_name
+        init_db()
+        index = get_name_index()
+        # Rows may use any planner type: load them all from one parallel scan
+        index.rebuild()
+    seen = set()
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["line", "planner_type", "name", "is_valid", "duplicate", "issues"])
+
+    summary = {"rows": 0, "valid": 0, "invalid": 0, "duplicates": 0}
+    start = time.perf_counter()
+
+    for results in _result_stream(rows, workers, chunk_size):
+        for r in results:
+            r["duplicate"] = None
+            if index is not None and r["name"] and r["planner_type"] in PLANNER_TYPES:
+                key = (r["planner_type"], normalize_name(r["name"]))
+                if index.contains(r["planner_type"], r["name"]):
+                    r["duplicate"] = "storage"
+                elif key in seen:
+                    r["duplicate"] = "file"
+                seen.add(key)
+
+            summary["rows"] += 1
+            summary["valid" if r["is_valid"] else "invalid"] += 1
+            if r["duplicate"]:
+                summary["duplicates"] += 1
+
+            if writer:
+                writer.writerow([r["line"], r["planner_type"], r["name"], r["is_valid"],
+                                 r["duplicate"] or "", "; ".join(r["issues"])])
+            else:
+                out.write(json.dumps(r) + "\n")
+
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["rows"] / elapsed, 1) if elapsed else None
+    return summary
+
+
+def _detect_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate planner names from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("csv", "jsonl"))
+    parser.add_argument("--planner", choices=PLANNER_TYPES, help="Planner type for rows without one")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (0 = validate inline)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-duplicate-check", action="store_true", help="Skip the storage/in-file duplicate check")
+    args = parser.parse_args(argv)
+
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = _detect_format(args.output, args.output_format)
+
+    stream = (io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+              if args.input == "-" else open(args.input, "r", encoding="utf-8-sig", newline=""))
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        summary = run_batch(
+            read_rows(stream, in_fmt, args.planner), out, fmt=out_fmt,
+            workers=args.workers, chunk_size=max(1, args.chunk_size),
+            check_duplicates=not args.no_duplicate_check,
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(
+        f"✅ {summary['rows']} rows in {summary['seconds']}s "
+        f"({summary['rows_per_second']} rows/s): {summary['valid']} valid, "
+        f"{summary['invalid']} invalid, {summary['duplicates']} duplicates",
+        file=sys.stderr,
+    )
+    return 0 if summary["invalid"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# app/utils/campaign_tree.py
+import threading
+import time
+
+from app.utils.config_loader import CAMPAIGN_TREE_TTL_SECONDS
+
+_PAGE_SIZE = 500
+
+
+class CampaignTree:
+    """
+    One campaign's hierarchy: campaign → placements → creatives.
+
+    - `placements`: {placement_name: [creative_name, ...]}, in creation order.
+    - `unlinked`: creatives saved without a placement (or whose placement
+      isn't a saved placement of this campaign).
+    """
+
+    def __init__(self, campaign: str):
+        self.campaign = campaign
+        self.placements = {}
+        self.unlinked = []
+        self._known = set()
+
+    def add(self, record: dict):
+        name = record.get("name")
+        if not name or name in self._known:
+            return
+        if record.get("planner_type") == "placement":
+            self._known.add(name)
+            self.placements.setdefault(name, [])
+            # Creatives that arrived before their placement (page order) move under it
+            claimed = [c for c in self.unlinked if c[1] == name]
+            if claimed:
+                self.placements[name].extend(c[0] for c in claimed)
+                self.unlinked = [c for c in self.unlinked if c[1] != name]
+        elif record.get("planner_type") == "creative":
+            self._known.add(name)
+            placement = record.get("placement")
+            if placement in self.placements:
+                self.placements[placement].append(name)
+            else:
+                self.unlinked.append((name, placement))
+
+    def as_dict(self) -> dict:
+        return {
+            "campaign": self.campaign,
+            "placements": {p: list(c) for p, c in self.placements.items()},
+            "unlinked_creatives": [c[0] for c in self.unlinked],
+        }
+
+
+class CampaignTreeCache:
+    """
+    Process-wide cache of campaign trees.
+
+    - A tree is built with one paginated by-campaign query per planner type
+      (placement, creative), never a table scan.
+    - Kept current by `record_insert` (called from db_manager writes) and
+      rebuilt once it is older than the TTL, to pick up other processes' writes.
+    """
+
+    def __init__(self, fetch_children, ttl: float = CAMPAIGN_TREE_TTL_SECONDS, page_size: int = _PAGE_SIZE):
+        # fetch_children(campaign, planner_type, limit, start_key) -> (records, next_key)
+        self._fetch_children = fetch_children
+        self._ttl = ttl
+        self._page_size = page_size
+        self._trees = {}         # campaign -> (CampaignTree, monotonic build time)
+        self._lock = threading.RLock()
+
+    def _build(self, campaign: str) -> CampaignTree:
+        tree = CampaignTree(campaign)
+        for planner_type in ("placement", "creative"):
+            start_key = None
+            while True:
+                records, start_key = self._fetch_children(campaign, planner_type, self._page_size, start_key)
+                for record in records:
+                    tree.add(record)
+                if start_key is None:
+                    break
+        return tree
+
+    def get(self, campaign: str, force: bool = False) -> dict:
+        """The campaign's tree as a plain dict (a copy, safe to hand to the UI)."""
+        with self._lock:
+            entry = self._trees.get(campaign)
+            if not entry or force or time.monotonic() - entry[1] >= self._ttl:
+                entry = (self._build(campaign), time.monotonic())
+                self._trees[campaign] = entry
+            return entry[0].as_dict()
+
+    def add(self, record: dict):
+        with self._lock:
+            entry = self._trees.get(record.get("campaign"))
+            # Only trees already loaded are patched; others build in full on first use
+            if entry:
+                entry[0].add(record)
+
+    def invalidate(self, campaign: str = None):
+        with self._lock:
+            if campaign:
+                self._trees.pop(campaign, None)
+            else:
+                self._trees.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tree_cache() -> CampaignTreeCache:
+    """Return the process-wide campaign tree cache (backed by db_manager)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from app.utils.db_manager import fetch_children
+                _cache = CampaignTreeCache(fetch_children)
+    return _cache
+
+
+def get_campaign_tree(campaign: str, force: bool = False) -> dict:
+    """{"campaign", "placements": {placement: [creatives]}, "unlinked_creatives": [...]}"""
+    return get_tree_cache().get(campaign, force=force)
+
+
+def record_insert(item: dict):
+    """Hook for db_manager writes; no-op until the cache has been created."""
+    if _cache is not None and item.get("campaign"):
+        _cache.add(item)
+
+
+def invalidate_trees(campaign: str = None):
+    """Drop cached trees (e.g. after switching storage backends); no-op until the cache exists."""
+    if _cache is not None:
+        _cache.invalidate(campaign)
@@ -0,0 +1,55 @@
+# app/utils/charset_validator.py
+import re
+from functools import lru_cache
+
+# Characters placement/creative names may contain when the rules don't say otherwise
+PLACEMENT_CHARSET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_ -*\\/|"
+CREATIVE_CHARSET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-*/|\\ "
+
+
+class CharsetValidator:
+    """
+    Allowed-character check compiled once per character set.
+
+    - Fast path: ASCII names go through bytes.translate with the allowed
+      characters as the deletion table; an empty result means the name is clean.
+    - Only names that fail are rescanned with a precompiled negated class
+      to collect each invalid character and its positions.
+    """
+
+    def __init__(self, allowed: str):
+        self.allowed = allowed
+        self._delete = allowed.encode("ascii", "ignore")
+        self._invalid_re = re.compile(f"[^{re.escape(allowed)}]")
+
+    def is_clean(self, name: str) -> bool:
+        if name.isascii():
+            return not name.encode("ascii").translate(None, self._delete)
+        return self._invalid_re.search(name) is None
+
+    def scan(self, name: str) -> dict:
+        """{invalid_char: [positions]} in order of first appearance; {} if the name is clean."""
+        if self.is_clean(name):
+            return {}
+        found = {}
+        for m in self._invalid_re.finditer(name):
+            found.setdefault(m.group(), []).append(m.start())
+        return found
+
+    def scan_many(self, names) -> list:
+        """Batched `scan`: one result per name, in order."""
+        is_clean, scan = self.is_clean, self.scan
+        return [{} if is_clean(n) else scan(n) for n in names]
+
+
+def describe_invalid(found: dict) -> str:
+    """{'@': [3, 7], '#': [10]} -> "'@' at 3, 7; '#' at 10" """
+    return "; ".join(
+        f"'{ch}' at {', '.join(str(p) for p in positions)}" for ch, positions in found.items()
+    )
+
+
+@lru_cache(maxsize=64)
+def charset_validator(allowed: str) -> CharsetValidator:
+    """Shared validator per character set (rules rarely change, so this stays tiny)."""
+    return CharsetValidator(allowed)
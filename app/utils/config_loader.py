@@ -1,5 +1,6 @@
 # app/utils/config_loader.py
 import json, os
+from functools import lru_cache
 from pathlib import Path
 
 MYSQL_CONFIG = {
@@ -9,8 +10,87 @@ MYSQL_CONFIG = {
     "database": "naming_planner"
 }
 
+# Storage backend: "dynamodb" (default) or "sqlite" (local file; empty path = repo-root naming_planner.db)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "dynamodb").strip().lower()
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "")
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+
+# DynamoDB: region, table, skip the create/describe bootstrap (table provisioned elsewhere), scan segments
 AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "ap-southeast-2")
 DDB_TABLE_NAME = os.getenv("DDB_TABLE_NAME", "marketing_planner")
+DDB_SKIP_BOOTSTRAP = os.getenv("DDB_SKIP_BOOTSTRAP", "").strip().lower() in ("1", "true", "yes")
+DDB_SCAN_SEGMENTS = int(os.getenv("DDB_SCAN_SEGMENTS", "4"))
+
+# Seconds between incremental (created_at-based) refreshes of the in-memory name index
+NAME_INDEX_REFRESH_SECONDS = float(os.getenv("NAME_INDEX_REFRESH_SECONDS", "30"))
+
+# Seconds a cached campaign → placement → creative tree is served before it is re-queried
+CAMPAIGN_TREE_TTL_SECONDS = float(os.getenv("CAMPAIGN_TREE_TTL_SECONDS", "60"))
+
+# Near-duplicate detection: minimum token-aware similarity (0–100) of the free-text tokens of
+# names with the same plan, objective, month and year, and max matches reported
+NAME_SIMILARITY_THRESHOLD = float(os.getenv("NAME_SIMILARITY_THRESHOLD", "90"))
+NAME_SIMILARITY_LIMIT = int(os.getenv("NAME_SIMILARITY_LIMIT", "5"))
+
+# LLM client: model id, backend ("openai" or "fake" for offline runs) and HTTP pool size
+LLM_MODEL = os.getenv("LLM_MODEL", "o4-mini-2025-04-16")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+# LLM resilience: client-side limits (0 = off), per-request timeout, retries and circuit breaker
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+LLM_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("LLM_LIMIT_MAX_WAIT_SECONDS", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BUDGET_RATIO = float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.2"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# LLM review micro-batching across sessions: collection window (ms, 0 = off) and max requests per call
+LLM_BATCH_WINDOW_MS = float(os.getenv("LLM_BATCH_WINDOW_MS", "10"))
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "16"))
+
+# Creative fan-out: parallel per-placement LLM calls and each placement's deadline (seconds)
+FANOUT_MAX_CONCURRENCY = int(os.getenv("FANOUT_MAX_CONCURRENCY", "4"))
+FANOUT_TIMEOUT_SECONDS = float(os.getenv("FANOUT_TIMEOUT_SECONDS", "45"))
+
+# Campaign suggestions: locally generated candidates shown, and whether the LLM re-ranks them
+NAME_CANDIDATE_LIMIT = int(os.getenv("NAME_CANDIDATE_LIMIT", "5"))
+LLM_RANK_SUGGESTIONS = os.getenv("LLM_RANK_SUGGESTIONS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Max prompt tokens per LLM call (0 = unlimited); oversized free-text inputs are trimmed to fit
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))
+
+# LLM response cache: TTL, in-process LRU size, and optional SQLite file (empty = memory only)
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+
+# Rules registry: minimum seconds between mtime checks of the rules file (0 = every access)
+RULES_RELOAD_CHECK_SECONDS = float(os.getenv("RULES_RELOAD_CHECK_SECONDS", "2"))
+
+# Tracing export: "" (in-memory only), "file" (OTLP/JSON lines) or "otlp" (HTTP collector)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "").strip().lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "naming-planner")
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+
+@lru_cache(maxsize=None)
+def secret(key: str, default=None):
+    """
+    Credentials: environment variable first, then Streamlit secrets.
+    Resolved on first use: parsing secrets.toml is slow enough to show up in cold start.
+    """
+    value = os.getenv(key)
+    if value is not None:
+        return value
+    try:
+        import streamlit as st
+        return st.secrets.get(key, default)
+    except Exception:
+        return default
+
 
 def load_rules(file_name: str):
     """Load JSON rule configuration from app/config folder."""
@@ -1,84 +1,41 @@
 # app/utils/db_manager.py
-import os
 from datetime import datetime, timezone
 
-import boto3
-from botocore.exceptions import ClientError
+from app.utils import campaign_tree, name_index
+from app.utils.storage import get_storage
 
-# If you prefer using Streamlit secrets:
-try:
-    import streamlit as st
-    _SECRETS = getattr(st, "secrets", {})
-except Exception:
-    _SECRETS = {}
+# planner_type values records are stored under, one per planner dashboard
+PLANNER_TYPES = ("campaign", "placement", "creative")
 
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", _SECRETS.get("AWS_ACCESS_KEY_ID"))
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", _SECRETS.get("AWS_SECRET_ACCESS_KEY"))
-AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", _SECRETS.get("AWS_DEFAULT_REGION", "ap-southeast-2"))
-DDB_TABLE_NAME = os.getenv("DDB_TABLE_NAME", _SECRETS.get("DDB_TABLE_NAME", "marketing_planner"))
+# -------- Backend (STORAGE_BACKEND: "dynamodb" by default, or "sqlite") --------
+def init_db(force: bool = False):
+    """
+    Make sure the active backend's table exists.
+    - DynamoDB: table with PK name and GSIs by_planner_type, by_campaign,
+      by_planner_created (PAY_PER_REQUEST).
+    - SQLite: `names` table in WAL mode with planner_type/campaign/created_at indexes.
 
-# -------- Dynamo bootstrap --------
-_session = boto3.session.Session(
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_DEFAULT_REGION,
-)
-_dynamodb = _session.resource("dynamodb")
-_ddb_client = _session.client("dynamodb")
+    Runs at most once per process; use force=True (or recheck_db()) to look again.
+    """
+    get_storage().init_db(force=force)
 
 
-def _table_exists(table_name: str) -> bool:
-    try:
-        _ddb_client.describe_table(TableName=table_name)
-        return True
-    except _ddb_client.exceptions.ResourceNotFoundException:
-        return False
+def recheck_db() -> dict:
+    """Re-run the bootstrap and return the new status."""
+    get_storage().init_db(force=True)
+    return db_status()
 
 
-def init_db():
-    """
-    Create the DynamoDB table with a GSI if it doesn't exist.
-    - PK: name (S)
-    - GSI: by_planner_type (planner_type as HASH)
-    Billing: PAY_PER_REQUEST
-    """
-    if _table_exists(DDB_TABLE_NAME):
-        return
-
-    _ddb_client.create_table(
-        TableName=DDB_TABLE_NAME,
-        AttributeDefinitions=[
-            {"AttributeName": "name", "AttributeType": "S"},
-            {"AttributeName": "planner_type", "AttributeType": "S"},  # for GSI
-        ],
-        KeySchema=[
-            {"AttributeName": "name", "KeyType": "HASH"},
-        ],
-        BillingMode="PAY_PER_REQUEST",
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "by_planner_type",
-                "KeySchema": [{"AttributeName": "planner_type", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},  # simplest; includes all attrs
-            }
-        ],
-        Tags=[{"Key": "app", "Value": "naming-planner"}],
-    )
+def db_status() -> dict:
+    """Snapshot of what the bootstrap learned about the active backend."""
+    return get_storage().status()
 
-    waiter = _ddb_client.get_waiter("table_exists")
-    waiter.wait(TableName=DDB_TABLE_NAME)
 
+_LINK_FIELDS = ("campaign", "placement")
 
-def _get_table():
-    return _dynamodb.Table(DDB_TABLE_NAME)
 
-
-def insert_name(record: dict):
-    """
-    Insert new record, enforcing uniqueness on 'name'.
-    - Uses ConditionExpression to avoid overwriting existing item with same name.
-    """
-    table = _get_table()
+def _build_item(record: dict) -> dict:
+    """Map a planner record onto the stored item shape (None values dropped)."""
     item = {
         # Keys
         "name": record.get("name"),  # PK, must be unique
@@ -89,6 +46,7 @@ def insert_name(record: dict):
         "product": record.get("product"),
         "objective": record.get("objective"),
         "campaign": record.get("campaign"),
+        "placement": record.get("placement"),    # creatives: the placement they belong to
         "month": record.get("month"),
         "year": record.get("year"),
         "strategy_tactic": record.get("strategy_tactic"),
@@ -104,66 +62,128 @@ def insert_name(record: dict):
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
-    # Remove None so we don't store empty attributes
-    item = {k: v for k, v in item.items() if v is not None}
+    # Remove None so we don't store empty attributes; blank links (campaign/placement)
+    # are dropped too, so a record is never filed under an empty parent
+    return {
+        k: v for k, v in item.items()
+        if v is not None and not (k in _LINK_FIELDS and not str(v).strip())
+    }
+
+
+def insert_name(record: dict):
+    """
+    Insert new record, enforcing uniqueness on 'name'.
+    - The backend never overwrites an existing record with the same name.
+    - Returns True if saved, False if a record with that name already exists.
+    """
+    item = _build_item(record)
 
     if not item.get("name"):
         raise ValueError("insert_name() requires 'name' in record")
 
     try:
-        table.put_item(
-            Item=item,
-            ConditionExpression="attribute_not_exists(#n)",  # uniqueness guard
-            ExpressionAttributeNames={"#n": "name"},
-        )
-        print(f"✅ Saved '{item['name']}' successfully.")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-            print(f"⚠️ Record with name '{item['name']}' already exists.")
+        saved = get_storage().insert_item(item)
+    except Exception as e:
+        print(f"⚠️ Error inserting record: {e}")
+        raise
+    if not saved:
+        print(f"⚠️ Record with name '{item['name']}' already exists.")
+        return False
+    print(f"✅ Saved '{item['name']}' successfully.")
+
+    # Keep the in-process duplicate index current without a re-read
+    name_index.record_insert(item.get("planner_type"), item["name"], item["created_at"])
+    campaign_tree.record_insert(item)
+    return True
+
+
+# -------- Bulk writes --------
+_TRANSACT_CHUNK_SIZE = 25          # TransactWriteItems allows up to 100; smaller chunks fail/retry cheaper
+_BULK_MAX_WORKERS = 8
+
+
+def insert_names(records: list, chunk_size: int = _TRANSACT_CHUNK_SIZE,
+                 max_workers: int = _BULK_MAX_WORKERS) -> list:
+    """
+    Bulk insert, enforcing uniqueness on 'name' like insert_name().
+    - Records are chunked (TransactWriteItems calls written in parallel on
+      DynamoDB, one transaction per chunk on SQLite).
+    - Returns one outcome per input record, in input order:
+      {"name": ..., "status": "saved" | "duplicate" | "error", "error": None | str}
+    """
+    items, outcomes, seen = [], [None] * len(records), set()
+    positions = {}
+
+    for pos, record in enumerate(records):
+        item = _build_item(record)
+        name = item.get("name")
+        if not name:
+            outcomes[pos] = {"name": name, "status": "error", "error": "Record requires 'name'."}
+        elif name in seen:
+            # Same name twice in one batch: the first one wins
+            outcomes[pos] = {"name": name, "status": "duplicate", "error": None}
         else:
-            print(f"⚠️ Error inserting record: {e}")
-            raise
+            seen.add(name)
+            positions[name] = pos
+            items.append(item)
+
+    results = get_storage().insert_items(items, chunk_size, max_workers) if items else {}
+
+    for item in items:
+        status, error = results.get(item["name"], ("error", "No result returned."))
+        outcomes[positions[item["name"]]] = {"name": item["name"], "status": status, "error": error}
+        if status == "saved":
+            name_index.record_insert(item.get("planner_type"), item["name"], item["created_at"])
+            campaign_tree.record_insert(item)
+
+    return outcomes
 
 
 def fetch_all_names(planner_type: str = None):
     """
     Fetch list of names.
-    - If planner_type is provided: Query the GSI.
-    - Else: Scan table with projection (only 'name'), paginating until done.
-    """
-    table = _get_table()
-
-    if planner_type:
-        # Query via GSI for efficiency
-        from boto3.dynamodb.conditions import Key
-
-        names = []
-        kwargs = {
-            "IndexName": "by_planner_type",
-            "KeyConditionExpression": Key("planner_type").eq(planner_type),
-            "ProjectionExpression": "#n",
-            "ExpressionAttributeNames": {"#n": "name"},
-        }
-        while True:
-            resp = table.query(**kwargs)
-            names.extend(i["name"] for i in resp.get("Items", []) if "name" in i)
-            if "LastEvaluatedKey" in resp:
-                kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
-            else:
-                break
-        return names
-
-    # No filter: full table scan with projection
-    names = []
-    kwargs = {
-        "ProjectionExpression": "#n",
-        "ExpressionAttributeNames": {"#n": "name"},
-    }
-    while True:
-        resp = table.scan(**kwargs)
-        names.extend(i["name"] for i in resp.get("Items", []) if "name" in i)
-        if "LastEvaluatedKey" in resp:
-            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
-        else:
-            break
-    return names
+    - If planner_type is provided: only that planner type (GSI query / indexed lookup).
+    - Else: every name in the table (parallel scan on DynamoDB).
+    """
+    return get_storage().fetch_all_names(planner_type)
+
+
+def iter_items(attributes=None, segments: int = None, stats: dict = None):
+    """
+    Stream every stored record (full-table exports, audits, index rebuilds).
+    - DynamoDB: parallel segmented Scan over `segments` threads (DDB_SCAN_SEGMENTS).
+    - attributes limits what is read, e.g. ("name", "planner_type", "created_at").
+    - stats, if given, is filled with per-segment {items, pages, seconds, items_per_second}.
+    Items arrive in no particular order.
+    """
+    return get_storage().scan_items(attributes, segments, stats)
+
+
+def fetch_children(campaign: str, planner_type: str = None, limit: int = None, start_key=None):
+    """
+    One page of the records linked to a campaign (campaign-index query, no scan).
+    - planner_type narrows to "placement" or "creative".
+    - Returns (records, next_key); pass next_key back as start_key until it is None.
+    Each record: {name, planner_type, campaign, placement, created_at}.
+    For the whole hierarchy use app.utils.campaign_tree.get_campaign_tree (cached).
+    """
+    return get_storage().fetch_children(campaign, planner_type, limit, start_key)
+
+
+def fetch_recent(planner_type: str, limit: int = 10, advertiser: str = None):
+    """
+    The newest records of a planner type, newest first (one Limit-bounded
+    query on the created_at-ordered index; never lists every name).
+    - advertiser optionally narrows to one advertiser.
+    Each record: {name, planner_type, campaign, advertiser, created_at}.
+    """
+    return get_storage().fetch_recent(planner_type, limit, advertiser)
+
+
+def fetch_name_records(planner_type: str, since: str = None):
+    """
+    Fetch (name, created_at) pairs for one planner type.
+    - If 'since' (ISO timestamp) is given, only records created after it are returned.
+    Used to seed and incrementally refresh the in-memory name index.
+    """
+    return get_storage().fetch_name_records(planner_type, since)
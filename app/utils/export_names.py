@@ -0,0 +1,88 @@
+# app/utils/export_names.py
+"""
+Full-table export of planner records (governance audits, backups).
+
+    python -m app.utils.export_names -o names.jsonl
+    python -m app.utils.export_names -o names.csv --planner placement --segments 8
+
+Records are streamed from the active storage backend's parallel scan
+(DynamoDB Segment/TotalSegments across `--segments` threads) and written
+as they arrive, so memory stays flat no matter how large the table is.
+Rows are in no particular order. Per-segment throughput goes to stderr.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+from app.utils.db_manager import PLANNER_TYPES
+
+EXPORT_COLUMNS = (
+    "name", "planner_type", "campaign", "placement", "advertiser", "plan_number",
+    "source", "validation_status", "created_at",
+)
+
+
+def export_records(out, fmt: str = "jsonl", planner_type: str = None,
+                   columns=EXPORT_COLUMNS, segments: int = None) -> dict:
+    """Write every record (optionally one planner type) to `out`. Returns the summary."""
+    from app.utils.db_manager import init_db, iter_items
+
+    init_db()
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+
+    stats = {}
+    rows = 0
+    start = time.perf_counter()
+    for item in iter_items(columns, segments=segments, stats=stats):
+        if planner_type and item.get("planner_type") != planner_type:
+            continue
+        if writer:
+            writer.writerow(["" if item.get(c) is None else item.get(c) for c in columns])
+        else:
+            out.write(json.dumps({c: item.get(c) for c in columns}, default=str) + "\n")
+        rows += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "scanned": sum(s["items"] for s in stats.values()),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else None,
+        "segments": stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export planner records from the active storage backend.")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults from the output extension")
+    parser.add_argument("--planner", choices=PLANNER_TYPES, help="Only this planner type")
+    parser.add_argument("--segments", type=int, help="Parallel scan segments (default DDB_SCAN_SEGMENTS)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        summary = export_records(out, fmt=fmt, planner_type=args.planner, segments=args.segments)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    for segment, s in sorted(summary["segments"].items()):
+        print(f"   segment {segment}: {s['items']} items, {s['pages']} pages in {s['seconds']}s "
+              f"({s['items_per_second']} items/s)", file=sys.stderr)
+    print(
+        f"✅ Exported {summary['rows']} of {summary['scanned']} records in {summary['seconds']}s "
+        f"({summary['rows_per_second']} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
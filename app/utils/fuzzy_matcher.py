@@ -1,4 +1,23 @@
-def find_similar_names(new_name, existing_names):
+import re
+import threading
+from collections import defaultdict
+
+from rapidfuzz import fuzz, process
+
+from app.utils.config_loader import NAME_SIMILARITY_THRESHOLD, NAME_SIMILARITY_LIMIT
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+# Above this many query×candidate pairs, scoring runs across all cores
+_PARALLEL_CANDIDATES = 20000
+
+
+def _process(name: str) -> str:
+    """Uppercase and turn separators (_, -, /, spaces) into single spaces for token-aware scoring."""
+    return _NON_ALNUM.sub(" ", str(name).upper()).strip()
+
+
+def find_similar_names(new_name, existing_names, threshold=None, limit=None):
     """
     Checks if a new campaign name already exists in the database.
     All comparisons are case-insensitive but normalized to uppercase,
@@ -7,15 +26,168 @@ def find_similar_names(new_name, existing_names):
     Args:
         new_name (str): The name being added or generated.
         existing_names (list): List of existing names from the DB.
+        threshold (float): If given, also return near-duplicates whose
+            token-aware similarity (0–100) is at least this value.
+        limit (int): Maximum number of near-duplicates to return.
 
     Returns:
-        list: Exact duplicate matches (if any).
+        list: Exact duplicate matches (if any), or near-duplicates when
+        a threshold is given.
     """
     if not existing_names:
         return []
 
     # Normalize both new name and existing ones to uppercase
     new_upper = new_name.strip().upper()
-    matches = [name for name in existing_names if name.strip().upper() == new_upper]
+    if threshold is None:
+        return [name for name in existing_names if name.strip().upper() == new_upper]
+
+    matches = process.extract(
+        new_upper, existing_names,
+        scorer=fuzz.token_sort_ratio, processor=_process,
+        score_cutoff=threshold, limit=limit
+    )
+    return [name for name, _score, _idx in matches]
+
+
+class FuzzyIndex:
+    """
+    Near-duplicate search over a large name corpus.
+
+    Blocking keeps each query proportional to its neighbourhood, not the corpus:
+      1. Names are tokenized on separators and indexed by token.
+      2. A query looks up its rarest tokens, tolerating typos by matching them
+         against the token vocabulary (itself fuzzy, but far smaller than the corpus).
+      3. Candidates outside the length bound implied by the threshold are dropped.
+      4. Survivors are scored with RapidFuzz (token_sort_ratio), in parallel for
+         large candidate sets.
+
+    `key(name) -> (group, text)` narrows what is compared: only names in the
+    same group are candidates, and only their `text` is scored (default: one
+    group, whole name).
+    """
+
+    def __init__(self, names=(), rare_tokens: int = 2, token_cutoff: float = 80, max_candidates: int = 5000,
+                 key=None):
+        self.key = key or (lambda name: ("", name))
+        self.rare_tokens = rare_tokens
+        self.token_cutoff = token_cutoff
+        self.max_candidates = max_candidates
+        self._names = []                    # original names
+        self._processed = []                # processed (text) strings, aligned with _names
+        self._groups = []                   # key groups, aligned with _names
+        self._seen = set()
+        self._postings = defaultdict(list)  # token -> [name ids]
+        self._vocab = None                  # cached list(self._postings) for fuzzy token lookup
+        self._lock = threading.RLock()
+        self.add_many(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add_many(self, names):
+        with self._lock:
+            for name in names:
+                self._add(name)
+
+    def add(self, name: str):
+        with self._lock:
+            self._add(name)
+
+    def _add(self, name):
+        key = str(name).strip().upper()
+        if not key or key in self._seen:
+            return
+        self._seen.add(key)
+        idx = len(self._names)
+        group, text = self.key(key)
+        processed = _process(text)
+        self._names.append(key)
+        self._processed.append(processed)
+        self._groups.append(group)
+        for token in set(processed.split()):
+            if token not in self._postings:
+                self._vocab = None
+            self._postings[token].append(idx)
+
+    def _similar_tokens(self, token):
+        if token in self._postings and len(token) < 4:
+            return [token]  # short codes (PM, OCT, 30S) are matched exactly
+        if self._vocab is None:
+            self._vocab = list(self._postings)
+        matches = process.extract(
+            token, self._vocab, scorer=fuzz.ratio,
+            score_cutoff=self.token_cutoff, limit=None
+        )
+        return [m[0] for m in matches] or ([token] if token in self._postings else [])
+
+    def _candidates(self, processed, group, threshold):
+        tokens = set(processed.split())
+        if not tokens:
+            return []
+
+        # Expand each selective token to its typo-tolerant neighbours, then keep the rarest groups.
+        # Tokens shared by most of the corpus (OCT, 2025, SALES) can't narrow anything down.
+        groups = []
+        for token in tokens:
+            if len(self._postings.get(token, ())) > self.max_candidates:
+                continue
+            similar = self._similar_tokens(token)
+            size = sum(len(self._postings[t]) for t in similar)
+            if size:
+                groups.append((size, similar))
+        groups.sort(key=lambda g: g[0])
+        if not groups:
+            known = [t for t in tokens if t in self._postings]
+            if not known:
+                return []
+            rarest = min(known, key=lambda t: len(self._postings[t]))
+            groups = [(len(self._postings[rarest]), [rarest])]
+
+        ids = set()
+        for size, similar in groups[:self.rare_tokens]:
+            if ids and len(ids) + size > self.max_candidates:
+                break
+            for t in similar:
+                ids.update(self._postings[t])
+
+        # Indel similarity >= t requires 2*min(la, lb) / (la + lb) >= t/100
+        qlen = len(processed)
+        ratio = threshold / 100.0
+        lo = qlen * ratio / (2 - ratio) if ratio < 2 else 0
+        hi = qlen * (2 - ratio) / ratio if ratio > 0 else float("inf")
+        return [i for i in ids if self._groups[i] == group and lo <= len(self._processed[i]) <= hi]
+
+    def query(self, name: str, threshold: float = NAME_SIMILARITY_THRESHOLD, limit: int = NAME_SIMILARITY_LIMIT):
+        """Return [(name, score), ...] best first, for names scoring at least `threshold`."""
+        return self.query_many([name], threshold, limit)[0]
+
+    def query_many(self, names, threshold: float = NAME_SIMILARITY_THRESHOLD, limit: int = NAME_SIMILARITY_LIMIT):
+        """Batch version of `query`: one cdist call over the union of all candidates."""
+        keys = [self.key(str(n).strip().upper()) for n in names]
+        queries = [_process(text) for _, text in keys]
+        with self._lock:
+            per_query = [self._candidates(q, group, threshold) for q, (group, _) in zip(queries, keys)]
+            union = sorted(set().union(*per_query)) if per_query else []
+            if not union:
+                return [[] for _ in queries]
+            choices = [self._processed[i] for i in union]
+            column = {cid: col for col, cid in enumerate(union)}
+
+            # Small blocks are cheaper on one core than spinning up the thread pool
+            workers = 1 if len(queries) * len(union) < _PARALLEL_CANDIDATES else -1
+            scores = process.cdist(
+                queries, choices, scorer=fuzz.token_sort_ratio,
+                score_cutoff=threshold, workers=workers
+            )
 
-    return matches
+            results = []
+            for row, candidates in enumerate(per_query):
+                hits = [
+                    (self._names[cid], float(scores[row][column[cid]]))
+                    for cid in candidates
+                    if scores[row][column[cid]] >= threshold
+                ]
+                hits.sort(key=lambda h: (-h[1], h[0]))
+                results.append(hits[:limit] if limit else hits)
+            return results
@@ -1,28 +1,144 @@
 # app/utils/json_parser.py
+import ast
 import json
 import re
 
-def safe_json_parse(text: str):
+try:
+    import orjson
+
+    def _loads(text: str):
+        return orjson.loads(text)
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    _loads = json.loads
+
+
+# Only these characters can change scanner state; everything else is skipped in bulk
+_SPECIAL = re.compile(r"[{}\"'\\]")
+
+
+class JsonObjectExtractor:
     """
-    Extracts and parses JSON from messy LLM output.
+    Incremental, single-pass scanner for balanced {...} objects in LLM output.
+
+    Feed it text (whole or as streamed chunks); each `feed` returns the
+    complete object substrings closed by that chunk. Braces inside string
+    literals (double- or single-quoted) and escaped quotes are handled, so
+    prose, markdown fences or trailing text around the JSON don't matter.
     """
-    # Extract the first JSON-like substring
-    match = re.search(r"\{[\s\S]*\}", text)
-    if not match:
-        raise ValueError("No JSON found in LLM output.")
 
-    json_str = match.group(0)
-    # Replace lowercase true/false/null if present
-    json_str = (
-        json_str.replace("true", "True")
-        .replace("false", "False")
-        .replace("null", "None")
-    )
+    def __init__(self):
+        self._buf = []          # pieces of the object currently being scanned
+        self._depth = 0
+        self._quote = None      # current string delimiter, or None outside strings
+        self._escape = False    # previous chunk ended with a backslash inside a string
+
+    def feed(self, chunk: str) -> list:
+        found = []
+        pos = 0
+        seg_start = 0 if self._depth else None
 
+        if self._escape:
+            self._escape = False
+            pos = 1
+
+        while True:
+            m = _SPECIAL.search(chunk, pos)
+            if m is None:
+                break
+            i, ch = m.start(), m.group()
+            pos = i + 1
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buf = []
+                    seg_start = i
+                continue
+
+            if self._quote:
+                if ch == "\\":
+                    if pos < len(chunk):
+                        pos += 1        # skip the escaped character
+                    else:
+                        self._escape = True
+                elif ch == self._quote:
+                    self._quote = None
+            elif ch in "\"'":
+                self._quote = ch
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buf.append(chunk[seg_start:i + 1])
+                    found.append("".join(self._buf))
+                    self._buf = []
+                    seg_start = None
+
+        if self._depth and seg_start is not None:
+            self._buf.append(chunk[seg_start:])
+        return found
+
+
+def _parse_object(json_str: str):
     try:
-        # Try JSON first
-        return json.loads(json_str)
-    except Exception:
-        # Fallback to literal_eval
-        import ast
+        return _loads(json_str)
+    except ValueError:
+        # Python-literal style output (single quotes, True/None); literal_eval is safe
         return ast.literal_eval(json_str)
+
+
+def validate_schema(data, schema: dict):
+    """
+    Check a parsed object against a lightweight node schema:
+        {"required": {"key": type_or_tuple}, "optional": {"key": type_or_tuple}}
+    Returns the data unchanged, or raises ValueError describing the mismatch.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}.")
+    for key, expected in schema.get("required", {}).items():
+        if key not in data:
+            raise ValueError(f"LLM output is missing required key '{key}'.")
+        if not isinstance(data[key], expected):
+            raise ValueError(f"LLM output key '{key}' has unexpected type {type(data[key]).__name__}.")
+    for key, expected in schema.get("optional", {}).items():
+        if key in data and data[key] is not None and not isinstance(data[key], expected):
+            raise ValueError(f"LLM output key '{key}' has unexpected type {type(data[key]).__name__}.")
+    return data
+
+
+def _first_valid(candidates, schema, errors):
+    for candidate in candidates:
+        try:
+            data = _parse_object(candidate)
+            return validate_schema(data, schema) if schema else data
+        except (ValueError, SyntaxError) as e:
+            errors.append(str(e))
+    return None
+
+
+def safe_json_parse(text: str, schema: dict = None):
+    """
+    Extracts and parses JSON from messy LLM output.
+    Returns the first balanced object that parses (and matches `schema`, if given).
+    """
+    errors = []
+    data = _first_valid(JsonObjectExtractor().feed(text or ""), schema, errors)
+    if data is None:
+        raise ValueError(errors[-1] if errors else "No JSON found in LLM output.")
+    return data
+
+
+def parse_json_stream(chunks, schema: dict = None):
+    """
+    Like safe_json_parse, but consumes an iterable of text chunks (e.g. token
+    stream contents) and returns as soon as the first valid object closes,
+    so parsing overlaps generation.
+    """
+    extractor = JsonObjectExtractor()
+    errors = []
+    for chunk in chunks:
+        data = _first_valid(extractor.feed(chunk or ""), schema, errors)
+        if data is not None:
+            return data
+    raise ValueError(errors[-1] if errors else "No JSON found in LLM output.")
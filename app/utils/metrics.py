@@ -0,0 +1,72 @@
+# app/utils/metrics.py
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Keep the most recent samples per timing; enough for stable percentiles
+_MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timings = defaultdict(lambda: deque(maxlen=_MAX_SAMPLES))
+
+
+def increment(name: str, value: int = 1):
+    """Add to a process-wide counter."""
+    with _lock:
+        _counters[name] += value
+
+
+def record_timing(name: str, seconds: float):
+    """Record one duration sample (seconds) under `name`."""
+    with _lock:
+        _timings[name].append(seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """Context manager that records the wall time of its block under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def snapshot() -> dict:
+    """
+    Current counters and timing summaries:
+    {
+      "counters": {"name": int},
+      "timings": {"name": {"count", "total_ms", "p50_ms", "p95_ms", "max_ms"}}
+    }
+    """
+    with _lock:
+        counters = dict(_counters)
+        samples = {k: sorted(v) for k, v in _timings.items()}
+
+    timings = {}
+    for name, values in samples.items():
+        timings[name] = {
+            "count": len(values),
+            "total_ms": round(sum(values) * 1000, 3),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 3),
+            "max_ms": round((values[-1] if values else 0.0) * 1000, 3),
+        }
+    return {"counters": counters, "timings": timings}
+
+
+def reset():
+    """Clear all counters and timings."""
+    with _lock:
+        _counters.clear()
+        _timings.clear()
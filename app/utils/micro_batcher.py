@@ -0,0 +1,71 @@
+# app/utils/micro_batcher.py
+import threading
+import time
+from concurrent.futures import Future
+
+from app.utils import metrics
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent requests (e.g. from many Streamlit sessions) into one call.
+
+    - `submit(key, item)` blocks until the item's result is ready.
+    - Requests with the same `key` that arrive within `max_wait` seconds of
+      the first one (or until `max_batch_size` are queued) form one batch.
+    - The first caller of a batch runs `process_batch(key, items)` on its own
+      thread, so there is no background worker; it must return one result
+      per item, in order. If it raises, every caller in the batch gets the error;
+      an Exception returned as one item's result is raised to that caller only.
+    """
+
+    def __init__(self, name: str, process_batch, max_batch_size: int = 16, max_wait: float = 0.01):
+        self.name = name
+        self._process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self._pending = {}           # key -> [(item, Future), ...] still accepting requests
+        self._cond = threading.Condition()
+
+    def submit(self, key, item):
+        future = Future()
+        with self._cond:
+            batch = self._pending.get(key)
+            leader = batch is None or len(batch) >= self.max_batch_size
+            if leader:
+                batch = self._pending[key] = []
+            batch.append((item, future))
+            if len(batch) >= self.max_batch_size:
+                self._cond.notify_all()
+
+        if leader:
+            deadline = time.monotonic() + self.max_wait
+            with self._cond:
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                # Close the batch; later arrivals start a new one
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            self._run(key, batch)
+
+        return future.result()
+
+    def _run(self, key, batch):
+        metrics.increment(f"batcher.{self.name}.batches")
+        metrics.increment(f"batcher.{self.name}.requests", len(batch))
+        try:
+            results = self._process_batch(key, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: batch returned {len(results)} results for {len(batch)} requests")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
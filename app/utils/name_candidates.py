@@ -0,0 +1,163 @@
+# app/utils/name_candidates.py
+"""
+Local campaign name candidates, valid by construction.
+
+- Each `format_order` position is filled from the campaign details (enum
+  positions without a value expand to every allowed value).
+- The campaign theme is varied with a descriptor vocabulary (FESTIVAL,
+  LAUNCH, PROMO, ...) and a small synonym table.
+- Every candidate is checked with the compiled rules and, optionally,
+  against existing names, so only valid, unused names are returned.
+
+No LLM call is involved; generate_name_step may ask the LLM to rank the
+shortlist afterwards. `campaign_shortlist` is the one entry point the node
+and the campaign planner share, so both see the same filtered list.
+"""
+import itertools
+import re
+
+from app.utils.config_loader import NAME_CANDIDATE_LIMIT, LLM_RANK_SUGGESTIONS
+from app.utils.rule_engine import MONTHS, compile_rules, planner_block, _normalize_key
+
+DESCRIPTORS = ("FESTIVAL", "LAUNCH", "PROMO", "OFFER", "COLLECTION", "SALE")
+
+SYNONYMS = {
+    "FESTIVAL": ("FESTIVE", "FEST"),
+    "FESTIVALS": ("FESTIVE", "FEST"),
+    "FESTIVE": ("FESTIVAL",),
+    "LAUNCH": ("DEBUT", "INTRO"),
+    "PROMO": ("PROMOTION",),
+    "PROMOTION": ("PROMO",),
+    "OFFER": ("DEAL",),
+    "OFFERS": ("DEALS",),
+    "DEAL": ("OFFER",),
+    "DEALS": ("OFFERS",),
+    "COLLECTION": ("EDIT", "RANGE"),
+    "SALE": ("BONANZA",),
+    "NEW": ("FRESH",),
+    "ARRIVALS": ("DROPS",),
+    "HOLIDAY": ("SEASONAL",),
+}
+
+# Words treated as the theme's descriptor (replaced, not kept, when a new descriptor is tried)
+_DESCRIPTOR_WORDS = frozenset(DESCRIPTORS) | {"FESTIVALS", "FESTIVE", "FEST", "PROMOTION", "OFFERS",
+                                              "DEAL", "DEALS", "SALES", "DEBUT", "INTRO", "EDIT", "RANGE"}
+
+_THEME_FIELD = "campaign"
+_MAX_COMBINATIONS = 500
+
+# Candidates handed to the LLM ranker, per suggestion shown
+SHORTLIST_FACTOR = 2
+
+# "PACIFIC MART (PM)" -> "PM": free-text fields often carry the code in parentheses
+_ABBREVIATION_RE = re.compile(r"\(\s*([A-Za-z0-9-]+)\s*\)")
+
+
+def _words(value) -> list:
+    return re.findall(r"[A-Za-z0-9]+", str(value or "").upper())
+
+
+def theme_variants(theme: str) -> list:
+    """[(theme_token, reasoning), ...]: the theme as entered, descriptor swaps, then synonym swaps."""
+    words = _words(theme)
+    if not words:
+        return []
+    core = [w for w in words if w not in _DESCRIPTOR_WORDS] or words
+
+    variants = [("".join(words), "Campaign theme as entered.")]
+    for descriptor in DESCRIPTORS:
+        variants.append(("".join(core + [descriptor]), f"'{descriptor}' descriptor."))
+    for i, word in enumerate(words):
+        for synonym in SYNONYMS.get(word, ()):
+            variants.append(("".join(words[:i] + [synonym] + words[i + 1:]), f"'{synonym}' in place of '{word}'."))
+
+    seen, out = set(), []
+    for token, reasoning in variants:
+        if token not in seen:
+            seen.add(token)
+            out.append((token, reasoning))
+    return out
+
+
+def _detail_value(details: dict, spec):
+    """The details value for a grammar position ('campaign' matches key 'campaign_name', etc.)."""
+    wanted = {_normalize_key(spec.label), _normalize_key(spec.key)}
+    for key, value in details.items():
+        norm = _normalize_key(key)
+        if norm and any(norm == w or norm.startswith(w) or w.startswith(norm) for w in wanted):
+            return value
+    return None
+
+
+def _clean(token, engine) -> str:
+    token = re.sub(r"[^A-Za-z0-9-]", "", str(token))
+    return token.upper() if engine.force_uppercase else token
+
+
+def _position_options(spec, value, engine) -> list:
+    """[(token, reasoning or None), ...] for one grammar position; [] if it can't be filled."""
+    if _normalize_key(spec.label) == _THEME_FIELD:
+        return [(_clean(t, engine), r) for t, r in theme_variants(value)]
+    if spec.kind == "enum" and not value:
+        return [(v, f"{spec.label} {v}.") for v in sorted(spec.allowed)]
+    if spec.kind == "month" and value:
+        value = str(value).strip().upper()[:3]
+        if value not in MONTHS:
+            return []
+    abbreviation = _ABBREVIATION_RE.search(str(value or ""))
+    token = _clean(abbreviation.group(1) if abbreviation else value or "", engine)
+    if not token:
+        return [] if spec.required else [(None, None)]
+    return [(token, None)]
+
+
+def generate_candidates(details: dict, rules: dict, exists=None, limit: int = 10) -> list:
+    """
+    Up to `limit` valid campaign names for `details`, as [{name, reasoning}, ...],
+    most literal first. `exists(name) -> bool` filters out names already saved.
+    Returns [] when a required position has no value (the caller falls back to the LLM).
+    """
+    engine = compile_rules(planner_block(rules, "campaign_planner"))
+    if not engine.tokens:
+        return []
+
+    positions = []
+    for spec in engine.tokens:
+        options = _position_options(spec, _detail_value(details, spec), engine)
+        if not options:
+            return []
+        positions.append(options)
+
+    extensions = []
+    if engine.allows_extensions:
+        extensions = [_clean(f, engine) for f in details.get("free_form") or [] if _clean(f, engine)]
+
+    sep = engine.separator or ""
+    out, seen = [], set()
+    for combo in itertools.islice(itertools.product(*positions), _MAX_COMBINATIONS):
+        name = sep.join([token for token, _ in combo if token] + extensions)
+        if name in seen:
+            continue
+        seen.add(name)
+        if not engine.check(name)["is_valid"] or (exists and exists(name)):
+            continue
+        reasons = [r for _, r in combo if r]
+        out.append({"name": name, "reasoning": " ".join(reasons) or "Built from the campaign details."})
+        if len(out) >= limit:
+            break
+    return out
+
+
+def campaign_exists(name: str) -> bool:
+    from app.utils.name_index import get_name_index
+    return get_name_index().contains("campaign", name)
+
+
+def campaign_shortlist(details: dict, rules: dict) -> list:
+    """
+    Unused, valid candidates for the campaign planner: NAME_CANDIDATE_LIMIT of
+    them, or SHORTLIST_FACTOR times that when the LLM will rank them. The first
+    NAME_CANDIDATE_LIMIT are the unranked suggestions.
+    """
+    limit = NAME_CANDIDATE_LIMIT * (SHORTLIST_FACTOR if LLM_RANK_SUGGESTIONS else 1)
+    return generate_candidates(details, rules, exists=campaign_exists, limit=limit)
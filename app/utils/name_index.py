@@ -0,0 +1,212 @@
+# app/utils/name_index.py
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.utils.config_loader import (
+    NAME_INDEX_REFRESH_SECONDS, NAME_SIMILARITY_THRESHOLD, NAME_SIMILARITY_LIMIT
+)
+
+# Delta refreshes re-read this far behind the watermark, so records sharing its
+# timestamp (or committed slightly out of order by other processes) aren't missed
+_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+def normalize_name(name: str) -> str:
+    """Names are compared case-insensitively; rules enforce uppercase globally."""
+    return str(name).strip().upper()
+
+
+def _free_text_key(planner_type: str) -> tuple:
+    """(rules version, FuzzyIndex key) for a planner type; key is None if it has no grammar."""
+    from app.utils.rules_registry import get_rules_snapshot
+
+    snapshot = get_rules_snapshot()
+    engine = snapshot.validator(f"{planner_type}_planner")
+    return snapshot.version, (engine.free_text_key if engine else None)
+
+
+class NameIndex:
+    """
+    Process-wide set of existing names, keyed by planner type.
+
+    - Filled once per planner type with a full GSI read (or every type at
+      once by `rebuild`, from a parallel table scan).
+    - Kept current by `record_insert` (called from db_manager.insert_name)
+      and by a throttled delta refresh of records newer than the last
+      `created_at` fetched from the store (minus a small overlap; the set
+      dedupes). Local inserts never move that watermark, so names other
+      processes saved earlier are still picked up.
+    - Duplicate checks are a hash-set lookup, no network round-trip.
+    """
+
+    def __init__(self, fetch_records, refresh_interval: float = NAME_INDEX_REFRESH_SECONDS, scan_items=None):
+        # fetch_records(planner_type, since=None) -> [(name, created_at), ...]
+        self._fetch_records = fetch_records
+        # scan_items(attributes) -> iterator of item dicts (for rebuild())
+        self._scan_items = scan_items
+        self._refresh_interval = refresh_interval
+        self._names = {}         # planner_type -> set of normalized names
+        self._watermark = {}     # planner_type -> latest created_at fetched from the store (ISO string)
+        self._last_sync = {}     # planner_type -> monotonic time of last load/refresh
+        self._fuzzy = {}         # planner_type -> FuzzyIndex, built on first near-duplicate query
+        self._fuzzy_rules = {}   # planner_type -> rules version the FuzzyIndex key was built from
+        self._lock = threading.RLock()
+
+    def _merge(self, planner_type, records, from_store: bool = True):
+        """Add records to the set; only records read from the store advance the watermark."""
+        names = self._names.setdefault(planner_type, set())
+        fuzzy = self._fuzzy.get(planner_type)
+        watermark = self._watermark.get(planner_type)
+        for name, created_at in records:
+            names.add(normalize_name(name))
+            if fuzzy is not None:
+                fuzzy.add(name)
+            if from_store and created_at and (watermark is None or created_at > watermark):
+                watermark = created_at
+        self._watermark[planner_type] = watermark
+        return names
+
+    @staticmethod
+    def _overlap(since):
+        """The watermark moved back by _REFRESH_OVERLAP (unchanged if it can't be parsed)."""
+        try:
+            return (datetime.fromisoformat(since) - _REFRESH_OVERLAP).isoformat()
+        except (TypeError, ValueError):
+            return since
+
+    def _ensure_loaded(self, planner_type) -> set:
+        names = self._names.get(planner_type)
+        if names is not None:
+            return names
+        with self._lock:
+            names = self._names.get(planner_type)
+            if names is not None:
+                return names
+            records = self._fetch_records(planner_type)
+            self._names[planner_type] = set()
+            names = self._merge(planner_type, records)
+            self._last_sync[planner_type] = time.monotonic()
+            return names
+
+    def refresh(self, planner_type: str, force: bool = False) -> set:
+        """
+        Pull records created since the watermark (at most once per refresh
+        interval). Returns the planner type's name set.
+        """
+        names = self._ensure_loaded(planner_type)
+        now = time.monotonic()
+        if not force and now - self._last_sync.get(planner_type, 0) < self._refresh_interval:
+            return names
+        with self._lock:
+            if not force and now - self._last_sync.get(planner_type, 0) < self._refresh_interval:
+                return self._ensure_loaded(planner_type)
+            since = self._watermark.get(planner_type)
+            if since is None:
+                # Invalidated since the check above (or nothing dated yet): full load
+                self._names.pop(planner_type, None)
+                names = self._ensure_loaded(planner_type)
+            else:
+                names = self._merge(planner_type, self._fetch_records(planner_type, since=self._overlap(since)))
+            self._last_sync[planner_type] = time.monotonic()
+            return names
+
+    def rebuild(self) -> int:
+        """
+        Reload every planner type from one full-table (parallel) scan instead
+        of one query per type. Returns the number of names loaded.
+        """
+        grouped = {}
+        for item in self._scan_items(("name", "planner_type", "created_at")):
+            if item.get("name") and item.get("planner_type"):
+                grouped.setdefault(item["planner_type"], []).append((item["name"], item.get("created_at")))
+        with self._lock:
+            self.invalidate()
+            now = time.monotonic()
+            for planner_type, records in grouped.items():
+                self._names[planner_type] = set()
+                self._merge(planner_type, records)
+                self._last_sync[planner_type] = now
+        return sum(len(records) for records in grouped.values())
+
+    def contains(self, planner_type: str, name: str) -> bool:
+        return normalize_name(name) in self.refresh(planner_type)
+
+    def find_duplicates(self, planner_type: str, name: str) -> list:
+        """Same contract as fuzzy_matcher.find_similar_names: list of exact matches."""
+        return [normalize_name(name)] if self.contains(planner_type, name) else []
+
+    def find_near_duplicates(self, planner_type: str, name: str,
+                             threshold: float = NAME_SIMILARITY_THRESHOLD,
+                             limit: int = NAME_SIMILARITY_LIMIT) -> list:
+        """
+        Names similar to `name` (excluding an exact match), best first,
+        as [(name, score), ...]. Only the free-text tokens are compared, among
+        names with the same plan number, objective, month and year, so routine
+        month or plan variants aren't reported. The fuzzy index is built once
+        per planner type (and again when its rules change).
+        """
+        names = self.refresh(planner_type)
+        version, key = _free_text_key(planner_type)
+        fuzzy = self._fuzzy.get(planner_type)
+        if fuzzy is None or self._fuzzy_rules.get(planner_type) != version:
+            from app.utils.fuzzy_matcher import FuzzyIndex
+            with self._lock:
+                fuzzy = self._fuzzy.get(planner_type)
+                if fuzzy is None or self._fuzzy_rules.get(planner_type) != version:
+                    fuzzy = FuzzyIndex(names, key=key)
+                    self._fuzzy[planner_type] = fuzzy
+                    self._fuzzy_rules[planner_type] = version
+        key = normalize_name(name)
+        hits = fuzzy.query(key, threshold, limit + 1 if limit else limit)
+        hits = [h for h in hits if h[0] != key]
+        return hits[:limit] if limit else hits
+
+    def add(self, planner_type: str, name: str, created_at: str = None):
+        with self._lock:
+            # Only track planner types that are already loaded; others load in full on first use
+            if planner_type in self._names:
+                self._merge(planner_type, [(name, created_at)], from_store=False)
+
+    def names(self, planner_type: str) -> frozenset:
+        names = self.refresh(planner_type)
+        with self._lock:
+            return frozenset(names)
+
+    def invalidate(self, planner_type: str = None):
+        """Drop cached names (all planner types if none given); next use reloads in full."""
+        with self._lock:
+            keys = [planner_type] if planner_type else list(self._names)
+            for key in keys:
+                self._names.pop(key, None)
+                self._watermark.pop(key, None)
+                self._last_sync.pop(key, None)
+                self._fuzzy.pop(key, None)
+                self._fuzzy_rules.pop(key, None)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_name_index() -> NameIndex:
+    """Return the process-wide name index (backed by db_manager)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from app.utils.db_manager import fetch_name_records, iter_items
+                _index = NameIndex(fetch_name_records, scan_items=iter_items)
+    return _index
+
+
+def record_insert(planner_type: str, name: str, created_at: str = None):
+    """Hook for db_manager writes; no-op until the index has been created."""
+    if _index is not None and planner_type:
+        _index.add(planner_type, name, created_at)
+
+
+def invalidate_index(planner_type: str = None):
+    """Drop cached names (e.g. after switching storage backends); no-op until the index exists."""
+    if _index is not None:
+        _index.invalidate(planner_type)
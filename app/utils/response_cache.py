@@ -0,0 +1,145 @@
+# app/utils/response_cache.py
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils import metrics
+from app.utils.config_loader import LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH
+
+
+def make_key(namespace: str, model: str, inputs) -> str:
+    """Content address for an LLM call: node namespace + model id + canonicalized inputs."""
+    canonical = json.dumps(
+        {"ns": namespace, "model": model, "inputs": inputs},
+        sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for parsed LLM responses.
+
+    - Memory tier: LRU (OrderedDict) bounded by `max_entries`.
+    - Disk tier (optional): SQLite file so entries survive Streamlit restarts.
+    Both tiers honour the same TTL. Values must be JSON-serializable.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = LLM_CACHE_TTL_SECONDS, sqlite_path: str = LLM_CACHE_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._memory = OrderedDict()     # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "evictions": 0}
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _count(self, stat: str):
+        self._stats[stat] += 1
+        metrics.increment(f"llm_cache.{stat}")
+
+    def _remember(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._count("evictions")
+
+    def get(self, key: str):
+        """Return a copy of the cached value, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._count("memory_hits")
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self._count("disk_hits")
+                    return copy.deepcopy(value)
+                if row:
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self._count("misses")
+            return None
+
+    def set(self, key: str, value):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at)
+                )
+                self._db.commit()
+
+    def get_or_compute(self, namespace: str, model: str, inputs, compute, bypass: bool = False):
+        """
+        Return the cached result for (namespace, model, inputs), or call
+        `compute()` and store its result. With bypass=True the cache is not
+        read (fresh "Try Again" results) but the new result is still stored.
+        """
+        key = make_key(namespace, model, inputs)
+        if bypass:
+            with self._lock:
+                self._count("bypassed")
+        else:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+        value = compute()
+        if value is not None:
+            self.set(key, copy.deepcopy(value))
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache (configured from config_loader)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,361 @@
+# app/utils/rule_engine.py
+import hashlib
+import itertools
+import json
+import re
+import threading
+
+MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+# Tokens allowed inside a single name segment when the rules don't say otherwise
+_DEFAULT_TOKEN_PATTERN = r"[A-Za-z0-9-]+"
+
+# Shape of size / format / duration segments (1080X1080, 15S, 30SEC, 16:9), so an
+# optional position is recognised by its content rather than by its index
+_SIZE_FORMAT_PATTERN = r"\d+X\d+|\d+(?:S|SEC|SECS|MS)|\d+:\d+"
+_SIZE_FORMAT_WORDS = ("size", "format", "duration")
+
+# Upper bound on alternative segment assignments tried per name
+_MAX_ASSIGNMENTS = 64
+
+
+def _normalize_key(value: str) -> str:
+    """'PlanNumber', 'plan_number' and 'Plan Number' all become 'plannumber'."""
+    return re.sub(r"[^a-z0-9]", "", str(value).lower())
+
+
+def _snake_case(value: str) -> str:
+    """'TargetAudience' -> 'target_audience'."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", str(value)).lower()
+
+
+def rules_digest(rules) -> str:
+    """Stable content hash of a rules block (used as compile/cache key)."""
+    canonical = json.dumps(rules, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TokenSpec:
+    """
+    One position of the naming grammar, derived from a `format_order` entry.
+
+    kind:
+      - "enum"    → must be one of `allowed`
+      - "month"   → three-letter month abbreviation (JAN–DEC)
+      - "year"    → four digits
+      - "numeric" → digits only
+      - "free"    → any well-formed token; the grammar can't judge its meaning
+
+    `pattern` (optional) is what a segment of this position looks like; a
+    position with a pattern may span up to `max_segments` consecutive
+    segments (e.g. SizeFormatDuration = 1080X1080_15S) and, if optional, is
+    only assumed present when the segment matches it.
+    """
+
+    __slots__ = ("label", "key", "kind", "allowed", "required", "pattern", "max_segments")
+
+    def __init__(self, label, key, kind, allowed=None, required=True, pattern=None, max_segments=1):
+        self.label = label
+        self.key = key
+        self.kind = kind
+        self.allowed = frozenset(allowed or ())
+        self.required = required
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.max_segments = max(1, int(max_segments))
+
+    def matches(self, segment: str) -> bool:
+        return bool(self.pattern and self.pattern.fullmatch(segment))
+
+    def check(self, token: str):
+        """Return an issue string, or None if the token fits this position."""
+        value = token.upper()
+        if self.kind == "enum" and value not in self.allowed:
+            return f"{self.label} '{token}' is not one of: {', '.join(sorted(self.allowed))}."
+        if self.kind == "month" and value not in MONTHS:
+            return f"{self.label} '{token}' must be a three-letter month (JAN–DEC)."
+        if self.kind == "year" and not (len(token) == 4 and token.isdigit()):
+            return f"{self.label} '{token}' must be four digits."
+        if self.kind == "numeric" and not token.isdigit():
+            return f"{self.label} '{token}' must be numeric."
+        return None
+
+
+class CompiledRules:
+    """
+    A planner's rules block compiled into a positional token grammar.
+
+    Built once per rules version (see `compile_rules`) and then reused for
+    every name, so validation is a split plus a handful of set lookups.
+    """
+
+    def __init__(self, rules: dict):
+        validation = rules.get("validation", {}) or {}
+        self.version = rules_digest(rules)
+        self.force_uppercase = bool(validation.get("force_uppercase", False))
+        self.use_underscores = bool(validation.get("use_underscores", False))
+        self.no_spaces = bool(validation.get("no_spaces_allowed", False))
+        self.separator = "_" if self.use_underscores else None
+        self.token_re = re.compile(validation.get("token_pattern", _DEFAULT_TOKEN_PATTERN))
+        self.tokens = self._build_grammar(rules, validation)
+        self.allows_extensions = any(
+            f.get("repeatable") for f in rules.get("fields", []) if isinstance(f, dict)
+        )
+
+    # ------------------------------------------------------------------
+    # Grammar construction
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _find_field(label, fields):
+        wanted = _normalize_key(label)
+        for field in fields:
+            key = _normalize_key(field.get("key", ""))
+            if key and (key == wanted or key.startswith(wanted) or wanted.startswith(key)):
+                return field
+        return None
+
+    def _build_grammar(self, rules, validation):
+        fields = [f for f in rules.get("fields", []) if isinstance(f, dict) and not f.get("repeatable")]
+        specs = []
+        for label in rules.get("format_order", []):
+            field = self._find_field(label, fields) or {}
+            snake = _snake_case(label)
+            norm = _normalize_key(label)
+
+            # allowed values: field-level list, or validation-level "allowed_<plural>"
+            allowed = field.get("allowed_values") or validation.get(f"allowed_{snake}s")
+
+            if allowed:
+                kind = "enum"
+            elif norm == "month":
+                kind = "month"
+            elif norm == "year":
+                kind = "year"
+            elif norm == "plannumber":
+                kind = "numeric"
+            else:
+                kind = "free"
+
+            required = field.get("required", True)
+            if f"{snake}_required" in validation:
+                required = bool(validation[f"{snake}_required"])
+
+            # segment shape: field "pattern", validation "<label>_pattern", or the size/format default
+            pattern = field.get("pattern") or validation.get(f"{snake}_pattern")
+            max_segments = field.get("max_segments", 1)
+            if not pattern and kind == "free" and any(w in snake for w in _SIZE_FORMAT_WORDS):
+                pattern = _SIZE_FORMAT_PATTERN
+                max_segments = field.get("max_segments", sum(w in snake for w in _SIZE_FORMAT_WORDS))
+
+            specs.append(TokenSpec(label, field.get("key", snake), kind, allowed, required, pattern, max_segments))
+        return specs
+
+    def describe(self) -> str:
+        """
+        Compact, prompt-ready summary of the grammar, e.g.
+            FORMAT: Advertiser_PlanNumber_..._Year
+            Objective: one of AWAR|LEADS|SALES
+            Month: JAN–DEC
+            Style: UPPERCASE, '_' between tokens, no spaces
+        """
+        sep = self.separator or ""
+        lines = [f"FORMAT: {sep.join(s.label for s in self.tokens)}"]
+        for spec in self.tokens:
+            if spec.kind == "enum":
+                lines.append(f"{spec.label}: one of {'|'.join(sorted(spec.allowed))}")
+            elif spec.kind == "month":
+                lines.append(f"{spec.label}: JAN–DEC")
+            elif spec.kind == "year":
+                lines.append(f"{spec.label}: 4 digits")
+            elif spec.kind == "numeric":
+                lines.append(f"{spec.label}: digits only")
+        optional = [s.label for s in self.tokens if not s.required]
+        if optional:
+            lines.append(f"Optional: {', '.join(optional)}")
+        style = []
+        if self.force_uppercase:
+            style.append("UPPERCASE")
+        if self.use_underscores:
+            style.append("'_' between tokens")
+        if self.no_spaces:
+            style.append("no spaces")
+        if self.allows_extensions:
+            style.append("free-form extensions allowed at the end")
+        if style:
+            lines.append("Style: " + ", ".join(style))
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+    def split(self, name: str):
+        if self.separator:
+            return name.split(self.separator)
+        return [name]
+
+    def check(self, name: str) -> dict:
+        """
+        Validate a single name.
+
+        Returns the standard validation payload plus `free_tokens`, the
+        {label: token} pairs the grammar accepted without being able to
+        judge their meaning (e.g. Product, Campaign, free-form extensions).
+        """
+        issues = []
+
+        if self.no_spaces and " " in name:
+            issues.append("Contains spaces (not allowed by rules).")
+        if self.force_uppercase and name != name.upper():
+            issues.append("Must be in uppercase.")
+        if self.use_underscores and "_" not in name:
+            issues.append("Missing underscore delimiters.")
+
+        parts = self.split(name.strip())
+        if self.separator and any(p == "" for p in parts):
+            issues.append("Empty segment (leading, trailing or consecutive underscores).")
+        parts = [p for p in parts if p]
+
+        # Most literal (positional) assignment first; the first one without issues wins
+        best = None
+        for assignment in itertools.islice(self._assignments(parts), _MAX_ASSIGNMENTS):
+            result = self._check_assignment(assignment, parts)
+            if best is None or not result[0]:
+                best = result
+            if not result[0]:
+                break
+        segment_issues, free_tokens = best
+        issues.extend(segment_issues)
+
+        is_valid = not issues
+        return {
+            "name": name,
+            "is_valid": is_valid,
+            "issues": issues,
+            "reasoning": (
+                f"Matches format {'_'.join(s.label for s in self.tokens)}."
+                if is_valid else " ".join(issues)
+            ),
+            "free_tokens": free_tokens,
+        }
+
+    def _assignments(self, parts, i: int = 0, j: int = 0):
+        """
+        Yield ways to map `parts` onto the grammar as [(spec, segments), ...]
+        (leftover parts are extensions). Positions with a pattern take the whole
+        run of matching segments (up to max_segments); optional positions can
+        be skipped unless the next segment matches their pattern.
+        """
+        if i == len(self.tokens):
+            yield []
+            return
+        spec = self.tokens[i]
+        remaining = len(parts) - j
+        if spec.pattern:
+            run = 0
+            while run < min(spec.max_segments, remaining) and spec.matches(parts[j + run]):
+                run += 1
+            # Matching segments always belong to this position, never to a later field
+            takes = [run] if run else []
+            if spec.required and not run and remaining:
+                takes.append(1)      # present but malformed; reported by the checks
+        else:
+            run = 0
+            takes = [1] if remaining else []
+        # A segment matching an optional position's pattern is taken as that position
+        if (not spec.required and not run) or not remaining:
+            takes.append(0)
+        for take in takes:
+            for rest in self._assignments(parts, i + 1, j + take):
+                yield [(spec, parts[j:j + take])] + rest
+
+    def _check_assignment(self, assignment, parts):
+        """(issues, free_tokens) for one assignment from _assignments."""
+        issues, free_tokens, used = [], {}, 0
+        for spec, segments in assignment:
+            used += len(segments)
+            if not segments:
+                continue
+            token = (self.separator or "").join(segments)
+            bad = [s for s in segments if not self.token_re.fullmatch(s)]
+            if bad:
+                issues.append(f"{spec.label} '{token}' contains invalid characters.")
+                continue
+            issue = spec.check(token)
+            if issue:
+                issues.append(issue)
+            elif spec.kind == "free":
+                free_tokens[spec.label] = token
+
+        missing = [spec.label for spec, segments in assignment if spec.required and not segments]
+        if missing:
+            issues.append(f"Missing required components: {', '.join(missing)}.")
+
+        extras = parts[used:]
+        if extras:
+            if not self.allows_extensions:
+                issues.append(f"Unexpected extra components: {', '.join(extras)}.")
+            else:
+                for i, token in enumerate(extras, start=1):
+                    if not self.token_re.fullmatch(token):
+                        issues.append(f"Free-form component '{token}' contains invalid characters.")
+                    else:
+                        free_tokens[f"FreeForm{i}"] = token
+        return issues, free_tokens
+
+    def free_text_key(self, name: str) -> tuple:
+        """
+        (fixed, free) split of a name for near-duplicate search: `fixed` joins
+        the segments the grammar judges itself (plan number, enums, month,
+        year), `free` the free-text ones. Names with different fixed tokens
+        are distinct plans or flights, not near-duplicates. A name that
+        doesn't parse is all free text.
+        """
+        name = name.strip().upper()
+        result = self.check(name)
+        if not result["is_valid"] or not self.separator:
+            return "", name
+        fixed = self.split(name)
+        free = []
+        for token in result["free_tokens"].values():
+            for segment in self.split(token):
+                fixed.remove(segment)
+                free.append(segment)
+        return self.separator.join(fixed), self.separator.join(free)
+
+    def validate(self, names) -> list:
+        """Validate a list of names; returns [{name, is_valid, issues, reasoning}, ...]."""
+        results = []
+        for name in names:
+            result = self.check(name)
+            result.pop("free_tokens")
+            results.append(result)
+        return results
+
+
+_COMPILED = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def compile_rules(rules: dict) -> CompiledRules:
+    """
+    Compile (or fetch the cached compilation of) a planner rules block.
+    Cached by content hash, so edited rules recompile automatically.
+    """
+    key = rules_digest(rules)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        with _COMPILED_LOCK:
+            compiled = _COMPILED.get(key)
+            if compiled is None:
+                compiled = CompiledRules(rules)
+                _COMPILED[key] = compiled
+    return compiled
+
+
+def planner_block(rules: dict, planner: str) -> dict:
+    """
+    Accept either a single planner block or the whole rules file
+    ({"campaign_planner": {...}, ...}) and return the planner block.
+    """
+    if isinstance(rules, dict) and planner in rules and "format_order" not in rules:
+        return rules[planner]
+    return rules or {}
@@ -0,0 +1,152 @@
+# app/utils/rules_registry.py
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from app.utils.config_loader import RULES_RELOAD_CHECK_SECONDS
+from app.utils.rule_engine import compile_rules
+
+_CONFIG_DIR = Path(__file__).resolve().parents[1] / "config"
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class RulesSnapshot:
+    """
+    One immutable, fully compiled version of a rules file.
+
+    - `version` is the sha256 of the file contents; use it as a cache key.
+    - `planner(name)` returns a read-only view of a planner block.
+    - `as_dict(name)` returns a private, mutable copy for code that expects
+      a plain dict (LangGraph state, nodes); edits never leak back.
+    - `validator(name)` / `prompt_fragment(name)` are precompiled per planner.
+    """
+
+    def __init__(self, raw: dict, version: str, path: Path, mtime: float):
+        self.version = version
+        self.path = path
+        self.mtime = mtime
+        self.loaded_at = time.time()
+        self._raw = raw
+        self._frozen = _freeze(raw)
+        self._validators = {}
+        self._fragments = {}
+        for planner, block in raw.items():
+            if isinstance(block, dict) and "format_order" in block:
+                engine = compile_rules(block)
+                self._validators[planner] = engine
+                self._fragments[planner] = engine.describe()
+
+    @property
+    def planners(self) -> tuple:
+        return tuple(self._raw)
+
+    def planner(self, name: str):
+        return self._frozen.get(name, MappingProxyType({}))
+
+    def as_dict(self, name: str = None) -> dict:
+        """Deep copy of one planner block (or the whole file if no name is given)."""
+        if name is None:
+            return copy.deepcopy(self._raw)
+        return copy.deepcopy(self._raw.get(name, {}))
+
+    def validator(self, name: str):
+        """Compiled rule_engine grammar for a planner (None if it has no format_order)."""
+        return self._validators.get(name)
+
+    def prompt_fragment(self, name: str) -> str:
+        """Prompt-ready summary of a planner's format, allowed values and style rules."""
+        return self._fragments.get(name, "")
+
+
+class RulesRegistry:
+    """
+    Parses a rules file once and serves immutable snapshots.
+
+    The file's mtime is checked at most every `check_interval` seconds; when
+    it changes the file is re-read, and a new snapshot is published only if
+    the content hash actually differs. The last mtime read is tracked here,
+    never by updating a published snapshot. A file that fails to parse keeps the
+    last good snapshot in service.
+    """
+
+    def __init__(self, path, check_interval: float = RULES_RELOAD_CHECK_SECONDS):
+        self.path = Path(path)
+        self._check_interval = check_interval
+        self._snapshot = None
+        self._mtime = None          # mtime of the file as last read successfully
+        self._last_check = 0.0
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    def _load(self, mtime: float):
+        data = self.path.read_bytes()
+        version = hashlib.sha256(data).hexdigest()
+        if self._snapshot is not None and self._snapshot.version == version:
+            return self._snapshot       # touched, not changed
+        return RulesSnapshot(json.loads(data), version, self.path, mtime)
+
+    def snapshot(self) -> RulesSnapshot:
+        now = time.monotonic()
+        current = self._snapshot
+        if current is not None and now - self._last_check < self._check_interval:
+            return current
+        with self._lock:
+            if self._snapshot is not None and now - self._last_check < self._check_interval:
+                return self._snapshot
+            self._last_check = now
+            mtime = os.stat(self.path).st_mtime
+            if self._snapshot is None:
+                self._snapshot = self._load(mtime)
+                self._mtime = mtime
+            elif mtime != self._mtime:
+                try:
+                    self._snapshot = self._load(mtime)
+                    self._mtime = mtime
+                    self._last_error = None
+                except (OSError, ValueError) as e:
+                    # Half-written or broken edit: keep serving the last good rules
+                    self._last_error = str(e)
+            return self._snapshot
+
+    def reload(self) -> RulesSnapshot:
+        """Force an mtime check on the next access and return the current snapshot."""
+        self._last_check = 0.0
+        return self.snapshot()
+
+    @property
+    def last_error(self):
+        return self._last_error
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_rules_registry(file_name: str = "campaign_rules.json") -> RulesRegistry:
+    """Return the process-wide registry for a rules file in app/config."""
+    registry = _registries.get(file_name)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(file_name)
+            if registry is None:
+                registry = RulesRegistry(_CONFIG_DIR / file_name)
+                _registries[file_name] = registry
+    return registry
+
+
+def get_rules_snapshot(file_name: str = "campaign_rules.json") -> RulesSnapshot:
+    """Current snapshot of a rules file (hot-reloaded on change)."""
+    return get_rules_registry(file_name).snapshot()
@@ -0,0 +1,85 @@
+# app/utils/startup_report.py
+"""
+Import-cost reporting for the Streamlit app.
+
+In-app: `timed_import(module)` imports a module and records how long the
+first import took; `import_report()` lists those costs (shown in the sidebar).
+
+Offline: `python -m app.utils.startup_report [modules...]` runs a fresh
+interpreter with `-X importtime` and prints the most expensive imports,
+so startup regressions show up before deploy.
+"""
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+from app.utils import metrics
+
+_lock = threading.Lock()
+_costs = {}   # module name -> seconds spent on its first import in this process
+
+# Modules the app may load; the defaults for the offline report
+DEFAULT_MODULES = [
+    "app.dashboards.campaign_planner",
+    "app.dashboards.placement_planner",
+    "app.dashboards.creative_planner",
+    "app.ai.run_langgraph_validator",
+    "app.utils.db_manager",
+]
+
+
+def timed_import(module_name: str):
+    """Import `module_name`, recording the cost if this is its first import."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _costs.setdefault(module_name, elapsed)
+    metrics.record_timing(f"import.{module_name}", elapsed)
+    return module
+
+
+def import_report() -> list:
+    """[(module, milliseconds), ...] for imports done through timed_import, slowest first."""
+    with _lock:
+        items = list(_costs.items())
+    return sorted(((m, round(s * 1000, 1)) for m, s in items), key=lambda x: -x[1])
+
+
+def profile_imports(modules=None, top: int = 25) -> list:
+    """
+    Import `modules` in a fresh interpreter with -X importtime.
+    Returns [(module, self_ms, cumulative_ms), ...] sorted by cumulative cost.
+    """
+    modules = modules or DEFAULT_MODULES
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+        except ValueError:
+            continue
+    rows.sort(key=lambda r: -r[2])
+    return rows[:top]
+
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or DEFAULT_MODULES
+    print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for name, self_ms, cumulative_ms in profile_imports(targets):
+        print(f"{cumulative_ms:>14.1f} {self_ms:>10.1f}  {name}")
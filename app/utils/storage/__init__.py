@@ -0,0 +1,68 @@
+# app/utils/storage/__init__.py
+import threading
+
+from app.utils.config_loader import STORAGE_BACKEND
+from app.utils.storage.base import StorageBackend
+
+_lock = threading.Lock()
+_storage = None
+_backends = {}         # name -> factory() -> StorageBackend
+
+
+def _dynamodb_factory():
+    from app.utils.storage.dynamodb import DynamoDBStorage
+    return DynamoDBStorage()
+
+
+def _sqlite_factory():
+    from app.utils.storage.sqlite import SQLiteStorage
+    return SQLiteStorage()
+
+
+_backends["dynamodb"] = _dynamodb_factory
+_backends["sqlite"] = _sqlite_factory
+
+
+def register_backend(name: str, factory):
+    """Register a backend: factory() -> StorageBackend."""
+    with _lock:
+        _backends[name] = factory
+
+
+def get_storage() -> StorageBackend:
+    """
+    Return the process-wide storage backend, chosen by STORAGE_BACKEND
+    ("dynamodb" by default, or "sqlite" for a local file).
+    """
+    global _storage
+    if _storage is None:
+        with _lock:
+            if _storage is None:
+                if STORAGE_BACKEND not in _backends:
+                    raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND}")
+                _storage = _backends[STORAGE_BACKEND]()
+    return _storage
+
+
+def set_storage(backend):
+    """
+    Swap the active backend: a registered name or a StorageBackend instance
+    (e.g. SQLiteStorage(":memory:") for offline tests and benchmarks).
+    """
+    global _storage
+    if isinstance(backend, str):
+        if backend not in _backends:
+            raise ValueError(f"Unknown storage backend: {backend}")
+        backend = _backends[backend]()
+    with _lock:
+        _storage = backend
+
+    # Names and trees cached from the previous backend no longer apply
+    from app.utils.campaign_tree import invalidate_trees
+    from app.utils.name_index import invalidate_index
+    invalidate_index()
+    invalidate_trees()
+    return backend
+
+
+__all__ = ["StorageBackend", "get_storage", "set_storage", "register_backend"]
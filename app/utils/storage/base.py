@@ -0,0 +1,67 @@
+# app/utils/storage/base.py
+from abc import ABC, abstractmethod
+
+
+class StorageBackend(ABC):
+    """
+    What db_manager needs from a store of planner records.
+
+    Backends receive items already shaped by db_manager._build_item
+    (name, planner_type, ..., created_at as an ISO string) and only do I/O;
+    uniqueness on 'name' must be enforced by the store itself.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def init_db(self, force: bool = False):
+        """Make sure the table/schema exists. Cheap to call on every rerun."""
+
+    @abstractmethod
+    def status(self) -> dict:
+        """Snapshot of what the bootstrap learned (must include 'ready')."""
+
+    @abstractmethod
+    def insert_item(self, item: dict) -> bool:
+        """Insert one item; False if an item with that name already exists."""
+
+    @abstractmethod
+    def insert_items(self, items: list, chunk_size: int, max_workers: int) -> dict:
+        """
+        Insert many items with unique names.
+        Returns {name: (status, error)}, status in "saved" | "duplicate" | "error".
+        """
+
+    @abstractmethod
+    def fetch_all_names(self, planner_type: str = None) -> list:
+        """All names, optionally for one planner type."""
+
+    @abstractmethod
+    def scan_items(self, attributes=None, segments: int = None, stats: dict = None):
+        """
+        Generator over every stored item (only `attributes` if given), in no
+        particular order, read in `segments` parallel parts where the store supports it.
+        `stats` is filled with {segment: {items, pages, seconds, items_per_second}}.
+        """
+
+    @abstractmethod
+    def fetch_children(self, campaign: str, planner_type: str = None,
+                       limit: int = None, start_key=None) -> tuple:
+        """
+        One page of records linked to `campaign` (optionally one planner type),
+        via a secondary index on campaign.
+        Returns ([{name, planner_type, campaign, placement, created_at}, ...], next_key);
+        next_key is None on the last page and is passed back as `start_key`.
+        """
+
+    @abstractmethod
+    def fetch_recent(self, planner_type: str, limit: int, advertiser: str = None) -> list:
+        """
+        The `limit` newest records of a planner type (optionally one advertiser),
+        newest first, from a created_at-ordered index:
+        [{name, planner_type, campaign, advertiser, created_at}, ...]
+        """
+
+    @abstractmethod
+    def fetch_name_records(self, planner_type: str, since: str = None) -> list:
+        """[(name, created_at), ...] for one planner type, optionally created after 'since'."""
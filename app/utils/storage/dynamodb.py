@@ -0,0 +1,598 @@
+# app/utils/storage/dynamodb.py
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from app.utils import tracing
+from app.utils.config_loader import (
+    AWS_DEFAULT_REGION, DDB_SCAN_SEGMENTS, DDB_SKIP_BOOTSTRAP, DDB_TABLE_NAME, secret,
+)
+from app.utils.storage.base import StorageBackend
+
+# -------- Bulk writes --------
+_RETRYABLE_REASONS = {"TransactionConflict", "ThrottlingError", "ProvisionedThroughputExceeded"}
+_RETRYABLE_ERRORS = {
+    "ThrottlingException", "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded", "InternalServerError", "TransactionInProgressException",
+}
+_BULK_MAX_RETRIES = 5
+
+# -------- Schema --------
+_ATTRIBUTE_DEFINITIONS = [
+    {"AttributeName": "name", "AttributeType": "S"},
+    {"AttributeName": "planner_type", "AttributeType": "S"},  # for GSIs
+    {"AttributeName": "campaign", "AttributeType": "S"},      # for by_campaign
+    {"AttributeName": "created_at", "AttributeType": "S"},    # for by_planner_created (ISO, sorts by time)
+]
+_GSIS = {
+    "by_planner_type": {
+        "IndexName": "by_planner_type",
+        "KeySchema": [{"AttributeName": "planner_type", "KeyType": "HASH"}],
+        "Projection": {"ProjectionType": "ALL"},  # simplest; includes all attrs
+    },
+    "by_campaign": {
+        "IndexName": "by_campaign",
+        "KeySchema": [
+            {"AttributeName": "campaign", "KeyType": "HASH"},
+            {"AttributeName": "planner_type", "KeyType": "RANGE"},
+        ],
+        # Only what the hierarchy view needs
+        "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["placement", "created_at"]},
+    },
+    "by_planner_created": {
+        "IndexName": "by_planner_created",
+        "KeySchema": [
+            {"AttributeName": "planner_type", "KeyType": "HASH"},
+            {"AttributeName": "created_at", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["campaign", "advertiser"]},
+    },
+}
+# GSI key attributes can't be stored as empty strings (DynamoDB rejects the write)
+_INDEX_KEY_ATTRIBUTES = frozenset(
+    key["AttributeName"] for gsi in _GSIS.values() for key in gsi["KeySchema"]
+)
+
+# -------- Parallel scan --------
+_SCAN_QUEUE_PAGES = 2            # pages buffered per segment before its thread waits for the consumer
+_DONE = object()
+
+_CHILD_ATTRIBUTES = ("name", "planner_type", "campaign", "placement", "created_at")
+_RECENT_ATTRIBUTES = ("name", "planner_type", "campaign", "advertiser", "created_at")
+
+
+def _without_blank_keys(item: dict) -> dict:
+    """Drop GSI key attributes that are blank; the item is then just left out of that index."""
+    return {
+        k: v for k, v in item.items()
+        if not (k in _INDEX_KEY_ATTRIBUTES and isinstance(v, str) and not v.strip())
+    }
+
+
+def _backoff(attempt: int):
+    time.sleep(min(2.0, 0.05 * (2 ** attempt)) * (0.5 + random.random()))
+
+
+def _record_capacity(span, response: dict):
+    """Add a response's ConsumedCapacity (dict, or list for transactions) to the span."""
+    consumed = response.get("ConsumedCapacity")
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    for entry in consumed or ():
+        span.add("aws.dynamodb.consumed_capacity", float(entry.get("CapacityUnits") or 0))
+
+
+class DynamoDBStorage(StorageBackend):
+    """
+    DynamoDB table keyed on name.
+    - PK: name (S)
+    - GSI: by_planner_type (planner_type as HASH)
+    - GSI: by_campaign (campaign as HASH, planner_type as RANGE): a campaign's
+      placements and creatives. Not sparse: campaign-planner records carry
+      'campaign' too (their theme), so every record with a campaign is indexed
+      and fetch_children narrows by planner_type on the range key
+    - GSI: by_planner_created (planner_type as HASH, created_at as RANGE): newest-first
+      queries and created_at deltas without reading the whole planner type
+    Billing: PAY_PER_REQUEST
+
+    boto3 and the AWS clients load on first use.
+    """
+
+    name = "dynamodb"
+
+    def __init__(self, table_name: str = None):
+        self.table_name = table_name or DDB_TABLE_NAME
+        self._aws = {}
+        self._aws_lock = threading.Lock()
+        # init_db() runs at the top of every planner render (i.e. every Streamlit rerun);
+        # once the table and its GSIs are ACTIVE we remember it for the life of the process.
+        self._readiness = {"ready": False, "skipped": False, "table_status": None, "indexes": {}, "checked_at": None}
+        self._readiness_lock = threading.Lock()
+
+    # -------- Dynamo bootstrap (lazy: boto3 and AWS clients load on first use) --------
+    def _aws_handles(self):
+        """Create the boto3 session, DynamoDB resource and client once, on first use."""
+        if not self._aws:
+            with self._aws_lock:
+                if not self._aws:
+                    import boto3
+
+                    session = boto3.session.Session(
+                        aws_access_key_id=secret("AWS_ACCESS_KEY_ID"),
+                        aws_secret_access_key=secret("AWS_SECRET_ACCESS_KEY"),
+                        region_name=AWS_DEFAULT_REGION,
+                    )
+                    self._aws["resource"] = session.resource("dynamodb")
+                    self._aws["client"] = session.client("dynamodb")
+        return self._aws
+
+    def _client(self):
+        return self._aws_handles()["client"]
+
+    def _table(self):
+        return self._aws_handles()["resource"].Table(self.table_name)
+
+    def _span(self, operation: str):
+        """Span for one DynamoDB API operation (OpenTelemetry db/aws semantic attributes)."""
+        return tracing.span(f"dynamodb.{operation}", **{
+            "db.system": "dynamodb",
+            "db.operation": operation,
+            "aws.dynamodb.table_names": [self.table_name],
+        })
+
+    def _index_active(self, index_name: str) -> bool:
+        """
+        True only for a GSI the bootstrap saw ACTIVE. An index that is missing
+        (an older table gets its GSIs one at a time), backfilling or not yet
+        checked is inactive, so callers use their scan / base-index fallback.
+        With DDB_SKIP_BOOTSTRAP the table is provisioned separately and every
+        index is assumed to exist.
+        """
+        if DDB_SKIP_BOOTSTRAP:
+            return True
+        return self._readiness["indexes"].get(index_name) == "ACTIVE"
+
+    def _describe_table(self):
+        """Return the DescribeTable 'Table' block, or None if the table doesn't exist."""
+        client = self._client()
+        with self._span("DescribeTable"):
+            try:
+                return client.describe_table(TableName=self.table_name)["Table"]
+            except client.exceptions.ResourceNotFoundException:
+                return None
+
+    def _record_readiness(self, table: dict):
+        indexes = {
+            gsi["IndexName"]: gsi.get("IndexStatus")
+            for gsi in table.get("GlobalSecondaryIndexes", [])
+        }
+        self._readiness.update(
+            table_status=table.get("TableStatus"),
+            indexes=indexes,
+            checked_at=datetime.now(timezone.utc).isoformat(),
+            ready=table.get("TableStatus") == "ACTIVE" and all(s == "ACTIVE" for s in indexes.values()),
+        )
+
+    def init_db(self, force: bool = False):
+        """
+        Create the table with its GSIs if it doesn't exist, or add GSIs an older table lacks.
+        Runs at most once per process: after the table and GSIs are seen ACTIVE,
+        later calls return immediately without a DescribeTable call.
+        """
+        if self._readiness["ready"] and not force:
+            return
+        if DDB_SKIP_BOOTSTRAP:
+            # Table provisioned separately: never call CreateTable / DescribeTable
+            self._readiness.update(skipped=True, ready=True)
+            return
+
+        with self._readiness_lock:
+            if self._readiness["ready"] and not force:
+                return
+
+            table = self._describe_table()
+            if table is None:
+                self._create_table()
+                table = self._describe_table() or {}
+            elif table.get("TableStatus") == "ACTIVE" and self._add_missing_indexes(table):
+                # The new GSI backfills in the background; not ready until it's ACTIVE
+                table = self._describe_table() or {}
+            self._record_readiness(table)
+
+    def status(self) -> dict:
+        return {"backend": self.name, **self._readiness, "indexes": dict(self._readiness["indexes"])}
+
+    def _create_table(self):
+        client = self._client()
+        client.create_table(
+            TableName=self.table_name,
+            AttributeDefinitions=_ATTRIBUTE_DEFINITIONS,
+            KeySchema=[
+                {"AttributeName": "name", "KeyType": "HASH"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+            GlobalSecondaryIndexes=list(_GSIS.values()),
+            Tags=[{"Key": "app", "Value": "naming-planner"}],
+        )
+
+        waiter = client.get_waiter("table_exists")
+        waiter.wait(TableName=self.table_name)
+
+    def _add_missing_indexes(self, table: dict) -> bool:
+        """
+        Tables created before an index existed get it via UpdateTable
+        (one GSI creation per call, as DynamoDB requires). Returns True if one was started.
+        """
+        present = {gsi["IndexName"]: gsi.get("IndexStatus") for gsi in table.get("GlobalSecondaryIndexes", [])}
+        missing = [name for name in _GSIS if name not in present]
+        # Only one index can be built at a time; the next one starts on a later init_db()
+        if not missing or any(status != "ACTIVE" for status in present.values()):
+            return False
+        with self._span("UpdateTable"):
+            self._client().update_table(
+                TableName=self.table_name,
+                AttributeDefinitions=_ATTRIBUTE_DEFINITIONS,
+                GlobalSecondaryIndexUpdates=[{"Create": _GSIS[missing[0]]}],
+            )
+        return True
+
+    # -------- Writes --------
+    def insert_item(self, item: dict) -> bool:
+        """Put guarded by attribute_not_exists(name) so an existing item is never overwritten."""
+        from botocore.exceptions import ClientError
+
+        with self._span("PutItem") as span:
+            try:
+                resp = self._table().put_item(
+                    Item=_without_blank_keys(item),
+                    ConditionExpression="attribute_not_exists(#n)",  # uniqueness guard
+                    ExpressionAttributeNames={"#n": "name"},
+                    ReturnConsumedCapacity="TOTAL",
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    span.set_attribute("aws.dynamodb.condition_failed", True)
+                    return False
+                raise
+            _record_capacity(span, resp)
+        return True
+
+    def _write_chunk(self, items: list) -> dict:
+        """
+        Write one chunk as a single TransactWriteItems call, every Put guarded by
+        attribute_not_exists(name). Items rejected by the guard are reported as
+        duplicates and the rest of the chunk is retried; conflicts and throttling
+        are retried with jittered exponential backoff.
+        Returns {name: (status, error)}.
+        """
+        with self._span("TransactWriteItems") as span:
+            span.set_attribute("db.item_count", len(items))
+            return self._transact(items, span)
+
+    def _transact(self, items: list, span) -> dict:
+        from boto3.dynamodb.types import TypeSerializer
+        from botocore.exceptions import ClientError
+
+        serializer = TypeSerializer()
+        client = self._client()
+        outcomes = {}
+        pending = list(items)
+        attempt = 0
+
+        while pending:
+            span.add("db.request_count", 1)
+            try:
+                resp = client.transact_write_items(ReturnConsumedCapacity="TOTAL", TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": self.table_name,
+                            "Item": {k: serializer.serialize(v) for k, v in _without_blank_keys(item).items()},
+                            "ConditionExpression": "attribute_not_exists(#n)",
+                            "ExpressionAttributeNames": {"#n": "name"},
+                        }
+                    }
+                    for item in pending
+                ])
+                _record_capacity(span, resp)
+                for item in pending:
+                    outcomes[item["name"]] = ("saved", None)
+                return outcomes
+
+            except ClientError as e:
+                code = e.response["Error"]["Code"]
+                if code == "TransactionCanceledException":
+                    reasons = e.response.get("CancellationReasons") or []
+                    retry = []
+                    for item, reason in zip(pending, reasons):
+                        reason_code = reason.get("Code", "None")
+                        if reason_code == "ConditionalCheckFailed":
+                            outcomes[item["name"]] = ("duplicate", None)
+                        elif reason_code in ("None", *_RETRYABLE_REASONS):
+                            retry.append(item)
+                        else:
+                            outcomes[item["name"]] = ("error", reason.get("Message", reason_code))
+                    if not reasons:
+                        retry = pending
+                    # Back off unless the guard rejected some items and the rest just needs resubmitting
+                    throttled = len(retry) == len(pending) or any(
+                        r.get("Code") in _RETRYABLE_REASONS for r in reasons
+                    )
+                    pending = retry
+                    if not throttled:
+                        continue
+                elif code not in _RETRYABLE_ERRORS:
+                    for item in pending:
+                        outcomes[item["name"]] = ("error", str(e))
+                    return outcomes
+
+                attempt += 1
+                if attempt > _BULK_MAX_RETRIES:
+                    for item in pending:
+                        outcomes[item["name"]] = ("error", f"Gave up after {_BULK_MAX_RETRIES} retries ({code}).")
+                    return outcomes
+                _backoff(attempt)
+
+        return outcomes
+
+    def insert_items(self, items: list, chunk_size: int, max_workers: int) -> dict:
+        """Chunks of TransactWriteItems (max 100 per call) written in parallel."""
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = {}
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                for chunk_result in pool.map(tracing.bind(self._write_chunk), chunks):
+                    results.update(chunk_result)
+        return results
+
+    # -------- Reads --------
+    def _read_pages(self, operation: str, call, kwargs: dict, extract) -> list:
+        """
+        Run a paginated Query/Scan to completion under one span, recording
+        page count, items returned and consumed capacity.
+        """
+        out = []
+        kwargs = {**kwargs, "ReturnConsumedCapacity": "TOTAL"}
+        with self._span(operation) as span:
+            if kwargs.get("IndexName"):
+                span.set_attribute("aws.dynamodb.index_name", kwargs["IndexName"])
+            while True:
+                resp = call(**kwargs)
+                span.add("db.page_count", 1)
+                _record_capacity(span, resp)
+                out.extend(extract(i) for i in resp.get("Items", []) if "name" in i)
+                if "LastEvaluatedKey" in resp:
+                    kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+                else:
+                    break
+            span.set_attribute("db.item_count", len(out))
+        return out
+
+    def fetch_all_names(self, planner_type: str = None) -> list:
+        """
+        - If planner_type is provided: Query the GSI.
+        - Else: Scan table with projection (only 'name'), paginating until done.
+        """
+        table = self._table()
+
+        if planner_type:
+            # Query via GSI for efficiency
+            from boto3.dynamodb.conditions import Key
+
+            return self._read_pages("Query", table.query, {
+                "IndexName": "by_planner_type",
+                "KeyConditionExpression": Key("planner_type").eq(planner_type),
+                "ProjectionExpression": "#n",
+                "ExpressionAttributeNames": {"#n": "name"},
+            }, lambda i: i["name"])
+
+        # No filter: parallel segmented scan with projection
+        return [i["name"] for i in self.scan_items(("name",))]
+
+    def _scan_segment(self, segment: int, total: int, attributes, offer, stop: threading.Event, stats: dict):
+        """Scan one segment to the end, handing each page to the consumer."""
+        from boto3.dynamodb.types import TypeDeserializer
+
+        deserializer = TypeDeserializer()
+        client = self._client()          # low-level clients are thread-safe; resources aren't
+        kwargs = {"TableName": self.table_name, "Segment": segment, "TotalSegments": total,
+                  "ReturnConsumedCapacity": "TOTAL"}
+        if attributes:
+            kwargs["ProjectionExpression"] = ", ".join(f"#a{i}" for i in range(len(attributes)))
+            kwargs["ExpressionAttributeNames"] = {f"#a{i}": a for i, a in enumerate(attributes)}
+
+        entry = stats[segment] = {"items": 0, "pages": 0, "seconds": 0.0, "items_per_second": None}
+        start = time.perf_counter()
+        with self._span("Scan") as span:
+            span.set_attribute("aws.dynamodb.segment", segment)
+            span.set_attribute("aws.dynamodb.total_segments", total)
+            while not stop.is_set():
+                resp = client.scan(**kwargs)
+                _record_capacity(span, resp)
+                items = [{k: deserializer.deserialize(v) for k, v in i.items()} for i in resp.get("Items", [])]
+                entry["pages"] += 1
+                entry["items"] += len(items)
+                offer(items)
+                if "LastEvaluatedKey" not in resp:
+                    break
+                kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            entry["items_per_second"] = round(entry["items"] / entry["seconds"], 1) if entry["seconds"] else None
+            span.set_attribute("db.page_count", entry["pages"])
+            span.set_attribute("db.item_count", entry["items"])
+            span.set_attribute("db.items_per_second", entry["items_per_second"])
+
+    def scan_items(self, attributes=None, segments: int = None, stats: dict = None):
+        """
+        Parallel Scan: `segments` threads (DDB_SCAN_SEGMENTS, default 4) each read one
+        Segment of TotalSegments, and items are yielded as their pages arrive
+        (unordered), so memory holds a few pages, not the table.
+        - attributes: projection (e.g. ("name", "planner_type")); None = whole items.
+        - stats: filled with {segment: {items, pages, seconds, items_per_second}}.
+        Closing the generator early stops the remaining segments.
+        """
+        total = max(1, int(segments or DDB_SCAN_SEGMENTS))
+        stats = {} if stats is None else stats
+        pages = queue.Queue(maxsize=total * _SCAN_QUEUE_PAGES)
+        stop = threading.Event()
+        parent = tracing.start_span("dynamodb.ParallelScan", **{
+            "db.system": "dynamodb", "aws.dynamodb.table_names": [self.table_name],
+            "aws.dynamodb.total_segments": total,
+        })
+
+        def offer(item):
+            # Blocks while the consumer is behind; gives up once the scan is stopped
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def run(segment):
+            try:
+                self._scan_segment(segment, total, attributes, offer, stop, stats)
+            except Exception as e:
+                offer(e)
+            finally:
+                offer(_DONE)
+
+        pool = ThreadPoolExecutor(max_workers=total, thread_name_prefix="ddb-scan")
+        error = None
+        try:
+            with tracing.use_span(parent):
+                for segment in range(total):
+                    pool.submit(tracing.bind(run), segment)
+            remaining = total
+            while remaining:
+                page = pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}" if isinstance(e, Exception) else None
+            raise
+        finally:
+            stop.set()
+            pool.shutdown(wait=True)
+            parent.set_attribute("db.item_count", sum(s["items"] for s in stats.values()))
+            tracing.end_span(parent, error)
+
+    def fetch_children(self, campaign: str, planner_type: str = None,
+                       limit: int = None, start_key=None) -> tuple:
+        """
+        One page of a by_campaign GSI query (planner_type narrows on the range key).
+        next_key is DynamoDB's LastEvaluatedKey. While the index is still
+        backfilling on an older table, falls back to a filtered Scan.
+        """
+        from boto3.dynamodb.conditions import Key, Attr
+
+        names = {"#n": "name"}
+        kwargs = {
+            "ProjectionExpression": "#n, planner_type, campaign, placement, created_at",
+            "ExpressionAttributeNames": names,
+            "ReturnConsumedCapacity": "TOTAL",
+        }
+        if limit:
+            kwargs["Limit"] = limit
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+
+        table = self._table()
+        if self._index_active("by_campaign"):
+            condition = Key("campaign").eq(campaign)
+            if planner_type:
+                condition = condition & Key("planner_type").eq(planner_type)
+            operation, call = "Query", table.query
+            kwargs.update(IndexName="by_campaign", KeyConditionExpression=condition)
+        else:
+            condition = Attr("campaign").eq(campaign)
+            if planner_type:
+                condition = condition & Attr("planner_type").eq(planner_type)
+            operation, call = "Scan", table.scan
+            kwargs["FilterExpression"] = condition
+
+        with self._span(operation) as span:
+            span.set_attribute("aws.dynamodb.index_name", kwargs.get("IndexName"))
+            resp = call(**kwargs)
+            _record_capacity(span, resp)
+            items = [
+                {k: i.get(k) for k in _CHILD_ATTRIBUTES}
+                for i in resp.get("Items", []) if "name" in i
+            ]
+            span.set_attribute("db.item_count", len(items))
+        return items, resp.get("LastEvaluatedKey")
+
+    def fetch_recent(self, planner_type: str, limit: int, advertiser: str = None) -> list:
+        """
+        Newest-first by_planner_created query bounded by Limit (one request
+        without an advertiser; with one, the filter runs after Limit, so pages
+        are read until `limit` matches are found).
+        """
+        from boto3.dynamodb.conditions import Key, Attr
+
+        kwargs = {
+            "IndexName": "by_planner_created",
+            "KeyConditionExpression": Key("planner_type").eq(planner_type),
+            "ScanIndexForward": False,
+            "Limit": limit,
+            "ProjectionExpression": "#n, planner_type, campaign, advertiser, created_at",
+            "ExpressionAttributeNames": {"#n": "name"},
+            "ReturnConsumedCapacity": "TOTAL",
+        }
+        if advertiser:
+            kwargs["FilterExpression"] = Attr("advertiser").eq(advertiser)
+        if not self._index_active("by_planner_created"):
+            # Still backfilling: read the planner type and sort here
+            records = self._read_pages("Query", self._table().query, {
+                "IndexName": "by_planner_type",
+                "KeyConditionExpression": kwargs["KeyConditionExpression"],
+                "ProjectionExpression": kwargs["ProjectionExpression"],
+                "ExpressionAttributeNames": kwargs["ExpressionAttributeNames"],
+                **({"FilterExpression": kwargs["FilterExpression"]} if advertiser else {}),
+            }, lambda i: {k: i.get(k) for k in _RECENT_ATTRIBUTES})
+            records.sort(key=lambda r: r["created_at"] or "", reverse=True)
+            return records[:limit]
+
+        table = self._table()
+        out = []
+        with self._span("Query") as span:
+            span.set_attribute("aws.dynamodb.index_name", "by_planner_created")
+            while len(out) < limit:
+                resp = table.query(**kwargs)
+                span.add("db.page_count", 1)
+                _record_capacity(span, resp)
+                out.extend({k: i.get(k) for k in _RECENT_ATTRIBUTES} for i in resp.get("Items", []) if "name" in i)
+                if "LastEvaluatedKey" not in resp:
+                    break
+                kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+            span.set_attribute("db.item_count", len(out[:limit]))
+        return out[:limit]
+
+    def fetch_name_records(self, planner_type: str, since: str = None) -> list:
+        """
+        GSI query for (name, created_at). With 'since', a created_at range
+        condition on by_planner_created reads only the newer records.
+        """
+        from boto3.dynamodb.conditions import Key, Attr
+
+        kwargs = {
+            "IndexName": "by_planner_type",
+            "KeyConditionExpression": Key("planner_type").eq(planner_type),
+            "ProjectionExpression": "#n, created_at",
+            "ExpressionAttributeNames": {"#n": "name"},
+        }
+        if since and self._index_active("by_planner_created"):
+            kwargs.update(
+                IndexName="by_planner_created",
+                KeyConditionExpression=Key("planner_type").eq(planner_type) & Key("created_at").gt(since),
+            )
+        elif since:
+            kwargs["FilterExpression"] = Attr("created_at").gt(since)
+        return self._read_pages("Query", self._table().query, kwargs,
+                                lambda i: (i["name"], i.get("created_at")))
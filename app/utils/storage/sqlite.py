@@ -0,0 +1,313 @@
+# app/utils/storage/sqlite.py
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.utils import tracing
+from app.utils.config_loader import SQLITE_DB_PATH, SQLITE_POOL_SIZE
+from app.utils.storage.base import StorageBackend
+
+# Repo-root naming_planner.db (same file and `names` table the project has always shipped)
+_DEFAULT_PATH = Path(__file__).resolve().parents[3] / "naming_planner.db"
+
+_COLUMNS = (
+    "name", "planner_type", "plan_number", "advertiser", "product", "objective",
+    "campaign", "placement", "month", "year", "strategy_tactic", "publisher", "site", "media_type",
+    "targeting", "size_format", "creative_message", "free_form", "source",
+    "validation_status", "created_at",
+)
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS names (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        planner_type TEXT NOT NULL,
+        plan_number TEXT,
+        name TEXT UNIQUE,
+        advertiser TEXT,
+        product TEXT,
+        objective TEXT,
+        campaign TEXT,
+        placement TEXT,
+        month TEXT,
+        year TEXT,
+        strategy_tactic TEXT,
+        publisher TEXT,
+        site TEXT,
+        media_type TEXT,
+        targeting TEXT,
+        size_format TEXT,
+        creative_message TEXT,
+        free_form TEXT,
+        source TEXT,
+        validation_status TEXT,
+        created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%S+00:00', 'now'))
+    )
+"""
+
+# Older files stored CURRENT_TIMESTAMP ("YYYY-MM-DD HH:MM:SS", UTC). created_at is
+# compared as a string (ordering, the name index's "since" watermark), so those
+# rows are rewritten once to the ISO form new rows use ("YYYY-MM-DDTHH:MM:SS+00:00").
+_SCHEMA_VERSION = 1
+_SQL_NORMALIZE_CREATED_AT = (
+    "UPDATE names SET created_at = replace(created_at, ' ', 'T') || '+00:00' "
+    "WHERE created_at GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'"
+)
+
+_INDEXES = {
+    # (planner_type, created_at) also serves planner_type-only lookups
+    "idx_names_planner_created": "CREATE INDEX IF NOT EXISTS idx_names_planner_created ON names (planner_type, created_at)",
+    "idx_names_campaign": "CREATE INDEX IF NOT EXISTS idx_names_campaign ON names (campaign)",
+    "idx_names_created_at": "CREATE INDEX IF NOT EXISTS idx_names_created_at ON names (created_at)",
+}
+
+# Statements are fixed strings with bound parameters, so each pooled connection
+# compiles them once and reuses them from its statement cache.
+_SQL_INSERT = (
+    f"INSERT INTO names ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + c for c in _COLUMNS)}) "
+    "ON CONFLICT(name) DO NOTHING"
+)
+_SQL_NAMES = "SELECT name FROM names ORDER BY created_at, id"
+_SQL_NAMES_BY_TYPE = "SELECT name FROM names WHERE planner_type = ? ORDER BY created_at, id"
+_SCAN_PAGE_SIZE = 5000
+
+# idx_names_campaign entries end in the rowid, so campaign = ? ... ORDER BY id walks the index
+_SQL_CHILDREN = (
+    "SELECT id, name, planner_type, campaign, placement, created_at FROM names "
+    "WHERE campaign = ? AND (? IS NULL OR planner_type = ?) AND id > ? ORDER BY id LIMIT ?"
+)
+# Walks idx_names_planner_created backwards and stops after LIMIT rows
+_SQL_RECENT = (
+    "SELECT name, planner_type, campaign, advertiser, created_at FROM names "
+    "WHERE planner_type = ? AND (? IS NULL OR advertiser = ?) ORDER BY created_at DESC LIMIT ?"
+)
+_SQL_RECORDS = "SELECT name, created_at FROM names WHERE planner_type = ?"
+_SQL_RECORDS_SINCE = "SELECT name, created_at FROM names WHERE planner_type = ? AND created_at > ?"
+
+
+def _to_param(value):
+    """Lists/dicts (e.g. free_form) are stored as JSON text."""
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value)
+    return value
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Local SQLite store for dev, tests and edge deployments (no AWS, no network).
+
+    - WAL journal: readers never block the writer and vice versa.
+    - Indexes on planner_type (+created_at), campaign and created_at.
+    - A small pool of connections shared across Streamlit sessions/threads;
+      each keeps its own prepared-statement cache.
+    - Uniqueness on 'name' comes from the UNIQUE column + ON CONFLICT DO NOTHING.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = None, pool_size: int = None):
+        self.path = str(path or SQLITE_DB_PATH or _DEFAULT_PATH)
+        size = int(pool_size or SQLITE_POOL_SIZE)
+        # Each connection to ":memory:" would be a separate database
+        self.pool_size = 1 if self.path == ":memory:" else max(1, size)
+        self._pool = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._ready = False
+        self._status = {"ready": False, "path": self.path, "journal_mode": None, "indexes": {}, "checked_at": None}
+        self._init_lock = threading.Lock()
+
+    # -------- Connection pool --------
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=30,
+            isolation_level=None,        # autocommit; transactions are explicit
+            check_same_thread=False,     # connections move between threads via the pool
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._pool_lock:
+                if self._created < self.pool_size:
+                    self._created += 1
+                    conn = self._connect()
+            if conn is None:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Close idle pooled connections (e.g. before deleting the file)."""
+        with self._pool_lock:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._created -= 1
+
+    def _span(self, operation: str):
+        return tracing.span(f"sqlite.{operation}", **{"db.system": "sqlite", "db.operation": operation})
+
+    # -------- Bootstrap --------
+    def init_db(self, force: bool = False):
+        """
+        Create the table, migrate older files (missing columns, legacy
+        created_at format) and build the indexes (once per process).
+        """
+        if self._ready and not force:
+            return
+        with self._init_lock:
+            if self._ready and not force:
+                return
+            with self._connection() as conn:
+                conn.execute(_CREATE_TABLE)
+                existing = {row[1] for row in conn.execute("PRAGMA table_info(names)")}
+                for column in _COLUMNS:
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE names ADD COLUMN {column} TEXT")
+                if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                    conn.execute(_SQL_NORMALIZE_CREATED_AT)
+                    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                for ddl in _INDEXES.values():
+                    conn.execute(ddl)
+                journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            self._status.update(
+                ready=True,
+                journal_mode=journal_mode,
+                indexes={name: "ACTIVE" for name in _INDEXES},
+                checked_at=datetime.now(timezone.utc).isoformat(),
+            )
+            self._ready = True
+
+    def status(self) -> dict:
+        return {"backend": self.name, **self._status, "indexes": dict(self._status["indexes"])}
+
+    # -------- Writes --------
+    @staticmethod
+    def _params(item: dict) -> dict:
+        return {c: _to_param(item.get(c)) for c in _COLUMNS}
+
+    def insert_item(self, item: dict) -> bool:
+        with self._span("insert"), self._connection() as conn:
+            return conn.execute(_SQL_INSERT, self._params(item)).rowcount == 1
+
+    def insert_items(self, items: list, chunk_size: int, max_workers: int) -> dict:
+        """
+        One transaction per chunk. SQLite has a single writer, so chunks are
+        written sequentially and max_workers is ignored.
+        """
+        results = {}
+        with self._span("insert_many") as span, self._connection() as conn:
+            span.set_attribute("db.item_count", len(items))
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                chunk_results = {}
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for item in chunk:
+                        try:
+                            saved = conn.execute(_SQL_INSERT, self._params(item)).rowcount == 1
+                            chunk_results[item["name"]] = ("saved", None) if saved else ("duplicate", None)
+                        except sqlite3.IntegrityError as e:
+                            chunk_results[item["name"]] = ("error", str(e))
+                    conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    chunk_results = {item["name"]: ("error", str(e)) for item in chunk}
+                results.update(chunk_results)
+        return results
+
+    # -------- Reads --------
+    def fetch_all_names(self, planner_type: str = None) -> list:
+        with self._span("select") as span, self._connection() as conn:
+            if planner_type:
+                rows = conn.execute(_SQL_NAMES_BY_TYPE, (planner_type,))
+            else:
+                rows = conn.execute(_SQL_NAMES)
+            names = [row[0] for row in rows if row[0]]
+            span.set_attribute("db.item_count", len(names))
+            return names
+
+    def scan_items(self, attributes=None, segments: int = None, stats: dict = None):
+        """
+        Pages of _SCAN_PAGE_SIZE rows by keyset on id (a local file gains
+        nothing from parallel readers); reported as a single segment.
+        Each page is fetched and its connection returned to the pool before
+        any row is yielded, so the consumer can use this storage while iterating;
+        rows inserted after the scan started are not included.
+        """
+        columns = [c for c in attributes if c in _COLUMNS] if attributes else list(_COLUMNS)
+        sql = f"SELECT id, {', '.join(columns)} FROM names WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+        entry = {"items": 0, "pages": 0, "seconds": 0.0, "items_per_second": None}
+        if stats is not None:
+            stats[0] = entry
+        start = time.perf_counter()
+        last_id = 0
+        with self._span("scan") as span:
+            with self._connection() as conn:
+                max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM names").fetchone()[0]
+            while True:
+                with self._connection() as conn:
+                    rows = conn.execute(sql, (last_id, max_id, _SCAN_PAGE_SIZE)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                entry["pages"] += 1
+                entry["items"] += len(rows)
+                for row in rows:
+                    yield {c: v for c, v in zip(columns, row[1:]) if v is not None}
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            entry["items_per_second"] = round(entry["items"] / entry["seconds"], 1) if entry["seconds"] else None
+            span.set_attribute("db.item_count", entry["items"])
+
+    def fetch_children(self, campaign: str, planner_type: str = None,
+                       limit: int = None, start_key=None) -> tuple:
+        """Keyset pagination on id over idx_names_campaign; next_key is the last id returned."""
+        with self._span("select") as span, self._connection() as conn:
+            rows = conn.execute(_SQL_CHILDREN, (campaign, planner_type, planner_type,
+                                                int(start_key or 0), limit or -1)).fetchall()
+            span.set_attribute("db.item_count", len(rows))
+        items = [
+            {"name": r[1], "planner_type": r[2], "campaign": r[3], "placement": r[4], "created_at": r[5]}
+            for r in rows if r[1]
+        ]
+        next_key = rows[-1][0] if limit and len(rows) == limit else None
+        return items, next_key
+
+    def fetch_recent(self, planner_type: str, limit: int, advertiser: str = None) -> list:
+        with self._span("select") as span, self._connection() as conn:
+            rows = conn.execute(_SQL_RECENT, (planner_type, advertiser, advertiser, limit)).fetchall()
+            span.set_attribute("db.item_count", len(rows))
+        return [
+            {"name": r[0], "planner_type": r[1], "campaign": r[2], "advertiser": r[3], "created_at": r[4]}
+            for r in rows if r[0]
+        ]
+
+    def fetch_name_records(self, planner_type: str, since: str = None) -> list:
+        with self._span("select") as span, self._connection() as conn:
+            if since:
+                rows = conn.execute(_SQL_RECORDS_SINCE, (planner_type, since))
+            else:
+                rows = conn.execute(_SQL_RECORDS, (planner_type,))
+            records = [(row[0], row[1]) for row in rows if row[0]]
+            span.set_attribute("db.item_count", len(records))
+            return records
@@ -0,0 +1,303 @@
+# app/utils/tracing.py
+"""
+Lightweight request tracing with OpenTelemetry-compatible export.
+
+- `span(name, **attributes)` times a block; spans opened inside it (same
+  thread, or threads started through `bind`) become its children.
+- When a root span ends, its whole trace is kept in a small in-memory ring
+  (for the sidebar timing panel) and handed to the configured exporter:
+    TRACE_EXPORTER=file  → one OTLP/JSON ExportTraceServiceRequest per line in TRACE_FILE
+    TRACE_EXPORTER=otlp  → POST to {OTEL_EXPORTER_OTLP_ENDPOINT}/v1/traces (OTLP/HTTP JSON)
+- Every span duration is also recorded in app.utils.metrics as "span.<name>".
+
+The opentelemetry SDK is not required; the export format is what its
+collector and file receivers accept.
+"""
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.utils import metrics
+from app.utils.config_loader import (
+    TRACE_EXPORTER, TRACE_FILE, TRACE_SERVICE_NAME, OTEL_EXPORTER_OTLP_ENDPOINT
+)
+
+_MAX_TRACES = 50
+_MAX_OPEN_TRACES = 1000         # children whose root never ends (or ended first) are dropped past this
+
+_current = contextvars.ContextVar("current_span", default=None)
+_lock = threading.Lock()
+_open = {}                       # trace_id -> finished spans of traces whose root is still open
+_recent = deque(maxlen=_MAX_TRACES)
+_exporter = None
+
+
+class Span:
+    """One timed operation. Times are epoch nanoseconds, as OTLP expects."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def add(self, key: str, value):
+        """Accumulate a numeric attribute (e.g. page counts, consumed capacity)."""
+        if value:
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,   # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    if isinstance(value, (list, tuple)):
+        return {"key": key, "value": {"arrayValue": {"values": [{"stringValue": str(v)} for v in value]}}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def otlp_payload(spans) -> dict:
+    """Wrap spans in an OTLP ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", TRACE_SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": "app.utils.tracing"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }]
+    }
+
+
+# -------- Span lifecycle --------
+def current_span():
+    return _current.get()
+
+
+def start_span(name: str, parent=None, **attributes) -> Span:
+    """Start a span without activating it (for callbacks that end it elsewhere)."""
+    return Span(name, parent if parent is not None else _current.get(), attributes)
+
+
+def end_span(span: Span, error: str = None):
+    span.end_ns = time.time_ns()
+    if error:
+        span.error = error
+    metrics.record_timing(f"span.{span.name}", (span.end_ns - span.start_ns) / 1e9)
+
+    with _lock:
+        if span.parent_id is not None:
+            _open.setdefault(span.trace_id, []).append(span)
+            if len(_open) > _MAX_OPEN_TRACES:
+                _open.pop(next(iter(_open)))
+            return
+        spans = _open.pop(span.trace_id, [])
+        spans.append(span)
+        spans.sort(key=lambda s: s.start_ns)
+        _recent.append((span.trace_id, spans))
+    if _exporter is not None:
+        _exporter.export(spans)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the block as a span (child of the current span, if any)."""
+    s = start_span(name, **attributes)
+    token = _current.set(s)
+    error = None
+    try:
+        yield s
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        end_span(s, error)
+
+
+@contextmanager
+def use_span(s: Span):
+    """Make an already-started span current for the block, without ending it."""
+    token = _current.set(s)
+    try:
+        yield s
+    finally:
+        _current.reset(token)
+
+
+def set_attributes(**attributes):
+    """Set attributes on the current span (no-op outside a span)."""
+    s = _current.get()
+    if s is not None:
+        for key, value in attributes.items():
+            s.set_attribute(key, value)
+
+
+def bind(fn):
+    """Wrap `fn` so it runs under the caller's current span when executed on another thread."""
+    parent = _current.get()
+
+    def wrapper(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
+
+
+def trace_iter(name: str, iterable, **attributes):
+    """
+    Yield from `iterable` under one span, activating it only while the next
+    item is produced, so the caller's code between items isn't attributed to it.
+    """
+    s = start_span(name, **attributes)
+    error = None
+    it = iter(iterable)
+    try:
+        while True:
+            token = _current.set(s)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                _current.reset(token)
+            yield item
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end_span(s, error)
+
+
+# -------- Reading traces back --------
+def recent_traces(limit: int = 10) -> list:
+    """[(trace_id, [spans sorted by start])], newest first."""
+    with _lock:
+        return list(reversed(_recent))[:limit]
+
+
+def get_trace(trace_id: str) -> list:
+    with _lock:
+        for tid, spans in _recent:
+            if tid == trace_id:
+                return list(spans)
+    return []
+
+
+def breakdown(spans) -> list:
+    """
+    Flatten a trace into display rows, parents before children:
+    [{"span": "  llm.call", "ms": 812.4, "attributes": {...}, "error": None}, ...]
+    """
+    children = {}
+    for s in spans:
+        children.setdefault(s.parent_id, []).append(s)
+
+    rows = []
+
+    def walk(parent_id, depth):
+        for s in children.get(parent_id, []):
+            rows.append({
+                "span": "  " * depth + s.name,
+                "ms": round(s.duration_ms, 1),
+                "attributes": dict(s.attributes),
+                "error": s.error,
+            })
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    return rows
+
+
+# -------- Export --------
+class FileExporter:
+    """Append one OTLP/JSON request per trace to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        line = json.dumps(otlp_payload(spans))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OtlpHttpExporter:
+    """POST traces to an OTLP/HTTP collector from a background thread (never blocks a request)."""
+
+    def __init__(self, endpoint: str, max_queue: int = 1000):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            metrics.increment("tracing.dropped")
+
+    def _run(self):
+        import httpx
+
+        with httpx.Client(timeout=5.0) as client:
+            while True:
+                spans = self._queue.get()
+                try:
+                    client.post(self.url, json=otlp_payload(spans))
+                except httpx.HTTPError:
+                    metrics.increment("tracing.export_errors")
+
+
+def set_exporter(exporter):
+    """Install an exporter (anything with .export(spans)); None disables export."""
+    global _exporter
+    _exporter = exporter
+
+
+if TRACE_EXPORTER == "file":
+    set_exporter(FileExporter(TRACE_FILE))
+elif TRACE_EXPORTER == "otlp":
+    set_exporter(OtlpHttpExporter(OTEL_EXPORTER_OTLP_ENDPOINT))
@@ -0,0 +1,193 @@
+# benchmarks/fakes.py
+"""
+Offline stand-ins so every hot path can be measured without OpenAI or AWS.
+
+- `InMemoryDynamoStorage`: a StorageBackend with DynamoDB's semantics
+  (conditional puts on name, paginated GSI queries / scans) kept in dicts,
+  with optional per-request latency to model network round trips.
+- `naming_responder`: deterministic replies for the pipeline's prompts.
+- `install_fakes`: route db_manager and every LLM node to the fakes.
+"""
+import json
+import re
+import threading
+import time
+
+from app.utils.storage import StorageBackend, set_storage
+
+# DynamoDB returns at most 1 MB per Query/Scan page; ~100-byte name projections
+_PAGE_SIZE = 10000
+
+
+class InMemoryDynamoStorage(StorageBackend):
+    """
+    Dict-backed stand-in for the DynamoDB table.
+    `latency` seconds are slept per request (each put, each page read)
+    so results reflect round-trip counts, not just CPU.
+    """
+
+    name = "memory"
+
+    def __init__(self, latency: float = 0.0, page_size: int = _PAGE_SIZE):
+        self.latency = latency
+        self.page_size = page_size
+        self.requests = 0
+        self._items = {}             # name -> item
+        self._by_type = {}           # planner_type -> [name, ...] in insert order
+        self._by_campaign = {}       # campaign -> [name, ...] in insert order (sparse, like the GSI)
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def init_db(self, force: bool = False):
+        return None
+
+    def status(self) -> dict:
+        return {"backend": self.name, "ready": True, "items": len(self._items), "requests": self.requests}
+
+    def _put(self, item: dict) -> bool:
+        with self._lock:
+            if item["name"] in self._items:
+                return False
+            self._items[item["name"]] = dict(item)
+            self._by_type.setdefault(item.get("planner_type"), []).append(item["name"])
+            if item.get("campaign"):
+                self._by_campaign.setdefault(item["campaign"], []).append(item["name"])
+            return True
+
+    def insert_item(self, item: dict) -> bool:
+        self._round_trip()
+        return self._put(item)
+
+    def insert_items(self, items: list, chunk_size: int, max_workers: int) -> dict:
+        results = {}
+        for start in range(0, len(items), chunk_size):
+            self._round_trip()
+            for item in items[start:start + chunk_size]:
+                results[item["name"]] = ("saved", None) if self._put(item) else ("duplicate", None)
+        return results
+
+    def load(self, items):
+        """Seed without simulated latency (benchmark setup)."""
+        for item in items:
+            self._put(item)
+
+    def _pages(self, names):
+        for start in range(0, len(names), self.page_size):
+            self._round_trip()
+            yield names[start:start + self.page_size]
+
+    def fetch_all_names(self, planner_type: str = None) -> list:
+        names = list(self._by_type.get(planner_type, [])) if planner_type else list(self._items)
+        out = []
+        for page in self._pages(names):
+            out.extend(page)
+        return out
+
+    def scan_items(self, attributes=None, segments: int = None, stats: dict = None):
+        """Segments are interleaved slices of the table, read one page (round trip) at a time."""
+        total = max(1, segments or 1)
+        names = list(self._items)
+        for segment in range(total):
+            entry = {"items": 0, "pages": 0, "seconds": 0.0, "items_per_second": None}
+            start = time.perf_counter()
+            for page in self._pages(names[segment::total]):
+                entry["pages"] += 1
+                entry["items"] += len(page)
+                for name in page:
+                    item = self._items[name]
+                    yield {k: item[k] for k in attributes if k in item} if attributes else dict(item)
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            entry["items_per_second"] = round(entry["items"] / entry["seconds"], 1) if entry["seconds"] else None
+            if stats is not None:
+                stats[segment] = entry
+
+    def fetch_children(self, campaign: str, planner_type: str = None,
+                       limit: int = None, start_key=None) -> tuple:
+        self._round_trip()
+        names = self._by_campaign.get(campaign, [])
+        if planner_type:
+            # planner_type is the GSI range key: narrowed before the page limit applies
+            names = [n for n in names if self._items[n].get("planner_type") == planner_type]
+        start = int(start_key or 0)
+        end = start + min(limit or self.page_size, self.page_size)
+        items = [
+            {k: self._items[n].get(k) for k in ("name", "planner_type", "campaign", "placement", "created_at")}
+            for n in names[start:end]
+        ]
+        return items, (end if end < len(names) else None)
+
+    def fetch_recent(self, planner_type: str, limit: int, advertiser: str = None) -> list:
+        self._round_trip()
+        out = []
+        # Insert order is created_at order, like the by_planner_created range key
+        for name in reversed(self._by_type.get(planner_type, [])):
+            item = self._items[name]
+            if advertiser and item.get("advertiser") != advertiser:
+                continue
+            out.append({k: item.get(k) for k in ("name", "planner_type", "campaign", "advertiser", "created_at")})
+            if len(out) == limit:
+                break
+        return out
+
+    def fetch_name_records(self, planner_type: str, since: str = None) -> list:
+        out = []
+        for page in self._pages(list(self._by_type.get(planner_type, []))):
+            for name in page:
+                created_at = self._items[name].get("created_at")
+                if not since or (created_at and created_at > since):
+                    out.append((name, created_at))
+        return out
+
+
+# -------- Fake LLM replies --------
+_NAME_RE = re.compile(r"\b[A-Z]{2}_\d{3,}_[A-Z0-9_-]+\b")
+
+
+def _prompt_text(messages) -> str:
+    return "\n".join(str(getattr(m, "content", m)) for m in messages)
+
+
+def naming_responder(messages) -> str:
+    """
+    Deterministic JSON for each pipeline prompt.
+    Generation (used when no local candidates can be built) returns two valid
+    names and one missing its year, so the validate → recommend_fix path is
+    exercised; ranking returns the shortlist reversed.
+    """
+    text = _prompt_text(messages)
+    if "naming corrector" in text:
+        block = text.split("Invalid Names and Issues")[-1].split("Respond ONLY")[0]
+        fixes = [
+            {"original": name, "suggested_name": f"{name}_2025", "explanation": "Added missing year."}
+            for name in dict.fromkeys(_NAME_RE.findall(block))
+        ]
+        return json.dumps({"fixes": fixes})
+    if "naming ranker" in text:
+        block = text.split("**Candidates:**")[-1].split("Return ONLY")[0]
+        ranking = [{"name": name, "reasoning": "fake"} for name in reversed(_NAME_RE.findall(block))]
+        return json.dumps({"ranking": ranking})
+    if "naming reviewer" in text:
+        return json.dumps({"validations": []})
+    if "creative naming assistant" in text:
+        return json.dumps({"creative_names": [{"name": "PM_1001_SOC_1080X1080_FESTIVEOFFER", "reasoning": "fake"}]})
+    if "media naming conventions" in text:
+        return json.dumps({"placement_names": ["PM_1001_CONS_OMD_YTB_VID_AP25-54_1080X720_30S"]})
+    return "```json\n" + json.dumps({
+        "suggestions": [
+            {"name": "PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2025", "reasoning": "fake"},
+            {"name": "PM_1001_SAREE_SALES_FESTIVELAUNCH_OCT_2025", "reasoning": "fake"},
+            {"name": "PM_1001_SAREE_SALES_FESTIVEOFFER_OCT", "reasoning": "fake"},
+        ]
+    }) + "\n```"
+
+
+def install_fakes(llm_latency: float = 0.0, storage=None):
+    """Use the fake chat model and an in-memory table (or `storage`) process-wide."""
+    from app.ai.llm_provider import use_fake_llm
+
+    use_fake_llm(responder=naming_responder, latency=llm_latency)
+    return set_storage(storage if storage is not None else InMemoryDynamoStorage())
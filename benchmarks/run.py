@@ -0,0 +1,329 @@
+# benchmarks/run.py
+"""
+Offline benchmark harness (fake LLM + in-memory table; no OpenAI or AWS).
+
+    python -m benchmarks.run                               # all suites, default sizes
+    python -m benchmarks.run --suites duplicates --sizes 10000 100000 1000000
+    python -m benchmarks.run --out bench.json --compare baseline.json
+
+Every measurement reports throughput and latency percentiles. Results are
+written as JSON (with the git commit) so two runs can be diffed with
+--compare, which prints the p50 / throughput ratio per metric.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fakes import InMemoryDynamoStorage, install_fakes
+
+DEFAULT_SIZES = (10000, 100000)
+SUITES = ("duplicates", "validation", "pipeline", "json_parsing", "storage")
+
+
+# -------- Measurement --------
+def _summarize(samples: list, items_per_sample: int = 1) -> dict:
+    """Latency percentiles (ms) and throughput for a list of per-call durations (s)."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000, 4)
+
+    return {
+        "calls": len(ordered),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "mean_ms": round(total / len(ordered) * 1000, 4),
+        "throughput_per_s": round(len(ordered) * items_per_sample / total, 1) if total else None,
+    }
+
+
+def measure(fn, args_list, items_per_call: int = 1) -> dict:
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return _summarize(samples, items_per_call)
+
+
+def _once(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, round((time.perf_counter() - start) * 1000, 3)
+
+
+# -------- Synthetic data --------
+_PRODUCTS = ["SAREE", "KURTI", "SHOES", "WATCH", "PHONE", "TABLET", "LAMP", "SOFA", "BAG", "TEE"]
+_OBJECTIVES = ["AWAR", "SALES", "LEADS"]
+_MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+
+def campaign_names(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(['PM', 'GX', 'AL'])}_{1000 + i}_{rng.choice(_PRODUCTS)}_{rng.choice(_OBJECTIVES)}_"
+        f"PROMO{rng.randrange(500)}_{rng.choice(_MONTHS)}_{rng.choice(['2024', '2025'])}"
+        for i in range(n)
+    ]
+
+
+def placement_names(n: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    names = [
+        f"PM_{1000 + i}_{rng.choice(['CONS', 'CONV', 'AWAR'])}_OMD_{rng.choice(['YTB', 'META', 'DV360'])}_"
+        f"{rng.choice(['VID', 'DIS'])}_AP25-54_1080X720_30S"
+        for i in range(n)
+    ]
+    for i in range(0, n, 20):         # ~5% invalid
+        names[i] = names[i].lower() + "@"
+    return names
+
+
+def _seed_storage(names, planner_type="campaign"):
+    storage = InMemoryDynamoStorage()
+    stamp = "2025-01-01T00:00:00+00:00"
+    storage.load({"name": n, "planner_type": planner_type, "created_at": stamp} for n in names)
+    return storage
+
+
+# -------- Suites --------
+def bench_duplicates(sizes, queries: int = 2000) -> dict:
+    """Exact and near-duplicate checks through the name index vs. the old list scan."""
+    from app.utils import name_index
+    from app.utils.fuzzy_matcher import find_similar_names
+    from app.utils.storage import set_storage
+
+    out = {}
+    for size in sizes:
+        names = campaign_names(size)
+        rng = random.Random(size)
+        hits = [rng.choice(names) for _ in range(queries // 2)]
+        misses = [f"ZZ_{i}_NOPE_AWAR_X_JAN_2025" for i in range(queries // 2)]
+        typos = [n.replace("PROMO", "PROMMO", 1) for n in rng.sample(names, min(200, size))]
+
+        set_storage(_seed_storage(names))
+        index = name_index.get_name_index()
+        _, cold_ms = _once(index.refresh, "campaign", True)
+        _, fuzzy_build_ms = _once(index.find_near_duplicates, "campaign", typos[0])
+
+        result = {
+            "index_load_ms": cold_ms,
+            "fuzzy_index_build_ms": fuzzy_build_ms,
+            "exact_index": measure(index.find_duplicates, [("campaign", q) for q in hits + misses]),
+            "near_duplicates": measure(index.find_near_duplicates, [("campaign", q) for q in typos]),
+        }
+        # The pre-index path scanned the whole list per check; sample only a few calls
+        result["exact_list_scan"] = measure(
+            find_similar_names, [(q, names) for q in (hits[:5] + misses[:5])]
+        )
+        out[str(size)] = result
+    return out
+
+
+def bench_validation(count: int) -> dict:
+    """Local validators and the batch CLI, names per second."""
+    from app.ai.validate_creative_name_node import validate_creative_name_step
+    from app.ai.validate_name_node import validate_name_step
+    from app.ai.validate_placement_name_node import validate_placement_name_step
+    from app.utils.batch_validate import run_batch
+    from app.utils.rules_registry import get_rules_snapshot
+
+    snapshot = get_rules_snapshot()
+    placements = placement_names(count)
+    campaigns = campaign_names(count)
+    batch = 1000
+
+    def chunks(names):
+        return [names[i:i + batch] for i in range(0, len(names), batch)]
+
+    rows = [(i, "placement", n) for i, n in enumerate(placements)]
+    _, cli_ms = _once(run_batch, rows, io.StringIO(), "jsonl", 0, 2000, False)
+
+    return {
+        "names": count,
+        "placement_step": measure(
+            lambda names: validate_placement_name_step(
+                {"placement_names": names, "placement_rules": snapshot.as_dict("placement_planner")}),
+            [(c,) for c in chunks(placements)], batch),
+        "creative_step": measure(
+            lambda names: validate_creative_name_step(
+                {"creative_names": names, "creative_rules": snapshot.as_dict("creative_planner")}),
+            [(c,) for c in chunks(placements)], batch),
+        "campaign_step": measure(
+            lambda names: validate_name_step(
+                {"generated_suggestions": [{"name": n} for n in names],
+                 "rules": snapshot.as_dict("campaign_planner")}),
+            [(c,) for c in chunks(campaigns)], batch),
+        "batch_cli_inline": {"ms": cli_ms, "throughput_per_s": round(count / cli_ms * 1000, 1)},
+    }
+
+
+def bench_pipeline(runs: int, llm_latency: float) -> dict:
+    """LangGraph pipeline end to end with the fake model (isolates graph/node overhead)."""
+    from app.ai.llm_provider import use_fake_llm
+    from app.ai.run_langgraph_validator import (
+        get_executor, run_langgraph_validator, stream_langgraph_validator, GENERATE_ENTRY, VALIDATE_ENTRY
+    )
+    from app.utils.response_cache import get_response_cache
+    from app.utils.rules_registry import get_rules_snapshot
+    from benchmarks.fakes import naming_responder
+
+    use_fake_llm(responder=naming_responder, latency=llm_latency)
+    rules = get_rules_snapshot().as_dict("campaign_planner")
+    details = {"advertiser": "PM", "plan_number": "1001", "product": "SAREE", "objective": "SALES",
+               "campaign": "DIWALI", "month": "OCT", "year": "2025"}
+
+    _, compile_gen_ms = _once(get_executor, GENERATE_ENTRY)
+    _, compile_val_ms = _once(get_executor, VALIDATE_ENTRY)
+    get_response_cache().clear()
+
+    def first_update():
+        for _ in stream_langgraph_validator({**details, "bypass_cache": True}, rules):
+            return
+
+    return {
+        "llm_latency_ms": llm_latency * 1000,
+        "compile_generate_ms": compile_gen_ms,
+        "compile_validate_ms": compile_val_ms,
+        "generate_uncached": measure(run_langgraph_validator, [({**details, "bypass_cache": True}, rules)] * runs),
+        "generate_cached": measure(run_langgraph_validator, [(dict(details), rules)] * runs),
+        "validate_only": measure(
+            run_langgraph_validator,
+            [({**details, "generated_name": "PM_1001_SAREE_SALES_DIWALI_OCT"}, rules)] * runs),
+        "stream_first_update": measure(first_update, [()] * runs),
+    }
+
+
+def bench_json_parsing(runs: int) -> dict:
+    from app.utils.json_parser import safe_json_parse, parse_json_stream
+
+    suggestions = [{"name": f"PM_{1000 + i}_SAREE_SALES_PROMO{i}_OCT_2025", "reasoning": "Uses {braces} and \"quotes\""}
+                   for i in range(5)]
+    small = "Sure! Here you go:\n```json\n" + json.dumps({"suggestions": suggestions}) + "\n```\nHope that helps."
+    large = json.dumps({"creative_names": {f"P{i}": suggestions for i in range(200)}})
+    chunks = [small[i:i + 7] for i in range(0, len(small), 7)]
+
+    return {
+        "small_reply_bytes": len(small),
+        "large_reply_bytes": len(large),
+        "safe_json_parse_small": measure(safe_json_parse, [(small,)] * runs),
+        "safe_json_parse_large": measure(safe_json_parse, [(large,)] * max(1, runs // 20)),
+        "parse_json_stream_small": measure(parse_json_stream, [(chunks,)] * runs),
+    }
+
+
+def bench_storage(count: int) -> dict:
+    """Single and bulk inserts through db_manager against the in-memory table and SQLite."""
+    from app.utils import db_manager
+    from app.utils.storage import set_storage
+    from app.utils.storage.sqlite import SQLiteStorage
+
+    out = {}
+    for label, factory in (("memory", InMemoryDynamoStorage), ("sqlite", lambda: SQLiteStorage(":memory:"))):
+        set_storage(factory())
+        db_manager.init_db()
+        records = [{"name": n, "planner_type": "placement"} for n in placement_names(count, seed=3)]
+        singles = records[:min(1000, count)]
+        stdout, sys.stdout = sys.stdout, io.StringIO()   # insert_* print a line per call
+        try:
+            single = measure(db_manager.insert_name, [(r,) for r in singles])
+            _, bulk_ms = _once(db_manager.insert_names, records[len(singles):])
+            _, fetch_ms = _once(db_manager.fetch_all_names, "placement")
+        finally:
+            sys.stdout = stdout
+        out[label] = {
+            "insert_name": single,
+            "insert_names_ms": bulk_ms,
+            "insert_names_per_s": round((count - len(singles)) / bulk_ms * 1000, 1) if bulk_ms else None,
+            "fetch_all_names_ms": fetch_ms,
+        }
+    return out
+
+
+# -------- Output --------
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}.{k}" if prefix else k, v, out)
+    elif isinstance(value, (int, float)):
+        out[prefix] = value
+    return out
+
+
+def compare(current: dict, baseline: dict):
+    """Print current/baseline ratios for latency (p50) and throughput metrics."""
+    now = _flatten("", current["results"], {})
+    then = _flatten("", baseline["results"], {})
+    print(f"{'metric':<70} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for key in sorted(now):
+        if key in then and then[key] and (key.endswith("p50_ms") or key.endswith("_per_s")):
+            print(f"{key:<70} {then[key]:>12} {now[key]:>12} {now[key] / then[key]:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the naming planner.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="Corpus sizes for the duplicate-check suite")
+    parser.add_argument("--validation-names", type=int, default=100000)
+    parser.add_argument("--pipeline-runs", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM latency per call (s)")
+    parser.add_argument("--out", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run")
+    args = parser.parse_args(argv)
+
+    install_fakes(llm_latency=args.llm_latency)
+
+    results = {}
+    suites = {
+        "duplicates": lambda: bench_duplicates(args.sizes),
+        "validation": lambda: bench_validation(args.validation_names),
+        "pipeline": lambda: bench_pipeline(args.pipeline_runs, args.llm_latency),
+        "json_parsing": lambda: bench_json_parsing(2000),
+        "storage": lambda: bench_storage(10000),
+    }
+    for name in args.suites:
+        print(f"⏱️ {name}...", file=sys.stderr)
+        results[name] = suites[name]()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
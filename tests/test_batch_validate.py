@@ -0,0 +1,51 @@
+# tests/test_batch_validate.py
+import io
+import json
+
+from app.utils.batch_validate import read_rows, run_batch
+
+VALID = "PM_1001_SAREE_SALES_DIWALI_OCT_2025"
+
+
+def _jsonl(*lines):
+    return io.StringIO("".join(line + "\n" for line in lines))
+
+
+def test_read_rows_reports_malformed_jsonl_lines_and_continues():
+    rows = list(read_rows(_jsonl(
+        json.dumps({"name": VALID, "planner_type": "campaign"}),
+        '{"name": "PM_1001',
+        "",
+        "[1, 2]",
+        json.dumps({"campaign_name": VALID}),
+    ), "jsonl", default_planner="campaign"))
+
+    assert [r[0] for r in rows] == [1, 2, 4, 5]
+    assert rows[0] == (1, "campaign", VALID, None)
+    assert rows[1][2] is None and rows[1][3].startswith("Malformed JSON at column")
+    assert rows[2][3] == "Malformed row: expected a JSON object."
+    assert rows[3] == (5, "campaign", VALID, None)
+
+
+def test_read_rows_csv():
+    rows = list(read_rows(io.StringIO(f"Name,Planner_Type\n{VALID},CAMPAIGN\n"), "csv"))
+    assert rows == [(2, "campaign", VALID, None)]
+
+
+def test_run_batch_writes_malformed_lines_as_invalid_rows():
+    out = io.StringIO()
+    rows = read_rows(_jsonl(json.dumps({"name": VALID}), "{not json", json.dumps({"name": VALID})),
+                     "jsonl", default_planner="campaign")
+    summary = run_batch(rows, out, workers=0, check_duplicates=False)
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["line"] for r in results] == [1, 2, 3]
+    assert results[1]["is_valid"] is False
+    assert results[1]["issues"][0].startswith("Malformed JSON at column 2")
+    assert summary["rows"] == 3 and summary["invalid"] == 1
+
+
+def test_run_batch_accepts_three_field_rows():
+    out = io.StringIO()
+    summary = run_batch([(1, "campaign", VALID)], out, workers=0, check_duplicates=False)
+    assert summary["valid"] == 1
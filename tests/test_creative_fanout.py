@@ -0,0 +1,46 @@
+# tests/test_creative_fanout.py
+import time
+
+import pytest
+
+from app.ai import generate_creative_name_node as node
+
+
+@pytest.fixture
+def fake_generate(monkeypatch):
+    """Per-placement LLM call that sleeps `delays[placement]` seconds (default 0)."""
+    delays = {}
+
+    def generate(placement, context, timeout):
+        time.sleep(delays.get(placement, 0))
+        if placement == "BROKEN":
+            raise ValueError("bad reply")
+        return [{"name": f"{placement}_NAME", "reasoning": "test"}]
+
+    monkeypatch.setattr(node, "_generate_for_placement", generate)
+    return delays
+
+
+def _run(placements, **kwargs):
+    return {p: (s, e) for p, s, e in node.stream_creative_names({"base_placements": placements}, **kwargs)}
+
+
+def test_every_placement_is_reported(fake_generate):
+    results = _run(["A", "B", "BROKEN"], max_concurrency=2, timeout=5)
+    assert results["A"] == ([{"name": "A_NAME", "reasoning": "test"}], None)
+    assert results["BROKEN"] == ([], "bad reply")
+
+
+def test_overrunning_placement_times_out_without_blocking_the_rest(fake_generate):
+    fake_generate["SLOW"] = 2.0
+    start = time.monotonic()
+    results = _run(["SLOW", "A", "B", "C"], max_concurrency=2, timeout=0.3)
+    assert time.monotonic() - start < 1.0
+    assert results["SLOW"] == ([], "Timed out after 0.3s.")
+    assert all(results[p][1] is None for p in ("A", "B", "C"))
+
+
+def test_queued_placements_are_not_charged_for_their_wait(fake_generate):
+    fake_generate.update(A=0.2, B=0.2, C=0.2)
+    results = _run(["A", "B", "C"], max_concurrency=1, timeout=0.35)
+    assert all(error is None for _, error in results.values())
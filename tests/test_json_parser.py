@@ -0,0 +1,57 @@
+# tests/test_json_parser.py
+import pytest
+
+from app.utils.json_parser import JsonObjectExtractor, parse_json_stream, safe_json_parse
+
+_SCHEMA = {"required": {"suggestions": list}}
+
+
+def test_prose_and_markdown_fences_around_json():
+    text = 'Sure! Here you go:\n```json\n{"suggestions": [{"name": "A"}]}\n```\nHope that helps {not json}.'
+    assert safe_json_parse(text) == {"suggestions": [{"name": "A"}]}
+
+
+def test_braces_and_escaped_quotes_inside_strings():
+    text = '{"reasoning": "uses {braces} and \\"quotes\\" }", "n": 1}'
+    assert safe_json_parse(text) == {"reasoning": 'uses {braces} and "quotes" }', "n": 1}
+
+
+def test_python_literal_output():
+    assert safe_json_parse("{'valid': True, 'issues': None}") == {"valid": True, "issues": None}
+
+
+def test_schema_skips_objects_that_do_not_match():
+    text = '{"note": "preamble"} then {"suggestions": ["A"]}'
+    assert safe_json_parse(text, schema=_SCHEMA) == {"suggestions": ["A"]}
+
+
+def test_schema_mismatch_is_reported():
+    with pytest.raises(ValueError, match="suggestions"):
+        safe_json_parse('{"suggestions": "A"}', schema=_SCHEMA)
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError, match="No JSON"):
+        safe_json_parse("no object here")
+
+
+def test_extractor_handles_any_chunk_boundary():
+    text = 'x {"a": "b\\"}{", "c": {"d": [1, 2]}} y {"e": 1}'
+    for size in range(1, len(text) + 1):
+        extractor = JsonObjectExtractor()
+        found = []
+        for i in range(0, len(text), size):
+            found.extend(extractor.feed(text[i:i + size]))
+        assert found == ['{"a": "b\\"}{", "c": {"d": [1, 2]}}', '{"e": 1}'], size
+
+
+def test_stream_returns_once_the_first_valid_object_closes():
+    consumed = []
+
+    def chunks():
+        for piece in ('{"suggestions"', ': ["A"]}', " trailing", " text"):
+            consumed.append(piece)
+            yield piece
+
+    assert parse_json_stream(chunks(), schema=_SCHEMA) == {"suggestions": ["A"]}
+    assert consumed == ['{"suggestions"', ': ["A"]}']
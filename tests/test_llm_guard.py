@@ -0,0 +1,188 @@
+# tests/test_llm_guard.py
+import time
+
+import pytest
+
+from app.ai import llm_guard
+from app.ai.llm_guard import CircuitBreaker, LLMUnavailable, RateLimiter, RetryBudget, guarded_call
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+@pytest.fixture
+def guard(monkeypatch):
+    """Fresh process-wide guard state, no backoff sleeps, fixed token estimate."""
+    monkeypatch.setattr(llm_guard, "breaker", CircuitBreaker(failures=3, cooldown=0.05))
+    monkeypatch.setattr(llm_guard, "retry_budget", RetryBudget(ratio=0.5, reserve=10))
+    monkeypatch.setattr(llm_guard, "limiter", RateLimiter(rpm=0, tpm=0))
+    monkeypatch.setattr(llm_guard, "_backoff", lambda attempt, error: None)
+    monkeypatch.setattr(llm_guard, "_estimate_tokens", lambda messages: 10)
+    return llm_guard
+
+
+def flaky(failures, error=RateLimitError):
+    """call() that raises `error` for the first `failures` calls, then returns "ok"."""
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error("boom")
+        return "ok"
+
+    call.calls = calls
+    return call
+
+
+# -------- Circuit breaker --------
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failures=2, cooldown=60)
+    breaker.record_failure()
+    breaker.before_call()                   # one failure: still closed
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(LLMUnavailable):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failures=2, cooldown=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker(failures=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    breaker.before_call()                   # the trial
+    with pytest.raises(LLMUnavailable):
+        breaker.before_call()               # anyone else while the trial is in flight
+
+
+def test_failed_trial_reopens_for_a_full_cooldown():
+    breaker = CircuitBreaker(failures=5, cooldown=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure()                # a single failed trial is enough
+    assert breaker.state == "open"
+    with pytest.raises(LLMUnavailable):
+        breaker.before_call()
+
+
+def test_successful_trial_closes_the_circuit():
+    breaker = CircuitBreaker(failures=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.before_call()
+
+
+# -------- Retry budget --------
+def test_retry_budget_is_spent_and_refilled_by_calls():
+    budget = RetryBudget(ratio=0.5, reserve=2)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()            # 0.5 isn't a whole retry yet
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_retry_budget_never_exceeds_its_reserve():
+    budget = RetryBudget(ratio=1, reserve=2)
+    for _ in range(10):
+        budget.deposit()
+    assert budget.balance == 2
+
+
+# -------- Rate limiter --------
+def test_request_bucket_fails_fast_past_max_wait():
+    limiter = RateLimiter(rpm=3, tpm=0, max_wait=0)
+    for _ in range(3):
+        limiter.acquire(1)
+    with pytest.raises(LLMUnavailable, match="rate limit"):
+        limiter.acquire(1)
+
+
+def test_request_bucket_waits_when_allowed():
+    limiter = RateLimiter(rpm=600, tpm=0, max_wait=1)      # refills one request every 0.1 s
+    for _ in range(600):
+        limiter.acquire(1)
+    start = time.monotonic()
+    limiter.acquire(1)
+    assert 0.05 < time.monotonic() - start < 0.5
+
+
+def test_token_bucket_and_usage_adjustment():
+    limiter = RateLimiter(rpm=0, tpm=100, max_wait=0)
+    limiter.acquire(60)
+    limiter.adjust(-50)                     # the call used 50 fewer tokens than estimated
+    limiter.acquire(80)
+    with pytest.raises(LLMUnavailable):
+        limiter.acquire(50)
+
+
+def test_oversized_request_still_gets_through_an_empty_bucket():
+    limiter = RateLimiter(rpm=0, tpm=100, max_wait=0)
+    limiter.acquire(1000)
+
+
+# -------- guarded_call --------
+def test_retryable_errors_are_retried(guard):
+    call = flaky(2)
+    assert guarded_call(call, [], max_retries=2) == "ok"
+    assert len(call.calls) == 3
+    assert guard.breaker.state == "closed"
+
+
+def test_gives_up_after_max_retries(guard):
+    call = flaky(5)
+    with pytest.raises(RateLimitError):
+        guarded_call(call, [], max_retries=1)
+    assert len(call.calls) == 2
+
+
+def test_non_retryable_errors_are_not_retried_or_counted(guard):
+    call = flaky(1, error=BadRequestError)
+    with pytest.raises(BadRequestError):
+        guarded_call(call, [], max_retries=3)
+    assert len(call.calls) == 1
+    assert guard.breaker.state == "closed"
+
+
+def test_empty_retry_budget_stops_retries(guard, monkeypatch):
+    monkeypatch.setattr(guard, "retry_budget", RetryBudget(ratio=0, reserve=0))
+    call = flaky(1)
+    with pytest.raises(RateLimitError):
+        guarded_call(call, [], max_retries=3)
+    assert len(call.calls) == 1
+
+
+def test_open_breaker_fails_fast_then_recovers(guard):
+    with pytest.raises((RateLimitError, LLMUnavailable)):
+        guarded_call(flaky(10), [], max_retries=5)
+    assert guard.breaker.state == "open"
+
+    untouched = flaky(0)
+    with pytest.raises(LLMUnavailable):
+        guarded_call(untouched, [])
+    assert untouched.calls == []
+
+    time.sleep(0.06)
+    assert guarded_call(untouched, []) == "ok"          # half-open trial succeeds
+    assert guard.breaker.state == "closed"
@@ -0,0 +1,116 @@
+# tests/test_micro_batcher.py
+import threading
+import time
+
+import pytest
+
+from app.utils.micro_batcher import MicroBatcher
+
+
+class Recorder:
+    """process_batch that records each batch and echoes items doubled."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, key, items):
+        with self._lock:
+            self.batches.append((key, list(items)))
+        time.sleep(self.delay)
+        return [item * 2 for item in items]
+
+
+def submit_concurrently(batcher, requests):
+    """Submit (key, item) pairs from one thread each, released together; returns results in order."""
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def run(i, key, item):
+        barrier.wait()
+        try:
+            results[i] = batcher.submit(key, item)
+        except Exception as e:          # surfaced to the test as the result
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, k, v)) for i, (k, v) in enumerate(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    return results
+
+
+def test_single_request_runs_as_batch_of_one():
+    recorder = Recorder()
+    batcher = MicroBatcher("t", recorder, max_wait=0.0)
+    assert batcher.submit("k", 3) == 6
+    assert recorder.batches == [("k", [3])]
+
+
+def test_concurrent_requests_share_a_batch_and_get_their_own_results():
+    recorder = Recorder()
+    batcher = MicroBatcher("t", recorder, max_batch_size=16, max_wait=0.2)
+    results = submit_concurrently(batcher, [("k", i) for i in range(8)])
+    assert results == [i * 2 for i in range(8)]
+    assert len(recorder.batches) < 8
+    assert sorted(i for _, items in recorder.batches for i in items) == list(range(8))
+
+
+def test_keys_are_never_mixed():
+    recorder = Recorder()
+    batcher = MicroBatcher("t", recorder, max_wait=0.1)
+    results = submit_concurrently(batcher, [("a", 1), ("b", 2), ("a", 3), ("b", 4)])
+    assert results == [2, 4, 6, 8]
+    for key, items in recorder.batches:
+        assert set(items) <= ({1, 3} if key == "a" else {2, 4})
+
+
+def test_full_batch_runs_without_waiting_for_the_window():
+    recorder = Recorder()
+    batcher = MicroBatcher("t", recorder, max_batch_size=4, max_wait=5.0)
+    start = time.monotonic()
+    results = submit_concurrently(batcher, [("k", i) for i in range(4)])
+    assert results == [0, 2, 4, 6]
+    assert time.monotonic() - start < 2.0
+
+
+def test_arrival_after_a_full_batch_leads_the_next_one():
+    # Leader hand-off: the batch closes at max_batch_size, the next caller starts a new one
+    recorder = Recorder(delay=0.05)
+    batcher = MicroBatcher("t", recorder, max_batch_size=2, max_wait=0.2)
+    results = submit_concurrently(batcher, [("k", i) for i in range(5)])
+    assert results == [0, 2, 4, 6, 8]
+    assert all(len(items) <= 2 for _, items in recorder.batches)
+    assert sorted(i for _, items in recorder.batches for i in items) == list(range(5))
+
+
+def test_leader_waits_for_its_window_then_later_arrivals_start_fresh():
+    recorder = Recorder()
+    batcher = MicroBatcher("t", recorder, max_wait=0.05)
+    assert batcher.submit("k", 1) == 2
+    assert batcher.submit("k", 2) == 4
+    assert recorder.batches == [("k", [1]), ("k", [2])]
+
+
+def test_batch_error_reaches_every_caller():
+    def failing(key, items):
+        raise RuntimeError("provider down")
+
+    batcher = MicroBatcher("t", failing, max_wait=0.1)
+    results = submit_concurrently(batcher, [("k", i) for i in range(3)])
+    assert all(isinstance(r, RuntimeError) and str(r) == "provider down" for r in results)
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher("t", lambda key, items: [], max_wait=0.0)
+    with pytest.raises(RuntimeError, match="0 results for 1 requests"):
+        batcher.submit("k", 1)
+
+
+def test_exception_result_reaches_only_its_caller():
+    batcher = MicroBatcher("t", lambda key, items: [ValueError(i) if i == 1 else i for i in items], max_wait=0.1)
+    results = submit_concurrently(batcher, [("k", i) for i in range(3)])
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
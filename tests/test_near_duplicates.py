@@ -0,0 +1,61 @@
+# tests/test_near_duplicates.py
+import pytest
+
+from app.utils.fuzzy_matcher import FuzzyIndex
+from app.utils.name_index import NameIndex
+
+EXISTING = [
+    "PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2025",
+    "PM_1001_SAREE_SALES_NEWARRIVALS_OCT_2025",
+    "PM_2002_KURTI_AWAR_NEWARRIVALS_NOV_2025",
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(lambda planner_type, since=None: [(n, "2025-10-01T00:00:00+00:00") for n in EXISTING])
+
+
+def test_fuzzy_index_finds_typos_and_skips_unrelated_names():
+    fuzzy = FuzzyIndex(EXISTING)
+    hits = fuzzy.query("PM_1001_SAREE_SALES_DIWALIFESTIVLS_OCT_2025", threshold=90)
+    assert [name for name, _ in hits] == ["PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2025"]
+    assert fuzzy.query("XY_9999_SHOES_LEADS_SUMMERDROP_JUN_2024", threshold=90) == []
+
+
+def test_fuzzy_index_key_limits_comparison_to_its_group():
+    fuzzy = FuzzyIndex(EXISTING, key=lambda name: (name.split("_")[1], name))
+    assert fuzzy.query("PM_1002_SAREE_SALES_DIWALIFESTIVALS_OCT_2025", threshold=90) == []
+    assert fuzzy.query("PM_1001_SAREE_SALES_DIWALIFESTIVAL_OCT_2025", threshold=90)
+
+
+@pytest.mark.parametrize("name", [
+    "PM_1001_SAREE_SALES_DIWALIFESTIVLS_OCT_2025",     # typo in the theme
+    "PM_1001_SAREES_SALES_DIWALIFESTIVALS_OCT_2025",   # plural product
+    "pm_1001_saree_sales_diwalifestival_oct_2025",     # case and singular theme
+])
+def test_free_text_variants_are_near_duplicates(index, name):
+    hits = index.find_near_duplicates("campaign", name)
+    assert [n for n, _ in hits] == ["PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2025"]
+
+
+@pytest.mark.parametrize("name", [
+    "PM_1001_SAREE_SALES_DIWALIFESTIVALS_NOV_2025",    # next month's flight
+    "PM_1002_SAREE_SALES_DIWALIFESTIVALS_OCT_2025",    # another plan
+    "PM_1001_SAREE_AWAR_DIWALIFESTIVALS_OCT_2025",     # another objective
+    "PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2026",    # next year
+    "PM_1001_SAREE_SALES_DIWALILAUNCH_OCT_2025",       # a different theme
+])
+def test_fixed_token_variants_are_not_near_duplicates(index, name):
+    assert index.find_near_duplicates("campaign", name) == []
+
+
+def test_exact_match_is_not_its_own_near_duplicate(index):
+    assert index.find_near_duplicates("campaign", EXISTING[0]) == []
+
+
+def test_names_added_after_the_build_are_searched(index):
+    index.find_near_duplicates("campaign", EXISTING[0])
+    index.add("campaign", "PM_1001_SAREE_SALES_HOLIDAYEDIT_OCT_2025")
+    hits = index.find_near_duplicates("campaign", "PM_1001_SAREE_SALES_HOLIDAYEDITS_OCT_2025")
+    assert [n for n, _ in hits] == ["PM_1001_SAREE_SALES_HOLIDAYEDIT_OCT_2025"]
@@ -0,0 +1,105 @@
+# tests/test_rule_engine.py
+import pytest
+
+from app.utils.rule_engine import compile_rules, planner_block
+
+CAMPAIGN_RULES = {
+    "format_order": ["Advertiser", "PlanNumber", "Product", "Objective", "Campaign", "Month", "Year"],
+    "validation": {
+        "use_underscores": True,
+        "force_uppercase": True,
+        "no_spaces_allowed": True,
+        "allowed_objectives": ["AWAR", "SALES", "LEADS"],
+    },
+    "fields": [
+        {"key": "free_form_text", "repeatable": True, "required": False},
+    ],
+}
+
+CREATIVE_RULES = {
+    "format_order": ["Advertiser", "PlanNumber", "MediaType", "SizeFormatDuration", "CreativeMessage"],
+    "validation": {"use_underscores": True, "force_uppercase": True, "no_spaces_allowed": True},
+    "fields": [
+        {"key": "media_type", "allowed_values": ["DIS", "VOD", "SOC"], "required": True},
+        {"key": "size_format_duration", "required": False},
+        {"key": "free_form_text", "repeatable": True, "required": False},
+    ],
+}
+
+
+@pytest.fixture
+def campaign():
+    return compile_rules(CAMPAIGN_RULES)
+
+
+@pytest.fixture
+def creative():
+    return compile_rules(CREATIVE_RULES)
+
+
+def test_valid_campaign_name(campaign):
+    result = campaign.check("PM_1001_SAREE_SALES_DIWALIFESTIVALS_OCT_2025")
+    assert result["is_valid"]
+    assert result["free_tokens"] == {"Advertiser": "PM", "Product": "SAREE", "Campaign": "DIWALIFESTIVALS"}
+
+
+@pytest.mark.parametrize("name, issue", [
+    ("PM_1001_SAREE_SALES_DIWALI_OCT", "Missing required components: Year."),
+    ("PM_1001_SAREE_BUY_DIWALI_OCT_2025", "Objective 'BUY' is not one of: AWAR, LEADS, SALES."),
+    ("PM_1001_SAREE_SALES_DIWALI_OCTOBER_2025", "Month 'OCTOBER' must be a three-letter month (JAN–DEC)."),
+    ("PM_10A1_SAREE_SALES_DIWALI_OCT_2025", "PlanNumber '10A1' must be numeric."),
+    ("pm_1001_SAREE_SALES_DIWALI_OCT_2025", "Must be in uppercase."),
+    ("PM_1001__SAREE_SALES_DIWALI_OCT_2025", "Empty segment (leading, trailing or consecutive underscores)."),
+])
+def test_campaign_issues(campaign, name, issue):
+    result = campaign.check(name)
+    assert not result["is_valid"]
+    assert issue in result["issues"]
+
+
+def test_extensions_become_free_form_tokens(campaign):
+    result = campaign.check("PM_1001_SAREE_SALES_DIWALI_OCT_2025_NZ")
+    assert result["is_valid"]
+    assert result["free_tokens"]["FreeForm1"] == "NZ"
+
+
+def test_optional_multi_segment_token_keeps_later_fields_aligned(creative):
+    # 15S belongs to SizeFormatDuration, not to CreativeMessage
+    result = creative.check("PM_1001_SOC_1080X1080_15S_FESTIVEOFFER")
+    assert result["is_valid"], result["issues"]
+    assert result["free_tokens"]["SizeFormatDuration"] == "1080X1080_15S"
+    assert result["free_tokens"]["CreativeMessage"] == "FESTIVEOFFER"
+
+
+def test_optional_middle_token_can_be_omitted(creative):
+    result = creative.check("PM_1001_SOC_FESTIVEOFFER")
+    assert result["is_valid"], result["issues"]
+    assert "SizeFormatDuration" not in result["free_tokens"]
+    assert result["free_tokens"]["CreativeMessage"] == "FESTIVEOFFER"
+
+
+def test_optional_token_matching_its_pattern_is_not_reused_as_a_later_field(creative):
+    result = creative.check("PM_1001_SOC_1080X1080")
+    assert not result["is_valid"]
+    assert "Missing required components: CreativeMessage." in result["issues"]
+
+
+def test_multi_segment_optional_token_is_not_split_to_fill_a_later_field(creative):
+    # 15S matches SizeFormatDuration, so it can't be read as the CreativeMessage
+    result = creative.check("PM_1001_SOC_1080X1080_15S")
+    assert not result["is_valid"]
+    assert "Missing required components: CreativeMessage." in result["issues"]
+
+
+def test_reasoning_joins_issues_without_doubled_punctuation(campaign):
+    result = campaign.check("pm_1001_SAREE_SALES_DIWALI_OCT")
+    assert result["reasoning"] == "Must be in uppercase. Missing required components: Year."
+
+
+def test_compile_is_cached_by_content():
+    assert compile_rules(dict(CAMPAIGN_RULES)) is compile_rules(CAMPAIGN_RULES)
+
+
+def test_planner_block_accepts_whole_file():
+    assert planner_block({"campaign_planner": CAMPAIGN_RULES}, "campaign_planner") is CAMPAIGN_RULES
+    assert planner_block(CAMPAIGN_RULES, "campaign_planner") is CAMPAIGN_RULES
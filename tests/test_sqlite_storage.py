@@ -0,0 +1,45 @@
+# tests/test_sqlite_storage.py
+import threading
+
+import pytest
+
+from app.utils.storage import sqlite as sqlite_storage
+from app.utils.storage.sqlite import SQLiteStorage
+
+
+def _item(i: int) -> dict:
+    return {"name": f"PM_{1000 + i}_SAREE_SALES_DIWALI_OCT_2025", "planner_type": "campaign",
+            "created_at": f"2025-10-01T00:00:{i % 60:02d}+00:00"}
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "_SCAN_PAGE_SIZE", 3)
+    store = SQLiteStorage(":memory:")
+    store.init_db()
+    for i in range(7):
+        assert store.insert_item(_item(i))
+    yield store
+    store.close()
+
+
+def test_scan_reads_every_row_in_pages(storage):
+    stats = {}
+    names = [item["name"] for item in storage.scan_items(("name",), stats=stats)]
+    assert names == [_item(i)["name"] for i in range(7)]
+    assert stats[0]["pages"] == 3 and stats[0]["items"] == 7
+
+
+def test_storage_is_usable_while_a_scan_is_being_consumed(storage):
+    # The in-memory pool has a single connection: a scan holding it across yields would deadlock
+    def consume():
+        for item in storage.scan_items(("name", "planner_type")):
+            storage.insert_item({**item, "name": item["name"] + "_COPY", "created_at": "2025-11-01T00:00:00+00:00"})
+            storage.fetch_all_names("campaign")
+
+    worker = threading.Thread(target=consume, daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+    # Rows inserted during the scan aren't scanned themselves
+    assert len(storage.fetch_all_names("campaign")) == 14
@@ -0,0 +1,67 @@
+# tests/test_validate_review_batch.py
+import json
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.ai import prompt_compiler
+from app.ai import validate_name_node as node
+from app.ai.prompt_compiler import PromptBudgetExceeded, count_tokens
+
+NOTES = "Campaign must describe the festival."
+
+
+@pytest.fixture
+def reviewer(monkeypatch):
+    """Fake reviewer that flags every name it sees; records each prompt's name lines."""
+    calls = []
+
+    def review(prompt_value):
+        text = prompt_value.to_string()
+        block = text.split("**Names and free-form tokens:**")[1].split("Respond ONLY")[0]
+        names = [line.split(":", 1)[0].strip() for line in block.strip().splitlines()]
+        calls.append(names)
+        return AIMessage(content=json.dumps({"validations": [
+            {"name": n, "is_valid": False, "issues": ["flagged"]} for n in names
+        ]}))
+
+    monkeypatch.setattr(node, "get_llm", lambda *a, **kw: RunnableLambda(review))
+    return calls
+
+
+def _budget(monkeypatch, lines: int):
+    """Set PROMPT_TOKEN_BUDGET to fit the fixed prompt plus about `lines` name lines."""
+    base = count_tokens(node._REVIEW_PROMPT.format(notes=NOTES, tokens=""))
+    budget = base + lines * (count_tokens(_line(0)) + 1)
+    monkeypatch.setattr(node, "PROMPT_TOKEN_BUDGET", budget)
+    monkeypatch.setattr(prompt_compiler, "PROMPT_TOKEN_BUDGET", budget)
+
+
+def _line(i: int) -> str:
+    return f"PM_{1000 + i}_SAREE_SALES_DIWALI_OCT_2025: Product=SAREE, Campaign=DIWALI"
+
+
+def test_batch_within_budget_is_one_call(reviewer, monkeypatch):
+    _budget(monkeypatch, lines=10)
+    blocks = [_line(0), "\n".join([_line(1), _line(2)])]
+    results = node._review_batch((NOTES, "m"), blocks)
+    assert len(reviewer) == 1
+    assert [len(r["validations"]) for r in results] == [1, 2]
+
+
+def test_oversized_batch_is_split_so_every_name_is_reviewed(reviewer, monkeypatch):
+    _budget(monkeypatch, lines=3)
+    blocks = ["\n".join(_line(i) for i in range(start, start + 4)) for start in (0, 4)]
+    results = node._review_batch((NOTES, "m"), blocks)
+    assert len(reviewer) > 1
+    assert sorted(n for call in reviewer for n in call) == sorted(_line(i).split(":")[0] for i in range(8))
+    assert [len(r["validations"]) for r in results] == [4, 4]
+
+
+def test_line_over_budget_fails_only_its_caller(reviewer, monkeypatch):
+    _budget(monkeypatch, lines=2)
+    huge = "PM_9999_SAREE_SALES_DIWALI_OCT_2025: Campaign=" + "X" * 2000
+    results = node._review_batch((NOTES, "m"), [_line(0), huge])
+    assert results[0]["validations"][0]["issues"] == ["flagged"]
+    assert isinstance(results[1], PromptBudgetExceeded)